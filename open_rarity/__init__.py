@@ -1,3 +1,4 @@
+from .incremental_rarity_ranker import IncrementalRarityRanker
 from .models import (
     Collection,
     EVMContractTokenIdentifier,
@@ -7,5 +8,6 @@ from .models import (
     TokenRarity,
     TokenStandard,
 )
+from .out_of_core_rarity_ranker import OutOfCoreRarityRanker
 from .rarity_ranker import RarityRanker
 from .scoring import Scorer as OpenRarityScorer
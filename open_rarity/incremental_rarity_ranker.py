@@ -0,0 +1,304 @@
+import numpy as np
+
+from open_rarity.models.attribute_vocabulary import NULL_ATTRIBUTE_CODE
+from open_rarity.models.collection import Collection, CollectionChangeSet
+from open_rarity.models.token_ranking_features import TokenRankingFeatures
+from open_rarity.models.token_rarity import TokenRarity
+from open_rarity.rarity_ranker import RarityRanker
+from open_rarity.scoring.handlers.information_content_scoring_handler import (
+    InformationContentScoringHandler,
+)
+
+# Sort key of a token in rank order: more unique attributes first, then lower
+# sum of log attribute counts (e.g. higher information content) first, then
+# lower token index first.
+_RANK_KEY_DTYPE = np.dtype(
+    [
+        ("unique_attribute_count", np.int64),
+        ("log_counts_sum", np.float64),
+        ("index", np.int64),
+    ]
+)
+
+
+class IncrementalRarityRanker:
+    """Keeps the OpenRarity ranking of a collection up to date as the collection
+    changes, e.g. on reveals, late mints or burns.
+
+    The information content score of a token is
+        m * log2(N) - sum(log2(count of each of the token's attribute buckets))
+    divided by the collection entropy, where N is the token total supply and m the
+    number of attribute names (null buckets included). Every token keeps the
+    partial sum of log2 bucket counts, so that a change of a bucket count is
+    applied to the tokens in that bucket only, and all other tokens keep their
+    relative order. The sorted order is repaired by merging the affected tokens
+    back into the unaffected ones instead of sorting the whole collection.
+
+    Scores agree with RarityRanker.rank_collection up to floating point rounding,
+    so ranks are the same unless scores differ by about the 9 decimal digits
+    tolerance of equal ranks. Rounding errors of updates accumulate; call rebuild()
+    to recompute all scores from scratch.
+
+    Example
+    -------
+        ranker = IncrementalRarityRanker(collection)
+        change_set = collection.update_token_metadata({token_identifier: metadata})
+        ranker.update(change_set)
+        token_rarities = ranker.rank_collection()
+    """
+
+    def __init__(self, collection: Collection):
+        self._collection = collection
+        self._ic_handler = InformationContentScoringHandler()
+        self.rebuild()
+
+    @property
+    def collection(self) -> Collection:
+        return self._collection
+
+    @property
+    def scores(self) -> np.ndarray:
+        """Scores of all tokens, in order of collection.tokens."""
+        return self._scores
+
+    @property
+    def ranks(self) -> np.ndarray:
+        """Ranks of all tokens, in order of collection.tokens."""
+        return self._ranks
+
+    @property
+    def unique_attribute_counts(self) -> np.ndarray:
+        """Unique attribute counts of all tokens, in order of collection.tokens."""
+        return self._unique_attribute_counts
+
+    def rebuild(self) -> None:
+        """Recomputes scores and ranks of all tokens from scratch."""
+        RarityRanker.default_scorer.validate_collection(self._collection)
+        rows = np.arange(self._collection.token_total_supply)
+        self._log_counts_sums, self._unique_attribute_counts = self._score_rows(rows)
+        self._order = np.lexsort(
+            (rows, self._log_counts_sums, -self._unique_attribute_counts)
+        )
+        self._update_scores_and_ranks()
+
+    def update(self, change_set: CollectionChangeSet) -> None:
+        """Updates scores and ranks for changes made to the collection.
+
+        Parameters
+        ----------
+        change_set : CollectionChangeSet
+            The changes returned by Collection.add_tokens, remove_tokens or
+            update_token_metadata. Every change made to the collection must be
+            passed to update, in order.
+        """
+        RarityRanker.default_scorer.validate_collection(self._collection)
+        collection = self._collection
+        total_supply = collection.token_total_supply
+        assert change_set.total_supply == total_supply
+
+        moved_rows = np.array(
+            list(change_set.moved_token_indices.values()), dtype=np.int64
+        )
+        if change_set.removed_token_indices:
+            # Tokens moved into the places of removed tokens keep their sort keys
+            previous_rows = np.array(
+                list(change_set.moved_token_indices.keys()), dtype=np.int64
+            )
+            for values in (self._log_counts_sums, self._unique_attribute_counts):
+                values[moved_rows] = values[previous_rows]
+            self._log_counts_sums = self._log_counts_sums[:total_supply]
+            self._unique_attribute_counts = self._unique_attribute_counts[:total_supply]
+            is_removed = np.zeros(change_set.previous_total_supply, dtype=bool)
+            is_removed[change_set.removed_token_indices] = True
+            rows = np.arange(change_set.previous_total_supply)
+            rows[previous_rows] = moved_rows
+            self._order = rows[self._order[~is_removed[self._order]]]
+
+        added_count = total_supply - len(self._log_counts_sums)
+        if added_count > 0:
+            self._log_counts_sums = np.concatenate(
+                [self._log_counts_sums, np.zeros(added_count)]
+            )
+            self._unique_attribute_counts = np.concatenate(
+                [
+                    self._unique_attribute_counts,
+                    np.zeros(added_count, dtype=np.int64),
+                ]
+            )
+
+        affected = np.zeros(total_supply, dtype=bool)
+        affected[change_set.added_token_indices] = True
+        affected[change_set.updated_token_indices] = True
+        # Moved tokens are ordered after tokens with equal keys by their new index
+        affected[moved_rows] = True
+        attribute_codes = collection.attribute_codes
+        vocabulary = collection.vocabulary
+
+        # Move the tokens of every changed attribute bucket by the change of
+        # the bucket's log count
+        for attr_name, value_deltas in change_set.attributes_frequency_deltas.items():
+            name_id = vocabulary.name_id(attr_name)
+            assert name_id is not None
+            value_counts = collection.attributes_frequency_counts.get(attr_name, {})
+            for attr_value, delta in value_deltas.items():
+                count = value_counts.get(attr_value, 0)
+                rows = np.flatnonzero(
+                    attribute_codes[:, name_id]
+                    == vocabulary.value_id(name_id, attr_value)
+                )
+                self._move_bucket(rows, count - delta, count, is_null=False)
+                affected[rows] = True
+
+        for attr_name, delta in change_set.null_attribute_deltas.items():
+            name_id = vocabulary.name_id(attr_name)
+            assert name_id is not None
+            value_counts = collection.attributes_frequency_counts.get(attr_name, {})
+            count = total_supply - sum(value_counts.values()) if value_counts else 0
+            rows = np.flatnonzero(attribute_codes[:, name_id] == NULL_ATTRIBUTE_CODE)
+            self._move_bucket(rows, count - delta, count, is_null=True)
+            affected[rows] = True
+
+        # Added and updated tokens changed buckets, so score them from scratch
+        touched_rows = np.array(
+            change_set.added_token_indices + change_set.updated_token_indices,
+            dtype=np.int64,
+        )
+        if len(touched_rows):
+            (
+                self._log_counts_sums[touched_rows],
+                self._unique_attribute_counts[touched_rows],
+            ) = self._score_rows(touched_rows)
+
+        self._repair_order(affected)
+        self._update_scores_and_ranks()
+
+    def rank_collection(self) -> list[TokenRarity]:
+        """Returns the ranked tokens of the collection, same as
+        RarityRanker.rank_collection.
+
+        Returns
+        -------
+        list[TokenRarity]
+            list of TokenRarity objects with score, rank and token information
+            sorted by rank
+
+        Raises
+        ------
+        ValueError
+            If the tokens of the collection were dropped, see
+            Collection.from_token_stream. Their scores and ranks are available
+            from `scores` and `ranks` in order of collection.token_identifiers.
+        """
+        if not self._collection.has_tokens:
+            raise ValueError(
+                f"Tokens of {self._collection} were dropped, use the scores and "
+                "ranks of the ranker instead"
+            )
+        tokens = self._collection.tokens
+        scores = self._scores.tolist()
+        ranks = self._ranks.tolist()
+        unique_attribute_counts = self._unique_attribute_counts.tolist()
+        return [
+            TokenRarity(
+                token=tokens[index],
+                score=scores[index],
+                token_features=TokenRankingFeatures(
+                    unique_attribute_count=unique_attribute_counts[index]
+                ),
+                rank=ranks[index],
+            )
+            for index in self._order.tolist()
+        ]
+
+    # Private methods
+    def _score_rows(self, rows: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Computes the sum of log2 attribute bucket counts and the unique attribute
+        count of the tokens at the given indices of collection.tokens."""
+        collection = self._collection
+        vocabulary = collection.vocabulary
+        attribute_codes = collection.attribute_codes[rows]
+        log_counts_sums = np.zeros(len(rows))
+        unique_attribute_counts = np.zeros(len(rows), dtype=np.int64)
+
+        for attr_name, value_counts in sorted(
+            collection.attributes_frequency_counts.items()
+        ):
+            name_id = vocabulary.name_id(attr_name)
+            assert name_id is not None
+            null_count = collection.token_total_supply - sum(value_counts.values())
+            counts_table: np.ndarray = np.array(
+                [null_count]
+                + [value_counts.get(value, 0) for value in vocabulary.values[name_id]],
+                dtype=np.int64,
+            )
+            with np.errstate(divide="ignore"):
+                log_counts_table = np.log2(counts_table)
+
+            table_indices = attribute_codes[:, name_id] + 1
+            log_counts_sums += log_counts_table[table_indices]
+            unique_attribute_counts += (table_indices > 0) & (
+                counts_table[table_indices] == 1
+            )
+
+        return log_counts_sums, unique_attribute_counts
+
+    def _move_bucket(
+        self, rows: np.ndarray, previous_count: int, count: int, is_null: bool
+    ) -> None:
+        # A bucket with count 0 does not contribute to any score, e.g. attributes
+        # that are added to or removed from the collection.
+        self._log_counts_sums[rows] += (np.log2(count) if count else 0.0) - (
+            np.log2(previous_count) if previous_count else 0.0
+        )
+        if not is_null:
+            self._unique_attribute_counts[rows] += int(count == 1) - int(
+                previous_count == 1
+            )
+
+    def _repair_order(self, affected: np.ndarray) -> None:
+        """Merges the affected tokens back into the rank order. Unaffected tokens
+        keep their sort keys, so they remain sorted relative to each other."""
+        keys = np.empty(len(affected), dtype=_RANK_KEY_DTYPE)
+        keys["unique_attribute_count"] = -self._unique_attribute_counts
+        keys["log_counts_sum"] = self._log_counts_sums
+        keys["index"] = np.arange(len(affected))
+
+        unaffected_order = self._order[~affected[self._order]]
+        affected_rows = np.flatnonzero(affected)
+        affected_order = affected_rows[
+            np.lexsort(
+                (
+                    affected_rows,
+                    self._log_counts_sums[affected_rows],
+                    -self._unique_attribute_counts[affected_rows],
+                )
+            )
+        ]
+
+        self._order = np.insert(
+            unaffected_order,
+            np.searchsorted(keys[unaffected_order], keys[affected_order]),
+            affected_order,
+        )
+
+    def _update_scores_and_ranks(self) -> None:
+        collection = self._collection
+        total_supply = collection.token_total_supply
+        if total_supply == 0:
+            self._scores = np.zeros(0)
+            self._ranks = np.zeros(0, dtype=np.int64)
+            return
+
+        collection_entropy = self._ic_handler._get_collection_entropy(collection)
+        # covering the corner case when collection has one item.
+        collection_entropy_normalization = (
+            collection_entropy if collection_entropy else 1
+        )
+        attribute_count = len(collection.attributes_frequency_counts)
+        self._scores = (
+            attribute_count * np.log2(total_supply) - self._log_counts_sums
+        ) / collection_entropy_normalization
+
+        sorted_ranks = RarityRanker.assign_ranks(self._scores[self._order])
+        self._ranks = np.empty(total_supply, dtype=np.int64)
+        self._ranks[self._order] = sorted_ranks
@@ -1,4 +1,5 @@
 from .collection import Collection
+from .ranking_result import RankingResult
 from .token import Token
 from .token_identifier import EVMContractTokenIdentifier
 from .token_metadata import StringAttribute, TokenMetadata
@@ -0,0 +1,73 @@
+from dataclasses import dataclass, field
+
+from open_rarity.models.token_metadata import AttributeName, AttributeValue
+
+# Attribute code of a token that does not have the attribute (e.g. attribute=NULL)
+NULL_ATTRIBUTE_CODE = -1
+
+
+@dataclass
+class AttributeVocabulary:
+    """Class represents the interned string attribute names and values of a
+    collection, so that attributes can be referred to by integer ids instead of
+    strings.
+
+    Attribute names are assigned ids in order of first appearance, and every
+    attribute name assigns ids to its values in order of first appearance.
+    Ids are never reassigned, so they remain stable as the vocabulary grows.
+
+    Attributes
+    ----------
+    names : list[AttributeName]
+        attribute names, indexed by attribute name id
+    values : list[list[AttributeValue]]
+        attribute values of every attribute name, indexed by attribute name id
+        and then by attribute value id
+    """
+
+    names: list[AttributeName] = field(default_factory=list)
+    values: list[list[AttributeValue]] = field(default_factory=list)
+
+    def __post_init__(self):
+        self._name_ids: dict[AttributeName, int] = {
+            name: name_id for name_id, name in enumerate(self.names)
+        }
+        self._value_ids: list[dict[AttributeValue, int]] = [
+            {value: value_id for value_id, value in enumerate(values)}
+            for values in self.values
+        ]
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def name_id(self, attribute_name: AttributeName) -> int | None:
+        """Returns the id of the attribute name, or None if it is not interned."""
+        return self._name_ids.get(attribute_name)
+
+    def value_id(self, name_id: int, attribute_value: AttributeValue) -> int | None:
+        """Returns the id of the attribute value for the given attribute name id,
+        or None if it is not interned."""
+        return self._value_ids[name_id].get(attribute_value)
+
+    def intern(
+        self, attribute_name: AttributeName, attribute_value: AttributeValue
+    ) -> tuple[int, int]:
+        """Returns the (attribute name id, attribute value id) pair of the attribute,
+        assigning new ids if the attribute name or value has not been seen before.
+        """
+        name_id = self._name_ids.get(attribute_name)
+        if name_id is None:
+            name_id = len(self.names)
+            self._name_ids[attribute_name] = name_id
+            self.names.append(attribute_name)
+            self._value_ids.append({})
+            self.values.append([])
+
+        value_ids = self._value_ids[name_id]
+        value_id = value_ids.get(attribute_value)
+        if value_id is None:
+            value_id = len(value_ids)
+            value_ids[attribute_value] = value_id
+            self.values[name_id].append(attribute_value)
+
+        return name_id, value_id
@@ -1,13 +1,24 @@
+import itertools
 import warnings
-from collections import defaultdict
-from dataclasses import dataclass
-from functools import cached_property
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Iterable, Mapping
 
+import numpy as np
+
+from open_rarity.models.attribute_vocabulary import (
+    NULL_ATTRIBUTE_CODE,
+    AttributeVocabulary,
+)
 from open_rarity.models.token import Token
+from open_rarity.models.token_identifier import TokenIdentifier
 from open_rarity.models.token_metadata import (
     AttributeName,
     AttributeValue,
     StringAttribute,
+    TokenMetadata,
+    intern_string_attribute,
 )
 from open_rarity.models.token_standard import TokenStandard
 from open_rarity.models.utils.attribute_utils import normalize_attribute_string
@@ -33,6 +44,142 @@ class CollectionAttribute:
     total_tokens: int
 
 
+@dataclass
+class CollectionChangeSet:
+    """Class represents the changes made to a Collection by a single call to
+    Collection.add_tokens, remove_tokens or update_token_metadata, so that
+    derived data (e.g. scores and ranks) can be updated for the changes only.
+
+    Attributes
+    ----------
+    added_token_indices : list[int]
+        indices in collection.tokens of the added tokens
+    removed_token_indices : list[int]
+        indices the removed tokens had in collection.tokens before removal,
+        in ascending order
+    moved_token_indices : dict[int, int]
+        index in collection.tokens of every token that was moved into the place
+        of a removed token, by its index before removal
+    updated_token_indices : list[int]
+        indices in collection.tokens of tokens with updated metadata
+    removed_tokens : list[Token]
+        the removed tokens, in order of removed_token_indices
+    attributes_frequency_deltas : dict[AttributeName, dict[AttributeValue, int]]
+        change of collection.attributes_frequency_counts for every attribute
+        name/value pair whose count changed
+    null_attribute_deltas : dict[AttributeName, int]
+        change of the number of tokens without an attribute (e.g. attribute=NULL),
+        for every attribute name whose null count changed. Attribute names that are
+        not in attributes_frequency_counts have a null count of 0, consistent with
+        Collection.extract_null_attributes.
+    previous_total_supply : int
+        token total supply before the change
+    total_supply : int
+        token total supply after the change
+    """
+
+    previous_total_supply: int
+    total_supply: int
+    added_token_indices: list[int] = field(default_factory=list)
+    removed_token_indices: list[int] = field(default_factory=list)
+    moved_token_indices: dict[int, int] = field(default_factory=dict)
+    updated_token_indices: list[int] = field(default_factory=list)
+    removed_tokens: list[Token] = field(default_factory=list)
+    attributes_frequency_deltas: dict[AttributeName, dict[AttributeValue, int]] = field(
+        default_factory=dict
+    )
+    null_attribute_deltas: dict[AttributeName, int] = field(default_factory=dict)
+
+
+@dataclass
+class CollectionStatistics:
+    """Class represents collection-level data derived from the attributes frequency
+    counts of a Collection, which scoring handlers share. See Collection.statistics.
+
+    Attributes
+    ----------
+    total_supply : int
+        token total supply of the collection
+    null_attributes : dict[AttributeName, CollectionAttribute]
+        number of tokens without the attribute (e.g. attribute=NULL), for every
+        attribute name that some tokens do not have
+    collection_attributes : dict[AttributeName, list[CollectionAttribute]]
+        number of tokens with every attribute name/value pair, by attribute name
+    cardinalities : dict[AttributeName, int]
+        number of possible values of every attribute name
+    probabilities : np.ndarray
+        probability of every attribute name/value pair, in order of
+        attributes_frequency_counts, followed by the probability of the attribute
+        being null for every attribute name in null_attributes
+    entropy : float
+        entropy of the collection, computed from `probabilities`
+    singleton_attributes : dict[AttributeName, set[AttributeValue]]
+        attribute values that exactly one token has, for every attribute name
+        with such values
+    """
+
+    total_supply: int
+    null_attributes: dict[AttributeName, CollectionAttribute]
+    collection_attributes: dict[AttributeName, list[CollectionAttribute]]
+    cardinalities: dict[AttributeName, int]
+    probabilities: np.ndarray
+    entropy: float
+    singleton_attributes: dict[AttributeName, set[AttributeValue]]
+
+    @classmethod
+    def from_collection(cls, collection: "Collection") -> "CollectionStatistics":
+        total_supply = collection.token_total_supply
+        null_attributes: dict[AttributeName, CollectionAttribute] = {}
+        collection_attributes: dict[AttributeName, list[CollectionAttribute]] = {}
+        cardinalities: dict[AttributeName, int] = {}
+        probabilities: list[float] = []
+        singleton_attributes: dict[AttributeName, set[AttributeValue]] = {}
+
+        for (
+            trait_name,
+            trait_values,
+        ) in collection.attributes_frequency_counts.items():
+            collection_attributes[trait_name] = [
+                CollectionAttribute(
+                    attribute=StringAttribute(trait_name, str(trait_value)),
+                    total_tokens=trait_count,
+                )
+                for trait_value, trait_count in trait_values.items()
+            ]
+            cardinalities[trait_name] = len(trait_values)
+            probabilities.extend(
+                trait_count / total_supply for trait_count in trait_values.values()
+            )
+            singletons = {
+                trait_value
+                for trait_value, trait_count in trait_values.items()
+                if trait_count == 1
+            }
+            if singletons:
+                singleton_attributes[trait_name] = singletons
+
+            # Tokens without the trait have the Null attribute. It only has a
+            # probability if there is a positive number of tokens without it.
+            assets_without_trait = total_supply - sum(trait_values.values())
+            if assets_without_trait > 0:
+                null_attributes[trait_name] = CollectionAttribute(
+                    attribute=StringAttribute(trait_name, "Null"),
+                    total_tokens=assets_without_trait,
+                )
+                probabilities.append(assets_without_trait / total_supply)
+
+        probabilities_array = np.array(probabilities, dtype=np.float64)
+        return cls(
+            total_supply=total_supply,
+            null_attributes=null_attributes,
+            collection_attributes=collection_attributes,
+            cardinalities=cardinalities,
+            probabilities=probabilities_array,
+            entropy=float(-np.dot(probabilities_array, np.log2(probabilities_array))),
+            singleton_attributes=singleton_attributes,
+        )
+
+
 @dataclass
 class Collection:
     """Class represents collection of tokens used to determine token rarity score.
@@ -43,10 +190,13 @@ class Collection:
     ----------
     tokens : list[Token]
         list of all Tokens that belong to the collection
-    attributes_frequency_counts: dict[AttributeName, dict[AttributeValue, int]]
+    attributes_frequency_counts: Mapping[AttributeName, Mapping[AttributeValue, int]]
         dictionary of attributes to the number of tokens in this collection that has
         a specific value for every possible value for the given attribute.
 
+        The counts are a read-only view that is kept up to date when tokens are
+        added, removed or updated, since data in `statistics` is derived from them.
+
         If not provided, the attributes distribution will be derived from the
         attributes on the tokens provided.
 
@@ -60,13 +210,26 @@ class Collection:
 
     name: A reference string only used for debugger log lines
 
-    We do not recommend resetting @tokens attribute after Collection initialization
-    as that will mess up cached property values:
+    Besides the frequency counts, the collection interns all string attribute
+    names and values into an AttributeVocabulary and keeps a compact
+    (token, attribute name id) matrix of attribute value ids, see
+    `vocabulary` and `attribute_codes`.
+
+    Collection-level data derived from the frequency counts, e.g. null attribute
+    counts and entropy, is computed once on first use and cached in
+    `statistics`.
+
+    Tokens can be added, removed or have their metadata updated after
+    initialization with add_tokens, remove_tokens and update_token_metadata,
+    which keep all derived data up to date. We do not recommend resetting @tokens
+    attribute after Collection initialization as that will mess up derived values:
+        attributes_frequency_counts
+        attribute_codes
         has_numeric_attributes
         get_token_standards
     """
 
-    attributes_frequency_counts: dict[AttributeName, dict[AttributeValue, int]]
+    _attributes_frequency_counts: dict[AttributeName, dict[AttributeValue, int]]
     name: str
 
     def __init__(
@@ -88,35 +251,162 @@ class Collection:
                 stacklevel=2,
             )
         self._trait_countify(tokens)
-        self._tokens = tokens
+        self._tokens = list(tokens)
         self.name = name or ""
-        self.attributes_frequency_counts = (
+        self._statistics: CollectionStatistics | None = None
+        self._vocabulary = AttributeVocabulary()
+        self._attribute_codes = self._encode_and_intern_tokens(tokens)
+        # Attribute codes are a view of the first token_total_supply rows of the
+        # buffer, which has spare rows for tokens added later.
+        self._attribute_codes_buffer = self._attribute_codes
+        self._set_attributes_frequency_counts(
             self._derive_normalized_attributes_frequency_counts()
         )
+        self._attribute_name_counts = self._count_attribute_names()
+        self._token_indices: dict[TokenIdentifier, int] | None = None
+        # Only set if tokens were dropped, see from_token_stream
+        self._token_identifiers: list[TokenIdentifier] | None = None
+        self._numeric_token_count = 0
+        self._token_standard_counts: Counter[TokenStandard] = Counter()
+        self._count_token_properties(tokens, sign=1)
+
+    @classmethod
+    def from_token_stream(
+        cls,
+        tokens: Iterable[Token],
+        name: str | None = "",
+        keep_tokens: bool = True,
+        chunk_size: int = 10_000,
+        keep_token_identifiers: bool = True,
+    ) -> "Collection":
+        """Creates a collection from an iterable of tokens, e.g. a generator of
+        tokens being fetched or read from a cache file, without materializing
+        the list of tokens first.
+
+        Tokens are consumed in chunks of `chunk_size`. Every chunk gets the meta
+        trait count attribute and is encoded and counted as it arrives, so that
+        producing and counting tokens overlap.
+
+        Parameters
+        ----------
+        tokens : Iterable[Token]
+            Tokens of the collection
+        name : str | None, optional
+            A reference string only used for debugger log lines, by default "".
+        keep_tokens : bool, optional
+            If False, Token objects are dropped once encoded, and only their
+            attribute codes and `token_identifiers` are kept. Such a collection has
+            no `tokens` and cannot be modified. IncrementalRarityRanker ranks it from
+            its attribute codes, with `scores` and `ranks` in order of
+            `token_identifiers`. Methods that score collection.tokens or return
+            TokenRarity objects, e.g. Scorer.score_collection and
+            RarityRanker.rank_collection, raise a ValueError for it.
+            By default True.
+        chunk_size : int, optional
+            Number of tokens encoded at once, by default 10,000.
+        keep_token_identifiers : bool, optional
+            If False and tokens are not kept, token identifiers are dropped as
+            well, so that memory use per token is limited to its attribute codes.
+            `token_identifiers` is then empty, and tokens are only known by their
+            index in the stream. By default True.
+
+        Returns
+        -------
+        Collection
+            Collection equal to Collection(list(tokens)).
+        """
+        collection = cls(tokens=[], name=name)
+        token_identifiers: list[TokenIdentifier] = []
+        value_counts: list[np.ndarray] = []
+        attribute_codes = np.empty((0, 0), dtype=np.int32)
+        total_supply = 0
+
+        token_iterator = iter(tokens)
+        while chunk := list(itertools.islice(token_iterator, chunk_size)):
+            collection._trait_countify(chunk)
+            codes = collection._encode_and_intern_tokens(chunk)
+            collection._add_value_counts(value_counts, codes)
+            collection._count_token_properties(chunk, sign=1)
+            attribute_codes = _write_attribute_codes_rows(
+                attribute_codes, codes, start=total_supply
+            )
+            total_supply += len(chunk)
+            if keep_tokens:
+                collection._tokens.extend(chunk)
+            elif keep_token_identifiers:
+                token_identifiers.extend(token.token_identifier for token in chunk)
+
+        collection._attribute_codes_buffer = attribute_codes
+        collection._attribute_codes = attribute_codes[:total_supply]
+        collection._set_attributes_frequency_counts(
+            collection._to_attributes_frequency_counts(value_counts)
+        )
+        collection._attribute_name_counts = collection._count_attribute_names()
+        collection._statistics = None
+        if not keep_tokens:
+            collection._token_identifiers = token_identifiers
+
+        return collection
 
     @property
     def tokens(self) -> list[Token]:
         return self._tokens
 
+    @property
+    def token_identifiers(self) -> list[TokenIdentifier]:
+        """Identifiers of all tokens in order of `tokens`, which are kept even
+        if the tokens were dropped unless keep_token_identifiers was False, see
+        from_token_stream."""
+        if self._token_identifiers is not None:
+            return self._token_identifiers
+        return [token.token_identifier for token in self._tokens]
+
+    @property
+    def has_tokens(self) -> bool:
+        """False if Token objects were dropped, see from_token_stream."""
+        return self._token_identifiers is None
+
     @property
     def token_total_supply(self) -> int:
-        return len(self._tokens)
+        return len(self._attribute_codes)
+
+    @property
+    def vocabulary(self) -> AttributeVocabulary:
+        """Interned string attribute names and values of all tokens."""
+        return self._vocabulary
+
+    @property
+    def attribute_codes(self) -> np.ndarray:
+        """Returns the string attributes of all tokens as a matrix of attribute
+        value ids with a row for every token (in order of `tokens`) and a column
+        for every attribute name id in `vocabulary`. Tokens that do not have an
+        attribute have NULL_ATTRIBUTE_CODE in that column.
+        """
+        return self._attribute_codes
+
+    @property
+    def attributes_frequency_counts(
+        self,
+    ) -> Mapping[AttributeName, Mapping[AttributeValue, int]]:
+        """Read-only view of the number of tokens with every attribute value, by
+        attribute name. It is updated by add_tokens, remove_tokens and
+        update_token_metadata, which also reset `statistics`."""
+        return self._attributes_frequency_counts_view
+
+    @property
+    def statistics(self) -> CollectionStatistics:
+        """Collection-level data derived from attributes_frequency_counts. It is
+        computed on first access and recomputed only after the collection is
+        modified with add_tokens, remove_tokens or update_token_metadata."""
+        if self._statistics is None:
+            self._statistics = CollectionStatistics.from_collection(self)
+        return self._statistics
 
-    @cached_property
+    @property
     def has_numeric_attribute(self) -> bool:
-        return (
-            next(
-                filter(
-                    lambda t: len(t.metadata.numeric_attributes)
-                    or len(t.metadata.date_attributes),
-                    self._tokens,
-                ),
-                None,
-            )
-            is not None
-        )
+        return self._numeric_token_count > 0
 
-    @cached_property
+    @property
     def token_standards(self) -> list[TokenStandard]:
         """Returns token standards for this collection.
 
@@ -126,10 +416,11 @@ class Collection:
             the set of unique token standards that any token in this collection
             interfaces or uses.
         """
-        token_standards = set()
-        for token in self._tokens:
-            token_standards.add(token.token_standard)
-        return list(token_standards)
+        return [
+            token_standard
+            for token_standard, count in self._token_standard_counts.items()
+            if count > 0
+        ]
 
     def total_tokens_with_attribute(self, attribute: StringAttribute) -> int:
         """Returns the numbers of tokens in this collection with the attribute
@@ -145,7 +436,7 @@ class Collection:
         )
 
     def total_attribute_values(self, attribute_name: str) -> int:
-        return len(self.attributes_frequency_counts.get(attribute_name, {}))
+        return self.statistics.cardinalities.get(attribute_name, 0)
 
     def extract_null_attributes(
         self,
@@ -158,31 +449,7 @@ class Collection:
             dict of attribute name to the number of assets without the attribute
             (e.g. # of assets where AttributeName=NULL)
         """
-        result = {}
-        for (
-            trait_name,
-            trait_values,
-        ) in self.attributes_frequency_counts.items():
-            # To obtain probabilities for missing attributes
-            # e.g. value of trait not set for the asset
-            #
-            # We sum all values counts for particular
-            # attributes and subtract it from total supply.
-            # This number divided by total supply is a
-            # probability of Null attribute
-            total_trait_count = sum(trait_values.values())
-
-            # compute null trait probability
-            # only if there is a positive number of assets without
-            # this trait
-            assets_without_trait = self.token_total_supply - total_trait_count
-            if assets_without_trait > 0:
-                result[trait_name] = CollectionAttribute(
-                    attribute=StringAttribute(trait_name, "Null"),
-                    total_tokens=assets_without_trait,
-                )
-
-        return result
+        return dict(self.statistics.null_attributes)
 
     def extract_collection_attributes(
         self,
@@ -194,22 +461,476 @@ class Collection:
         dict[str, CollectionAttribute]
             dict of attribute name to count of assets missing the attribute
         """
+        return defaultdict(
+            list,
+            {
+                trait_name: list(collection_attributes)
+                for (
+                    trait_name,
+                    collection_attributes,
+                ) in self.statistics.collection_attributes.items()
+            },
+        )
 
-        collection_traits: dict[str, list[CollectionAttribute]] = defaultdict(list)
+    def add_tokens(self, tokens: list[Token]) -> CollectionChangeSet:
+        """Adds tokens to the collection, e.g. for late mints.
+        Only the counts of the attributes of the added tokens are updated.
 
-        for (
-            trait_name,
-            trait_value_dict,
-        ) in self.attributes_frequency_counts.items():
-            for trait_value, trait_count in trait_value_dict.items():
-                collection_traits[trait_name].append(
-                    CollectionAttribute(
-                        attribute=StringAttribute(trait_name, str(trait_value)),
-                        total_tokens=trait_count,
+        Parameters
+        ----------
+        tokens : list[Token]
+            Tokens to append to collection.tokens. Tokens are modified in place
+            to have the meta trait count attribute, same as on initialization.
+
+        Returns
+        -------
+        CollectionChangeSet
+            the changes made to the collection
+
+        Raises
+        ------
+        ValueError
+            If a token identifier already belongs to a token of the collection or
+            to another added token, or if the tokens of the collection were dropped.
+        """
+        self._check_has_tokens()
+        token_indices = self._get_token_indices_by_identifier()
+        token_identifiers = [token.token_identifier for token in tokens]
+        duplicate_identifiers = [
+            token_identifier
+            for token_identifier, count in Counter(token_identifiers).items()
+            if count > 1 or token_identifier in token_indices
+        ]
+        if duplicate_identifiers:
+            raise ValueError(
+                f"Tokens {duplicate_identifiers} already exist in {self} "
+                "or are added more than once"
+            )
+
+        self._statistics = None
+        previous_total_supply = self.token_total_supply
+
+        self._trait_countify(tokens)
+        new_codes = self._encode_and_intern_tokens(tokens)
+        self._append_attribute_codes(new_codes)
+        self._tokens.extend(tokens)
+        for index, token_identifier in enumerate(
+            token_identifiers, start=previous_total_supply
+        ):
+            token_indices[token_identifier] = index
+
+        attributes_frequency_deltas = self._count_attribute_codes(new_codes, sign=1)
+        self._count_token_properties(tokens, sign=1)
+
+        return self._build_change_set(
+            previous_total_supply=previous_total_supply,
+            attributes_frequency_deltas=attributes_frequency_deltas,
+            added_token_indices=list(
+                range(previous_total_supply, self.token_total_supply)
+            ),
+        )
+
+    def remove_tokens(
+        self, token_identifiers: list[TokenIdentifier]
+    ) -> CollectionChangeSet:
+        """Removes tokens from the collection, e.g. for burns.
+        Only the counts of the attributes of the removed tokens are updated.
+
+        The last tokens of the collection are moved into the places of removed
+        tokens, so that no other token changes its index in collection.tokens,
+        see CollectionChangeSet.moved_token_indices.
+
+        Parameters
+        ----------
+        token_identifiers : list[TokenIdentifier]
+            Identifiers of the tokens to remove.
+
+        Returns
+        -------
+        CollectionChangeSet
+            the changes made to the collection
+
+        Raises
+        ------
+        ValueError
+            If a token identifier does not belong to a token of the collection,
+            or if the tokens of the collection were dropped.
+        """
+        self._check_has_tokens()
+        self._statistics = None
+        previous_total_supply = self.token_total_supply
+
+        removed_indices = sorted(set(self.get_token_indices(token_identifiers)))
+        removed_tokens = [self._tokens[index] for index in removed_indices]
+        removed_codes = self._attribute_codes[removed_indices]
+
+        attributes_frequency_deltas = self._count_attribute_codes(
+            removed_codes, sign=-1
+        )
+        self._count_token_properties(removed_tokens, sign=-1)
+
+        # Kept tokens after the new end of the collection fill the places of
+        # removed tokens before it
+        total_supply = previous_total_supply - len(removed_indices)
+        removed = set(removed_indices)
+        moved_token_indices = dict(
+            zip(
+                [
+                    index
+                    for index in range(total_supply, previous_total_supply)
+                    if index not in removed
+                ],
+                [index for index in removed_indices if index < total_supply],
+            )
+        )
+        token_indices = self._get_token_indices_by_identifier()
+        for token in removed_tokens:
+            del token_indices[token.token_identifier]
+        for previous_index, index in moved_token_indices.items():
+            token = self._tokens[previous_index]
+            self._tokens[index] = token
+            token_indices[token.token_identifier] = index
+        self._attribute_codes_buffer[
+            list(moved_token_indices.values())
+        ] = self._attribute_codes_buffer[list(moved_token_indices.keys())]
+        del self._tokens[total_supply:]
+        self._attribute_codes = self._attribute_codes_buffer[:total_supply]
+
+        return self._build_change_set(
+            previous_total_supply=previous_total_supply,
+            attributes_frequency_deltas=attributes_frequency_deltas,
+            removed_token_indices=removed_indices,
+            moved_token_indices=moved_token_indices,
+            removed_tokens=removed_tokens,
+        )
+
+    def update_token_metadata(
+        self, token_metadata: dict[TokenIdentifier, TokenMetadata]
+    ) -> CollectionChangeSet:
+        """Replaces the metadata of tokens in the collection, e.g. for reveals.
+        Only the counts of the previous and new attributes of the updated tokens
+        are updated.
+
+        Parameters
+        ----------
+        token_metadata : dict[TokenIdentifier, TokenMetadata]
+            New metadata for the tokens with the given identifiers. The tokens are
+            modified in place and metadata gets the meta trait count attribute,
+            same as on initialization.
+
+        Returns
+        -------
+        CollectionChangeSet
+            the changes made to the collection
+
+        Raises
+        ------
+        ValueError
+            If a token identifier does not belong to a token of the collection,
+            or if the tokens of the collection were dropped.
+        """
+        self._check_has_tokens()
+        self._statistics = None
+        updated_indices = self.get_token_indices(list(token_metadata.keys()))
+        updated_tokens = [self._tokens[index] for index in updated_indices]
+
+        previous_codes = self._attribute_codes[updated_indices]
+        self._count_token_properties(updated_tokens, sign=-1)
+
+        for token, metadata in zip(updated_tokens, token_metadata.values()):
+            token.metadata = metadata
+        self._trait_countify(updated_tokens)
+        new_codes = self._encode_and_intern_tokens(updated_tokens)
+        self._resize_attribute_codes()
+        self._attribute_codes[updated_indices] = new_codes
+        self._count_token_properties(updated_tokens, sign=1)
+
+        # New attributes are counted first so that attribute values kept by other
+        # updated tokens are not removed from attributes_frequency_counts.
+        attributes_frequency_deltas = self._count_attribute_codes(new_codes, sign=1)
+        for attr_name, value_deltas in self._count_attribute_codes(
+            previous_codes, sign=-1
+        ).items():
+            name_deltas = attributes_frequency_deltas.setdefault(attr_name, {})
+            for attr_value, delta in value_deltas.items():
+                name_deltas[attr_value] = name_deltas.get(attr_value, 0) + delta
+
+        return self._build_change_set(
+            previous_total_supply=self.token_total_supply,
+            attributes_frequency_deltas=attributes_frequency_deltas,
+            updated_token_indices=updated_indices,
+        )
+
+    def get_token_indices(self, token_identifiers: list[TokenIdentifier]) -> list[int]:
+        """Returns the indices in collection.tokens of the tokens with the given
+        token identifiers.
+
+        Raises
+        ------
+        ValueError
+            If a token identifier does not belong to a token of the collection.
+        """
+        token_indices = self._get_token_indices_by_identifier()
+        indices = []
+        for token_identifier in token_identifiers:
+            index = token_indices.get(token_identifier)
+            if index is None:
+                raise ValueError(f"Token {token_identifier} does not exist in {self}")
+            indices.append(index)
+        return indices
+
+    def encode_tokens(self, tokens: list[Token]) -> np.ndarray:
+        """Encodes the string attributes of tokens into attribute value ids of
+        this collection's vocabulary, in the same format as `attribute_codes`.
+
+        Parameters
+        ----------
+        tokens : list[Token]
+            The tokens to encode. Tokens may or may not belong to the collection.
+
+        Returns
+        -------
+        np.ndarray
+            (len(tokens), len(vocabulary)) matrix of attribute value ids
+
+        Raises
+        ------
+        ValueError
+            If a token has a string attribute that no token in the collection has.
+        """
+        if tokens is self._tokens and self.has_tokens:
+            return self._attribute_codes
+
+        codes = np.full(
+            (len(tokens), len(self._vocabulary)), NULL_ATTRIBUTE_CODE, dtype=np.int32
+        )
+        for row, token in enumerate(tokens):
+            for attr_name, str_attr in token.metadata.string_attributes.items():
+                name_id = self._vocabulary.name_id(attr_name)
+                value_id = (
+                    None
+                    if name_id is None
+                    else self._vocabulary.value_id(name_id, str_attr.value)
+                )
+                if value_id is None:
+                    raise ValueError(
+                        f"Attribute {attr_name}={str_attr.value} of {token} does not "
+                        f"exist in {self}"
                     )
+                codes[row, name_id] = value_id
+
+        return codes
+
+    def add_trait_count_attributes(self, tokens: list[Token]) -> None:
+        """Adds the meta trait count attribute that tokens of the collection have
+        to tokens, e.g. to encode or score tokens of a collection created with
+        from_token_stream(keep_tokens=False) when they are streamed again.
+
+        Parameters
+        ----------
+        tokens : list[Token]
+            Tokens to add the trait count attribute to. Modifies in place.
+        """
+        self._trait_countify(tokens)
+
+    def _get_token_indices_by_identifier(self) -> dict[TokenIdentifier, int]:
+        """Returns the index in collection.tokens of every token identifier. It is
+        built on first use and kept up to date by add_tokens and remove_tokens."""
+        if self._token_indices is None:
+            self._token_indices = {
+                token_identifier: index
+                for index, token_identifier in enumerate(self.token_identifiers)
+            }
+        return self._token_indices
+
+    def _check_has_tokens(self) -> None:
+        if not self.has_tokens:
+            raise ValueError(f"Tokens of {self} were dropped, it cannot be modified")
+
+    def _encode_and_intern_tokens(self, tokens: list[Token]) -> np.ndarray:
+        """Interns the string attributes of tokens into the collection vocabulary
+        and returns their attribute value ids in the format of `attribute_codes`.
+        Numeric or date attributes currently not supported.
+        """
+        rows: list[int] = []
+        name_ids: list[int] = []
+        value_ids: list[int] = []
+        for row, token in enumerate(tokens):
+            for str_attr in token.metadata.string_attributes.values():
+                name_id, value_id = self._vocabulary.intern(
+                    str_attr.name, str_attr.value
+                )
+                rows.append(row)
+                name_ids.append(name_id)
+                value_ids.append(value_id)
+
+        codes = np.full(
+            (len(tokens), len(self._vocabulary)), NULL_ATTRIBUTE_CODE, dtype=np.int32
+        )
+        codes[rows, name_ids] = value_ids
+        return codes
+
+    def _resize_attribute_codes(self) -> None:
+        """Adds null columns to the attribute codes for attribute names that were
+        interned after the attribute codes were built."""
+        missing_columns = len(self._vocabulary) - self._attribute_codes.shape[1]
+        if missing_columns > 0:
+            total_supply = self.token_total_supply
+            self._attribute_codes_buffer = np.pad(
+                self._attribute_codes_buffer,
+                ((0, 0), (0, missing_columns)),
+                constant_values=NULL_ATTRIBUTE_CODE,
+            )
+            self._attribute_codes = self._attribute_codes_buffer[:total_supply]
+
+    def _append_attribute_codes(self, attribute_codes: np.ndarray) -> None:
+        """Appends rows for new tokens to the attribute codes. The buffer grows
+        geometrically, so that appends take amortized time in the number of new
+        tokens."""
+        self._resize_attribute_codes()
+        previous_total_supply = self.token_total_supply
+        total_supply = previous_total_supply + len(attribute_codes)
+        if total_supply > len(self._attribute_codes_buffer):
+            buffer = np.full(
+                (
+                    max(total_supply, 2 * len(self._attribute_codes_buffer)),
+                    self._attribute_codes_buffer.shape[1],
+                ),
+                NULL_ATTRIBUTE_CODE,
+                dtype=np.int32,
+            )
+            buffer[:previous_total_supply] = self._attribute_codes
+            self._attribute_codes_buffer = buffer
+        self._attribute_codes_buffer[
+            previous_total_supply:total_supply
+        ] = attribute_codes
+        self._attribute_codes = self._attribute_codes_buffer[:total_supply]
+
+    def _count_attribute_codes(
+        self, attribute_codes: np.ndarray, sign: int
+    ) -> dict[AttributeName, dict[AttributeValue, int]]:
+        """Adds (sign=1) or subtracts (sign=-1) the attributes in attribute_codes
+        to attributes_frequency_counts, removing attribute values and names
+        that no token has anymore.
+
+        Returns
+        -------
+        dict[AttributeName, dict[AttributeValue, int]]
+            the change of the count of every attribute name/value pair
+        """
+        deltas: dict[AttributeName, dict[AttributeValue, int]] = {}
+        rows, name_ids = np.nonzero(attribute_codes != NULL_ATTRIBUTE_CODE)
+        for row, name_id in zip(rows.tolist(), name_ids.tolist()):
+            attr_name = self._vocabulary.names[name_id]
+            attr_value = self._vocabulary.values[name_id][attribute_codes[row, name_id]]
+            name_deltas = deltas.setdefault(attr_name, {})
+            name_deltas[attr_value] = name_deltas.get(attr_value, 0) + sign
+
+            value_counts = self._attributes_frequency_counts.get(attr_name)
+            if value_counts is None:
+                value_counts = self._attributes_frequency_counts[attr_name] = {}
+                self._attribute_value_counts_views[attr_name] = MappingProxyType(
+                    value_counts
                 )
+            count = value_counts.get(attr_value, 0) + sign
+            if count > 0:
+                value_counts[attr_value] = count
+            else:
+                del value_counts[attr_value]
+                if not value_counts:
+                    del self._attributes_frequency_counts[attr_name]
+                    del self._attribute_value_counts_views[attr_name]
+
+            name_count = self._attribute_name_counts.get(attr_name, 0) + sign
+            if name_count > 0:
+                self._attribute_name_counts[attr_name] = name_count
+            else:
+                del self._attribute_name_counts[attr_name]
+
+        return deltas
+
+    def _count_token_properties(self, tokens: list[Token], sign: int) -> None:
+        """Adds (sign=1) or subtracts (sign=-1) tokens from the counts backing
+        has_numeric_attribute and token_standards."""
+        for token in tokens:
+            if token.metadata.numeric_attributes or token.metadata.date_attributes:
+                self._numeric_token_count += sign
+            self._token_standard_counts[token.token_standard] += sign
+
+    def _count_attribute_names(self) -> dict[AttributeName, int]:
+        """Returns the number of tokens with every attribute name, which is kept
+        up to date by _count_attribute_codes."""
+        return {
+            attr_name: sum(value_counts.values())
+            for attr_name, value_counts in self._attributes_frequency_counts.items()
+        }
+
+    def _set_attributes_frequency_counts(
+        self,
+        attributes_frequency_counts: dict[AttributeName, dict[AttributeValue, int]],
+    ) -> None:
+        """Sets the counts behind the read-only attributes_frequency_counts view,
+        which has a read-only view of the value counts of every attribute name."""
+        self._attributes_frequency_counts = attributes_frequency_counts
+        self._attribute_value_counts_views = {
+            attr_name: MappingProxyType(value_counts)
+            for attr_name, value_counts in attributes_frequency_counts.items()
+        }
+        self._attributes_frequency_counts_view: Mapping[
+            AttributeName, Mapping[AttributeValue, int]
+        ] = MappingProxyType(self._attribute_value_counts_views)
+
+    def _build_change_set(
+        self,
+        previous_total_supply: int,
+        attributes_frequency_deltas: dict[AttributeName, dict[AttributeValue, int]],
+        **kwargs,
+    ) -> CollectionChangeSet:
+        total_supply = self.token_total_supply
+        attributes_frequency_deltas = {
+            attr_name: {
+                attr_value: delta
+                for attr_value, delta in value_deltas.items()
+                if delta != 0
+            }
+            for attr_name, value_deltas in attributes_frequency_deltas.items()
+        }
+        name_count_deltas = {
+            attr_name: sum(value_deltas.values())
+            for attr_name, value_deltas in attributes_frequency_deltas.items()
+        }
+
+        # A change of the total supply changes the null count of every attribute
+        # name, otherwise only attribute names of changed tokens are affected.
+        changed_attr_names = (
+            self._attribute_name_counts.keys() | name_count_deltas.keys()
+            if total_supply != previous_total_supply
+            else name_count_deltas.keys()
+        )
+        null_attribute_deltas: dict[AttributeName, int] = {}
+        for attr_name in changed_attr_names:
+            name_count = self._attribute_name_counts.get(attr_name, 0)
+            previous_name_count = name_count - name_count_deltas.get(attr_name, 0)
+            previous_null_count = (
+                previous_total_supply - previous_name_count
+                if previous_name_count > 0
+                else 0
+            )
+            null_count = total_supply - name_count if name_count > 0 else 0
+            if null_count != previous_null_count:
+                null_attribute_deltas[attr_name] = null_count - previous_null_count
 
-        return collection_traits
+        return CollectionChangeSet(
+            previous_total_supply=previous_total_supply,
+            total_supply=total_supply,
+            attributes_frequency_deltas={
+                attr_name: value_deltas
+                for attr_name, value_deltas in attributes_frequency_deltas.items()
+                if value_deltas
+            },
+            null_attribute_deltas=null_attribute_deltas,
+            **kwargs,
+        )
 
     def _trait_countify(self, tokens: list[Token]) -> None:
         """Updates tokens to have meta attribute "meta trait: trait_count" if it doesn't
@@ -233,7 +954,9 @@ class Collection:
             # we will not remove it. In the future, we can refactor to distinguish
             # between meta and non-meta attributes.
             token.metadata.add_attribute(
-                StringAttribute(name=TRAIT_COUNT_ATTRIBUTE_NAME, value=str(trait_count))
+                intern_string_attribute(
+                    name=TRAIT_COUNT_ATTRIBUTE_NAME, value=str(trait_count)
+                )
             )
 
     def _normalize_attributes_frequency_counts(
@@ -283,22 +1006,64 @@ class Collection:
             that has a specific value for every possible value for the given
             attribute, by default None.
         """
-        attrs_freq_counts: dict[AttributeName, dict[AttributeValue, int]] = defaultdict(
-            dict
-        )
+        value_counts: list[np.ndarray] = []
+        self._add_value_counts(value_counts, self._attribute_codes)
+        return self._to_attributes_frequency_counts(value_counts)
 
-        for token in self._tokens:
-            for (
-                attr_name,
-                str_attr,
-            ) in token.metadata.string_attributes.items():
-                normalized_name = normalize_attribute_string(attr_name)
-                if str_attr.value not in attrs_freq_counts[attr_name]:
-                    attrs_freq_counts[normalized_name][str_attr.value] = 1
-                else:
-                    attrs_freq_counts[normalized_name][str_attr.value] += 1
+    def _add_value_counts(
+        self, value_counts: list[np.ndarray], attribute_codes: np.ndarray
+    ) -> None:
+        """Adds the number of tokens with every attribute value in attribute_codes
+        to value_counts, which has an array of counts indexed by value id for
+        every attribute name id. Modifies value_counts in place."""
+        for name_id in range(attribute_codes.shape[1]):
+            name_codes = attribute_codes[:, name_id]
+            counts = np.bincount(
+                name_codes[name_codes != NULL_ATTRIBUTE_CODE],
+                minlength=len(self._vocabulary.values[name_id]),
+            )
+            if name_id == len(value_counts):
+                value_counts.append(counts)
+            else:
+                previous_counts = value_counts[name_id]
+                counts[: len(previous_counts)] += previous_counts
+                value_counts[name_id] = counts
+
+    def _to_attributes_frequency_counts(
+        self, value_counts: list[np.ndarray]
+    ) -> dict[AttributeName, dict[AttributeValue, int]]:
+        """Converts value counts (see _add_value_counts) into the format of
+        attributes_frequency_counts."""
+        attrs_freq_counts: dict[AttributeName, dict[AttributeValue, int]] = {}
+        for name_id, counts in enumerate(value_counts):
+            attrs_freq_counts[self._vocabulary.names[name_id]] = {
+                attr_value: int(count)
+                for attr_value, count in zip(self._vocabulary.values[name_id], counts)
+                if count > 0
+            }
 
-        return dict(attrs_freq_counts)
+        return attrs_freq_counts
 
     def __str__(self) -> str:
         return f"Collection[{self.name}]"
+
+
+def _write_attribute_codes_rows(
+    buffer: np.ndarray, attribute_codes: np.ndarray, start: int
+) -> np.ndarray:
+    """Writes attribute codes into the rows of buffer from start on, and returns
+    the buffer. The buffer grows geometrically in place with realloc, which does
+    not hold a copy of the existing rows for large buffers, so it must not have
+    views. Attribute names interned after earlier rows were written add null
+    columns, which copies the buffer."""
+    if attribute_codes.shape[1] > buffer.shape[1]:
+        buffer = np.pad(
+            buffer,
+            ((0, 0), (0, attribute_codes.shape[1] - buffer.shape[1])),
+            constant_values=NULL_ATTRIBUTE_CODE,
+        )
+    end = start + len(attribute_codes)
+    if end > len(buffer):
+        buffer.resize((max(end, 2 * len(buffer)), buffer.shape[1]), refcheck=False)
+    buffer[start:end] = attribute_codes
+    return buffer
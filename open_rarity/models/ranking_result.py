@@ -0,0 +1,137 @@
+from typing import Iterator, overload
+
+import numpy as np
+
+from open_rarity.models.token import Token
+from open_rarity.models.token_ranking_features import TokenRankingFeatures
+from open_rarity.models.token_rarity import TokenRarity
+
+# Fields of the records returned by RankingResult.to_records
+RANKING_RECORD_DTYPE = np.dtype(
+    [
+        ("token_index", np.int64),
+        ("score", np.float64),
+        ("unique_attribute_count", np.int64),
+        ("rank", np.int64),
+    ]
+)
+
+
+class RankingResult:
+    """Class represents the ranking of a collection's tokens as parallel arrays
+    in rank order, see RarityRanker.rank_collection_result.
+
+    Unlike a list of TokenRarity, no object is allocated per token: TokenRarity
+    objects are only created when tokens are accessed by index or iteration, and
+    are not stored, so changes to them do not change the result. Bulk exports
+    should read the arrays or to_records() instead.
+
+    Parameters
+    ----------
+    tokens : list[Token]
+        tokens of the ranked collection, in collection order
+    token_indices : np.ndarray
+        index in `tokens` of every ranked token, in rank order
+    scores : np.ndarray
+        score of every ranked token, in rank order
+    unique_attribute_counts : np.ndarray
+        unique attribute count of every ranked token, in rank order
+    ranks : np.ndarray
+        rank of every ranked token, in rank order
+    """
+
+    def __init__(
+        self,
+        tokens: list[Token],
+        token_indices: np.ndarray,
+        scores: np.ndarray,
+        unique_attribute_counts: np.ndarray,
+        ranks: np.ndarray,
+    ):
+        lengths = [
+            len(array)
+            for array in (token_indices, scores, unique_attribute_counts, ranks)
+        ]
+        if len(set(lengths)) > 1:
+            raise ValueError(f"Ranking arrays have different lengths: {lengths}")
+        self.tokens = tokens
+        self.token_indices = token_indices
+        self.scores = scores
+        self.unique_attribute_counts = unique_attribute_counts
+        self.ranks = ranks
+
+    @classmethod
+    def empty(cls) -> "RankingResult":
+        return cls(
+            tokens=[],
+            token_indices=np.zeros(0, dtype=np.int64),
+            scores=np.zeros(0, dtype=np.float64),
+            unique_attribute_counts=np.zeros(0, dtype=np.int64),
+            ranks=np.zeros(0, dtype=np.int64),
+        )
+
+    def __len__(self) -> int:
+        return len(self.token_indices)
+
+    @overload
+    def __getitem__(self, key: int) -> TokenRarity:
+        ...
+
+    @overload
+    def __getitem__(self, key: slice) -> "RankingResult":
+        ...
+
+    def __getitem__(self, key: int | slice) -> "TokenRarity | RankingResult":
+        """Returns the TokenRarity at the given position in rank order, or a
+        RankingResult of views of the arrays for a slice."""
+        if isinstance(key, slice):
+            return RankingResult(
+                tokens=self.tokens,
+                token_indices=self.token_indices[key],
+                scores=self.scores[key],
+                unique_attribute_counts=self.unique_attribute_counts[key],
+                ranks=self.ranks[key],
+            )
+        return TokenRarity(
+            token=self.tokens[self.token_indices[key]],
+            score=float(self.scores[key]),
+            token_features=TokenRankingFeatures(
+                unique_attribute_count=int(self.unique_attribute_counts[key])
+            ),
+            rank=int(self.ranks[key]),
+        )
+
+    def __iter__(self) -> Iterator[TokenRarity]:
+        """Yields a TokenRarity per token in rank order, creating one at a time."""
+        tokens = self.tokens
+        for idx, score, unique_attribute_count, rank in zip(
+            self.token_indices.tolist(),
+            self.scores.tolist(),
+            self.unique_attribute_counts.tolist(),
+            self.ranks.tolist(),
+        ):
+            yield TokenRarity(
+                token=tokens[idx],
+                score=score,
+                token_features=TokenRankingFeatures(
+                    unique_attribute_count=unique_attribute_count
+                ),
+                rank=rank,
+            )
+
+    def to_records(self) -> np.ndarray:
+        """Returns the ranking as a structured array in rank order, with the
+        fields of RANKING_RECORD_DTYPE.
+
+        Returns
+        -------
+        np.ndarray
+            record of token index, score, unique attribute count and rank of
+            every ranked token
+        """
+        records = np.empty(len(self), dtype=RANKING_RECORD_DTYPE)
+        records["token_index"] = self.token_indices
+        records["score"] = self.scores
+        records["unique_attribute_count"] = self.unique_attribute_counts
+        records["rank"] = self.ranks
+        return records
@@ -17,7 +17,7 @@ from open_rarity.models.token_standard import TokenStandard
 from open_rarity.models.utils.attribute_utils import normalize_attribute_string
 
 
-@dataclass
+@dataclass(slots=True)
 class Token:
     """Class represents a token on the blockchain.
     Examples of these are non-fungible tokens, or semi-fungible tokens.
@@ -1,5 +1,7 @@
 import datetime
-from dataclasses import dataclass, field
+import sys
+from dataclasses import dataclass, field, replace
+from functools import lru_cache
 from typing import Any
 
 from open_rarity.models.utils.attribute_utils import normalize_attribute_string
@@ -7,11 +9,25 @@ from open_rarity.models.utils.attribute_utils import normalize_attribute_string
 AttributeName = str
 AttributeValue = str
 
+# Maximum number of distinct raw attribute strings and (name, value) pairs whose
+# normalization and StringAttribute are cached
+ATTRIBUTE_CACHE_SIZE = 2**18
 
-@dataclass
+
+@lru_cache(maxsize=ATTRIBUTE_CACHE_SIZE)
+def _normalize_attribute_string(value: str) -> str:
+    """Memoized normalize_attribute_string, which returns interned strings so
+    that equal attribute names and values share a single string object."""
+    return sys.intern(normalize_attribute_string(value))
+
+
+@dataclass(frozen=True, slots=True)
 class StringAttribute:
     """Class represents string token attribute name and value
 
+    String attributes are immutable, so that instances can be shared by all
+    tokens with the same attribute, see intern_string_attribute.
+
     Attributes
     ----------
     name : AttributeName
@@ -26,11 +42,42 @@ class StringAttribute:
     def __init__(self, name: AttributeName, value: AttributeValue):
         # We treat string attributes name and value the same regardless of
         # casing or leading/trailing whitespaces.
-        self.name = normalize_attribute_string(name)
-        self.value = normalize_attribute_string(value)
+        object.__setattr__(self, "name", _normalize_attribute_string(name))
+        object.__setattr__(self, "value", _normalize_attribute_string(value))
+
+
+def intern_string_attribute(
+    name: AttributeName, value: AttributeValue
+) -> StringAttribute:
+    """Returns a StringAttribute with the given name and value, which is shared
+    with all other callers passing the same raw name and value. Collections
+    have few distinct attributes shared by many tokens, so tokens created
+    through this factory share their attribute objects.
+
+    Parameters
+    ----------
+    name : AttributeName
+        name of the attribute, before normalization
+    value : AttributeValue
+        value of the attribute, before normalization
+
+    Returns
+    -------
+    StringAttribute
+        the shared string attribute
+    """
+    # Positional arguments, so that keyword and positional calls share the cache
+    return _intern_string_attribute(name, value)
+
 
+@lru_cache(maxsize=ATTRIBUTE_CACHE_SIZE)
+def _intern_string_attribute(
+    name: AttributeName, value: AttributeValue
+) -> StringAttribute:
+    return StringAttribute(name=name, value=value)
 
-@dataclass
+
+@dataclass(slots=True)
 class NumericAttribute:
     """Class represents numeric token attribute name and value
 
@@ -48,11 +95,11 @@ class NumericAttribute:
     def __init__(self, name: AttributeName, value: float | int):
         # We treat attributes names the same regardless of
         # casing or leading/trailing whitespaces.
-        self.name = normalize_attribute_string(name)
+        self.name = _normalize_attribute_string(name)
         self.value = value
 
 
-@dataclass
+@dataclass(slots=True)
 class DateAttribute:
     """Class represents date token attribute name and value
 
@@ -70,14 +117,14 @@ class DateAttribute:
     def __init__(self, name: AttributeName, value: int):
         # We treat attributes names the same regardless of
         # casing or leading/trailing whitespaces.
-        self.name = normalize_attribute_string(name)
+        self.name = _normalize_attribute_string(name)
         self.value = value
 
 
 Attribute = StringAttribute | NumericAttribute | DateAttribute
 
 
-@dataclass
+@dataclass(slots=True)
 class TokenMetadata:
     """Class represents EIP-721 or EIP-1115 compatible metadata structure
 
@@ -137,7 +184,7 @@ class TokenMetadata:
         date_attributes = {}
         for attr_name, attr_value in attributes.items():
             if isinstance(attr_value, str):
-                string_attributes[attr_name] = StringAttribute(
+                string_attributes[attr_name] = intern_string_attribute(
                     name=attr_name, value=attr_value
                 )
             elif isinstance(attr_value, (float, int)):
@@ -205,8 +252,9 @@ class TokenMetadata:
         """
         normalized_attributes_dict = {}
         for attribute_name, attr in attributes_dict.items():
-            normalized_attr_name = normalize_attribute_string(attribute_name)
-            normalized_attributes_dict[normalized_attr_name] = attr
+            normalized_attr_name = _normalize_attribute_string(attribute_name)
             if normalized_attr_name != attr.name:
-                attr.name = normalized_attr_name
+                # Attributes may be shared, so they are replaced, not modified
+                attr = replace(attr, name=normalized_attr_name)
+            normalized_attributes_dict[normalized_attr_name] = attr
         return normalized_attributes_dict
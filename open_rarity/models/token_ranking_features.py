@@ -1,7 +1,7 @@
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(slots=True)
 class TokenRankingFeatures:
     """Class represents all standardized ranking features
     that should be considered by the ranking function.
@@ -4,7 +4,7 @@ from open_rarity.models.token import Token
 from open_rarity.models.token_ranking_features import TokenRankingFeatures
 
 
-@dataclass
+@dataclass(slots=True)
 class TokenRarity:
     """The class holds rarity and optional rank information along with the token
 
@@ -0,0 +1,255 @@
+import csv
+import itertools
+import json
+import os
+from typing import Callable, Iterable, Iterator, Mapping, TextIO
+
+import numpy as np
+
+from open_rarity.models.collection import Collection
+from open_rarity.models.token import Token
+from open_rarity.models.token_identifier import EVMContractTokenIdentifier
+from open_rarity.models.token_metadata import (
+    AttributeName,
+    AttributeValue,
+    TokenMetadata,
+)
+from open_rarity.models.token_standard import TokenStandard
+from open_rarity.rarity_ranker import RarityRanker
+from open_rarity.scoring.handlers.information_content_scoring_handler import (
+    InformationContentScoringHandler,
+)
+from open_rarity.scoring.token_feature_extractor import TokenFeatureExtractor
+
+
+class OutOfCoreRarityRanker:
+    """Ranks collections that are too large to hold in memory as Token objects,
+    e.g. collections with millions of editions, in two passes over a stream of
+    tokens read from disk.
+
+    The first pass counts the attributes of all tokens into a collection created
+    with Collection.from_token_stream, which keeps only the compact attribute
+    codes of the tokens, and writes the token identifiers to `work_dir`. The
+    second pass scores the tokens chunk by chunk into memory-mapped arrays of
+    scores and unique attribute counts in `work_dir`. Ranks are then computed on
+    these arrays and written out with the token identifiers, so that at most
+    `chunk_size` tokens are held in memory at once.
+
+    Scores and ranks are identical to RarityRanker.rank_collection.
+
+    Parameters
+    ----------
+    token_stream : Callable[[], Iterable[Token]]
+        Returns a new stream of the collection tokens on every call, in the same
+        order, e.g. lambda: iter_tokens_from_jsonl(filename). It is called once
+        for every pass. See also iter_tokens_from_csv and, for the binary cache of
+        Opensea data, iter_collection_data_from_file.
+    work_dir : str
+        Directory to write the memory-mapped arrays and token identifiers to.
+    chunk_size : int, optional
+        Number of tokens processed at once, by default 100,000.
+
+    Example
+    -------
+        ranker = OutOfCoreRarityRanker(
+            lambda: iter_tokens_from_jsonl("tokens.jsonl"), work_dir="ranking"
+        )
+        ranker.rank("ranks.jsonl")
+    """
+
+    def __init__(
+        self,
+        token_stream: Callable[[], Iterable[Token]],
+        work_dir: str,
+        chunk_size: int = 100_000,
+    ):
+        self.token_stream = token_stream
+        self.work_dir = work_dir
+        self.chunk_size = chunk_size
+        self._collection = Collection(tokens=[])
+
+    @property
+    def total_supply(self) -> int:
+        return self._collection.token_total_supply
+
+    @property
+    def attributes_frequency_counts(
+        self,
+    ) -> Mapping[AttributeName, Mapping[AttributeValue, int]]:
+        """Attributes frequency counts of the streamed tokens, see
+        Collection.attributes_frequency_counts."""
+        return self._collection.attributes_frequency_counts
+
+    def rank(self, output_filename: str) -> int:
+        """Counts, scores and ranks all tokens, and writes a JSON line for every
+        token in stream order to output_filename, with its "token_identifier"
+        (in TokenIdentifier.to_dict() format), "score", "unique_attribute_count"
+        and "rank".
+
+        Returns
+        -------
+        int
+            number of ranked tokens
+
+        Raises
+        ------
+        ValueError
+            If the collection cannot be scored by OpenRarity, or if the token
+            stream changed between passes.
+        """
+        self.count_attributes()
+        scores, unique_attribute_counts = self.score_tokens()
+
+        rank_order, ranks = RarityRanker.rank_scores(
+            scores=np.asarray(scores),
+            unique_attribute_counts=np.asarray(unique_attribute_counts),
+        )
+        ranks_array = self._create_array("ranks", np.int64)
+        ranks_array[rank_order] = ranks
+        del rank_order, ranks
+
+        with open(self._path("token_identifiers.jsonl")) as identifiers_file, open(
+            output_filename, "w"
+        ) as output_file:
+            for index, line in enumerate(identifiers_file):
+                output_file.write(
+                    json.dumps(
+                        {
+                            "token_identifier": json.loads(line),
+                            "score": float(scores[index]),
+                            "unique_attribute_count": int(
+                                unique_attribute_counts[index]
+                            ),
+                            "rank": int(ranks_array[index]),
+                        }
+                    )
+                    + "\n"
+                )
+
+        return self.total_supply
+
+    def count_attributes(self) -> None:
+        """First pass, which counts the attributes of all tokens and writes their
+        identifiers, one JSON line per token."""
+        os.makedirs(self.work_dir, exist_ok=True)
+        with open(self._path("token_identifiers.jsonl"), "w") as identifiers_file:
+            collection = Collection.from_token_stream(
+                self._iter_writing_identifiers(identifiers_file),
+                keep_tokens=False,
+                chunk_size=self.chunk_size,
+                keep_token_identifiers=False,
+            )
+        RarityRanker.default_scorer.validate_collection(collection)
+        self._collection = collection
+
+    def score_tokens(self) -> tuple[np.ndarray, np.ndarray]:
+        """Second pass, which scores all tokens into memory-mapped arrays.
+
+        Returns
+        -------
+        tuple[np.ndarray, np.ndarray]
+            scores and unique attribute counts of all tokens, in stream order
+        """
+        collection = self._collection
+        total_supply = collection.token_total_supply
+        # Same operations as InformationContentScoringHandler.score_tokens, so
+        # that scores are identical
+        handler = InformationContentScoringHandler()
+        collection_null_attributes = collection.statistics.null_attributes
+        normalization = handler.get_collection_entropy_normalization(
+            collection.statistics.entropy
+        )
+
+        scores = self._create_array("scores", np.float64)
+        unique_attribute_counts = self._create_array(
+            "unique_attribute_counts", np.int32
+        )
+        start = 0
+        with open(self._path("token_identifiers.jsonl")) as identifiers_file:
+            for chunk in self._iter_chunks():
+                end = start + len(chunk)
+                if [
+                    json.dumps(token.token_identifier.to_dict()) + "\n"
+                    for token in chunk
+                ] != list(itertools.islice(identifiers_file, len(chunk))):
+                    raise ValueError("Token stream changed between passes")
+                collection.add_trait_count_attributes(chunk)
+                ic_tables = handler.get_ic_tables(
+                    collection,
+                    chunk,
+                    collection_null_attributes=collection_null_attributes,
+                )
+                if ic_tables is None:
+                    raise ValueError("Token stream changed between passes")
+                table_indices, information_table = ic_tables
+
+                scores[start:end] = (
+                    -np.sum(information_table[table_indices], axis=1) / normalization
+                )
+                unique_attribute_counts[
+                    start:end
+                ] = TokenFeatureExtractor.extract_unique_attribute_counts(
+                    tokens=chunk, collection=collection
+                )
+                start = end
+
+        if start != total_supply:
+            raise ValueError("Token stream changed between passes")
+        return scores, unique_attribute_counts
+
+    # Private methods
+    def _iter_writing_identifiers(self, identifiers_file: TextIO) -> Iterator[Token]:
+        for token in self.token_stream():
+            identifiers_file.write(json.dumps(token.token_identifier.to_dict()) + "\n")
+            yield token
+
+    def _iter_chunks(self) -> Iterator[list[Token]]:
+        tokens = iter(self.token_stream())
+        while chunk := list(itertools.islice(tokens, self.chunk_size)):
+            yield chunk
+
+    def _path(self, filename: str) -> str:
+        return os.path.join(self.work_dir, filename)
+
+    def _create_array(self, name: str, dtype) -> np.ndarray:
+        """Returns a memory-mapped array with an element for every token."""
+        if self.total_supply == 0:
+            # Empty files cannot be memory mapped
+            return np.zeros(0, dtype=dtype)
+        return np.lib.format.open_memmap(
+            self._path(f"{name}.npy"),
+            mode="w+",
+            dtype=dtype,
+            shape=(self.total_supply,),
+        )
+
+
+def iter_tokens_from_jsonl(filename: str) -> Iterator[Token]:
+    """Reads tokens from a file with a token in Token.to_dict() format on every
+    line."""
+    with open(filename) as jsonl_file:
+        for line in jsonl_file:
+            if line.strip():
+                yield Token.from_dict(json.loads(line))
+
+
+def iter_tokens_from_csv(
+    filename: str,
+    contract_address: str,
+    token_standard: TokenStandard = TokenStandard.ERC721,
+) -> Iterator[Token]:
+    """Reads EVM tokens from a csv file with a "token_id" column and a column for
+    every string attribute name. Tokens without an attribute have an empty cell.
+    """
+    with open(filename, newline="") as csv_file:
+        for row in csv.DictReader(csv_file):
+            token_id = row.pop("token_id")
+            yield Token(
+                token_identifier=EVMContractTokenIdentifier(
+                    contract_address=contract_address, token_id=int(token_id)
+                ),
+                token_standard=token_standard,
+                metadata=TokenMetadata.from_attributes(
+                    {name: value for name, value in row.items() if value}
+                ),
+            )
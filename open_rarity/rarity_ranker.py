@@ -1,6 +1,11 @@
 import math
 
+import numpy as np
+
 from open_rarity.models.collection import Collection
+from open_rarity.models.ranking_result import RankingResult
+from open_rarity.models.token_identifier import TokenIdentifier
+from open_rarity.models.token_ranking_features import TokenRankingFeatures
 from open_rarity.models.token_rarity import TokenRarity
 from open_rarity.scoring.scorer import Scorer
 from open_rarity.scoring.token_feature_extractor import TokenFeatureExtractor
@@ -39,38 +44,213 @@ class RarityRanker:
             list of TokenRarity objects with score, rank and token information
             sorted by rank
         """
+        return list(
+            RarityRanker.rank_collection_result(collection=collection, scorer=scorer)
+        )
+
+    @staticmethod
+    def rank_collection_result(
+        collection: Collection, scorer: Scorer = default_scorer
+    ) -> RankingResult:
+        """Ranks tokens in the collection the same as rank_collection, but returns
+        the ranking as arrays instead of a TokenRarity object per token, for bulk
+        exports of large collections.
+
+        Parameters
+        ----------
+        collection : Collection
+            Collection object with populated tokens
+        scorer: Scorer
+            Scorer instance
+
+        Returns
+        -------
+        RankingResult
+            token indices, scores, unique attribute counts and ranks of the tokens
+            sorted by rank
 
+        Raises
+        ------
+        ValueError
+            If the tokens of the collection were dropped, see
+            Collection.from_token_stream.
+        """
+        RarityRanker._check_has_tokens(collection)
         if (
             collection is None
             or collection.tokens is None
             or len(collection.tokens) == 0
+        ):
+            return RankingResult.empty()
+
+        scores, unique_attribute_counts = RarityRanker._get_ranking_keys(
+            collection=collection, scorer=scorer
+        )
+        rank_order, ranks = RarityRanker.rank_scores(
+            scores=scores, unique_attribute_counts=unique_attribute_counts
+        )
+        return RankingResult(
+            tokens=collection.tokens,
+            token_indices=rank_order,
+            scores=scores[rank_order],
+            unique_attribute_counts=unique_attribute_counts[rank_order],
+            ranks=ranks,
+        )
+
+    @staticmethod
+    def top_k(
+        collection: Collection, k: int, scorer: Scorer = default_scorer
+    ) -> list[TokenRarity]:
+        """Returns the k rarest tokens of the collection, same as
+        rank_collection(collection, scorer)[:k], without sorting all tokens.
+
+        Tokens are selected by counting unique attribute counts and a partial
+        selection of scores, and only the selected tokens are sorted and ranked.
+
+        Parameters
+        ----------
+        collection : Collection
+            Collection object with populated tokens
+        k : int
+            number of tokens to return
+        scorer: Scorer
+            Scorer instance
+
+        Returns
+        -------
+        list[TokenRarity]
+            list of at most k TokenRarity objects with score, rank and token
+            information sorted by rank
+
+        Raises
+        ------
+        ValueError
+            If the tokens of the collection were dropped, see
+            Collection.from_token_stream.
+        """
+        RarityRanker._check_has_tokens(collection)
+        if (
+            collection is None
+            or collection.tokens is None
+            or len(collection.tokens) == 0
+            or k <= 0
         ):
             return []
+        if k >= len(collection.tokens):
+            return RarityRanker.rank_collection(collection=collection, scorer=scorer)
 
-        tokens = collection.tokens
-        scores: list[float] = scorer.score_tokens(collection, tokens=tokens)
+        scores, unique_attribute_counts = RarityRanker._get_ranking_keys(
+            collection=collection, scorer=scorer
+        )
 
-        # fail ranking if dimension of scores doesn't match dimension of tokens
-        assert len(tokens) == len(scores)
+        # Tokens with more unique attributes always rank first, so find the unique
+        # attribute count of the k-th token by counting tokens per unique count.
+        tokens_per_unique_count = np.bincount(unique_attribute_counts)[::-1]
+        kth_unique_count = (
+            len(tokens_per_unique_count)
+            - 1
+            - np.searchsorted(np.cumsum(tokens_per_unique_count), k)
+        )
+        selected_indices = np.flatnonzero(unique_attribute_counts > kth_unique_count)
 
-        token_rarities: list[TokenRarity] = []
+        # Among tokens with that unique attribute count, select the highest scores,
+        # and tokens with lower index first for equal scores (e.g. stable sort).
+        candidate_indices = np.flatnonzero(unique_attribute_counts == kth_unique_count)
+        candidate_scores = scores[candidate_indices]
+        remaining = k - len(selected_indices)
+        kth_score = np.partition(candidate_scores, len(candidate_indices) - remaining)[
+            len(candidate_indices) - remaining
+        ]
+        higher_score_indices = candidate_indices[candidate_scores > kth_score]
+        equal_score_indices = candidate_indices[candidate_scores == kth_score][
+            : remaining - len(higher_score_indices)
+        ]
+        selected_indices = np.sort(
+            np.concatenate(
+                [selected_indices, higher_score_indices, equal_score_indices]
+            )
+        )
 
-        # augment collection tokens with score information
-        for idx, token in enumerate(tokens):
-            # extract features from the token
-            token_features = TokenFeatureExtractor.extract_unique_attribute_count(
-                token=token, collection=collection
+        tokens = collection.tokens
+        token_rarities = [
+            TokenRarity(
+                token=tokens[idx],
+                score=score,
+                token_features=TokenRankingFeatures(
+                    unique_attribute_count=unique_attribute_count
+                ),
+            )
+            for idx, score, unique_attribute_count in zip(
+                selected_indices.tolist(),
+                scores[selected_indices].tolist(),
+                unique_attribute_counts[selected_indices].tolist(),
             )
+        ]
+        return RarityRanker.set_rarity_ranks(token_rarities)
 
-            token_rarities.append(
-                TokenRarity(
-                    token=token,
-                    score=scores[idx],
-                    token_features=token_features,
-                )
+    @staticmethod
+    def rank_of(
+        collection: Collection,
+        token_identifier: TokenIdentifier,
+        scorer: Scorer = default_scorer,
+    ) -> int:
+        """Returns the rank of a single token of the collection, same as the rank
+        assigned by rank_collection(collection, scorer), without sorting all tokens.
+
+        The rank is found by counting the tokens that sort before the token.
+        If the token's score is close to the score of the previous token in rank
+        order, the rank of that token is found in the same way.
+
+        Parameters
+        ----------
+        collection : Collection
+            Collection object with populated tokens
+        token_identifier : TokenIdentifier
+            identifier of the token to rank
+        scorer: Scorer
+            Scorer instance
+
+        Returns
+        -------
+        int
+            rank of the token within the collection
+
+        Raises
+        ------
+        ValueError
+            If the token identifier does not belong to a token of the collection,
+            or if the tokens of the collection were dropped.
+        """
+        RarityRanker._check_has_tokens(collection)
+        (token_index,) = collection.get_token_indices([token_identifier])
+        scores, unique_attribute_counts = RarityRanker._get_ranking_keys(
+            collection=collection, scorer=scorer
+        )
+
+        unique_attribute_count = unique_attribute_counts[token_index]
+        score = scores[token_index]
+        while True:
+            # Tokens with an equal score and unique attribute count are ranked the
+            # same as the first of them, so only count tokens with greater keys.
+            tokens_before = (unique_attribute_counts > unique_attribute_count) | (
+                (unique_attribute_counts == unique_attribute_count) & (scores > score)
             )
+            rank = int(np.count_nonzero(tokens_before)) + 1
+            if rank == 1:
+                return rank
 
-        return RarityRanker.set_rarity_ranks(token_rarities)
+            # Find the last token in rank order before the token
+            previous_unique_attribute_count = unique_attribute_counts[
+                tokens_before
+            ].min()
+            previous_score = scores[
+                tokens_before
+                & (unique_attribute_counts == previous_unique_attribute_count)
+            ].min()
+            if not math.isclose(score, previous_score):
+                return rank
+            unique_attribute_count = previous_unique_attribute_count
+            score = previous_score
 
     @staticmethod
     def set_rarity_ranks(
@@ -99,25 +279,127 @@ class RarityRanker:
             ordered by rank ascending and score descending
 
         """
-        sorted_token_rarities: list[TokenRarity] = sorted(
-            token_rarities,
-            key=lambda k: (
-                k.token_features.unique_attribute_count,
-                k.score,
+        rank_order, ranks = RarityRanker.rank_scores(
+            scores=np.array(
+                [token_rarity.score for token_rarity in token_rarities], dtype=float
+            ),
+            unique_attribute_counts=np.array(
+                [
+                    token_rarity.token_features.unique_attribute_count
+                    for token_rarity in token_rarities
+                ],
+                dtype=np.int64,
             ),
-            reverse=True,
         )
 
-        # Perform ranking of each token in collection
-        for i, token_rarity in enumerate(sorted_token_rarities):
-            rank = i + 1
-            if i > 0:
-                prev_token_rarity = sorted_token_rarities[i - 1]
-                scores_equal = math.isclose(token_rarity.score, prev_token_rarity.score)
-                if scores_equal:
-                    assert prev_token_rarity.rank is not None
-                    rank = prev_token_rarity.rank
-
+        sorted_token_rarities: list[TokenRarity] = [
+            token_rarities[idx] for idx in rank_order.tolist()
+        ]
+        for token_rarity, rank in zip(sorted_token_rarities, ranks.tolist()):
             token_rarity.rank = rank
 
         return sorted_token_rarities
+
+    @staticmethod
+    def rank_scores(
+        scores: np.ndarray, unique_attribute_counts: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Array based ranking of tokens according to OpenRarity algorithm, same
+        as set_rarity_ranks: tokens are sorted by unique attributes count and score,
+        descending, keeping the input order of tokens with equal keys.
+
+        Parameters
+        ----------
+        scores : np.ndarray
+            score of every token
+        unique_attribute_counts : np.ndarray
+            unique attribute count of every token
+
+        Returns
+        -------
+        tuple[np.ndarray, np.ndarray]
+            indices of the tokens in rank order, and the rank of every token
+            in rank order
+        """
+        token_count = len(scores)
+        if token_count == 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+        # Equivalent to a stable np.lexsort((-scores, -unique_attribute_counts)),
+        # but the unstable float sort and small integer radix sort are much faster.
+        # Order of tokens with equal keys is restored afterwards.
+        rank_order = np.argsort(-scores)
+        rank_order = rank_order[
+            np.argsort(
+                (unique_attribute_counts.max() - unique_attribute_counts)[
+                    rank_order
+                ].astype(np.int16),
+                kind="stable",
+            )
+        ]
+        sorted_scores = scores[rank_order]
+        sorted_unique_attribute_counts = unique_attribute_counts[rank_order]
+        keys_differ = np.empty(token_count, dtype=bool)
+        keys_differ[0] = True
+        keys_differ[1:] = (sorted_scores[1:] != sorted_scores[:-1]) | (
+            sorted_unique_attribute_counts[1:] != sorted_unique_attribute_counts[:-1]
+        )
+        equal_keys_group = np.cumsum(keys_differ)
+        rank_order = np.sort(equal_keys_group * token_count + rank_order) % token_count
+
+        return rank_order, RarityRanker.assign_ranks(scores[rank_order])
+
+    @staticmethod
+    def assign_ranks(sorted_scores: np.ndarray) -> np.ndarray:
+        """Assigns ranks to scores in rank order. Tokens with the same score will
+        be assigned the same rank, e.g. we use RANK (vs. DENSE_RANK).
+        Scores are considered the same if math.isclose with default tolerances
+        holds for a score and the previous one.
+
+        Parameters
+        ----------
+        sorted_scores : np.ndarray
+            scores of tokens in rank order
+
+        Returns
+        -------
+        np.ndarray
+            rank of every token in rank order
+        """
+        previous_scores = sorted_scores[:-1]
+        next_scores = sorted_scores[1:]
+        scores_difference = np.abs(next_scores - previous_scores)
+        # Same as math.isclose(next_score, previous_score), which is never true
+        # for infinite differences of unequal scores.
+        scores_equal = (previous_scores == next_scores) | (
+            np.isfinite(scores_difference)
+            & (
+                scores_difference
+                <= 1e-09 * np.maximum(np.abs(previous_scores), np.abs(next_scores))
+            )
+        )
+
+        ranks = np.arange(1, len(sorted_scores) + 1)
+        ranks[1:][scores_equal] = 0
+        return np.maximum.accumulate(ranks)
+
+    @staticmethod
+    def _check_has_tokens(collection: Collection | None) -> None:
+        if collection is not None and not collection.has_tokens:
+            raise ValueError(
+                f"Tokens of {collection} were dropped, so TokenRarity objects "
+                "cannot be created. Use IncrementalRarityRanker scores and ranks."
+            )
+
+    @staticmethod
+    def _get_ranking_keys(
+        collection: Collection, scorer: Scorer
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Returns the scores and unique attribute counts of all tokens, in order of
+        collection.tokens."""
+        tokens = collection.tokens
+        scores = np.array(scorer.score_tokens(collection, tokens=tokens))
+        unique_attribute_counts = TokenFeatureExtractor.extract_unique_attribute_counts(
+            tokens=tokens, collection=collection
+        )
+        return scores, unique_attribute_counts
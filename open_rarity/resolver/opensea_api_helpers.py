@@ -1,9 +1,18 @@
+import datetime
+import io
 import json
 import logging
-import math
 import os
-
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from enum import Enum
+from typing import BinaryIO, Callable, Iterable, Iterator
+
+import numpy as np
 import requests
+from requests.adapters import HTTPAdapter
 from requests.models import HTTPError
 
 from open_rarity.models.collection import Collection
@@ -14,9 +23,11 @@ from open_rarity.models.token_metadata import (
     NumericAttribute,
     StringAttribute,
     TokenMetadata,
+    intern_string_attribute,
 )
 from open_rarity.models.token_standard import TokenStandard
 from open_rarity.resolver.models.collection_with_metadata import CollectionWithMetadata
+from open_rarity.resolver.rate_limiter import RateLimiter, default_rate_limiter
 
 logger = logging.getLogger("open_rarity_logger")
 
@@ -30,6 +41,9 @@ HEADERS = {
     "X-API-KEY": os.environ.get("OS_API_KEY") or "",
 }
 
+# Number of asset batches fetched at once by get_all_collection_tokens
+OS_MAX_CONCURRENT_REQUESTS = 4
+
 # https://docs.opensea.io/docs/metadata-standards
 OS_METADATA_TRAIT_TYPE = "display_type"
 
@@ -39,6 +53,179 @@ OS_METADATA_TRAIT_TYPE = "display_type"
 # See cached_data/boredapeyachtclub_cached_os_trait_data.json for example.
 OS_CACHE_FILENAME_FORMAT: str = "cached_data/%s_cached_os_trait_data.json"
 
+# Binary cache of the same data, stored as a directory of .npy arrays
+# that can be memory mapped, see write_collection_data_to_file.
+OS_BINARY_CACHE_DIRNAME_FORMAT: str = "cached_data/%s_cached_os_trait_data"
+
+# Journal of token batches fetched by an unfinished download of a collection,
+# see DownloadJournal.
+OS_DOWNLOAD_JOURNAL_FILENAME_FORMAT: str = "cached_data/%s_os_download_journal.jsonl"
+
+
+class CacheFormat(Enum):
+    """Storage format of the local cache of collection token data."""
+
+    # List of tokens in Token.to_dict() format, for interoperability
+    JSON = "json"
+    # Columnar arrays of string table ids, which are much faster to load
+    BINARY = "binary"
+
+
+def create_opensea_session(
+    max_connections: int = OS_MAX_CONCURRENT_REQUESTS,
+) -> requests.Session:
+    """Returns a requests Session which keeps up to `max_connections` connections
+    to Opensea alive, so that concurrent requests reuse connections."""
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_connections)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+class DownloadJournal:
+    """Append-only journal of the token batches fetched while downloading a
+    collection, so that an interrupted download can be resumed.
+
+    Every line of the journal file is a JSON object with the "token_ids" that
+    were requested and the fetched "tokens" in Token.to_dict() format.
+    A partially written last line, e.g. if the process was killed, is ignored
+    when reading, and removed before the next batch is appended.
+    """
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self._lock = threading.Lock()
+        self._partial_line_removed = False
+
+    def read(self) -> tuple[set[int], list[Token]]:
+        """Returns the token ids requested and tokens fetched by journaled batches.
+        Both are empty if the journal does not exist."""
+        token_ids: set[int] = set()
+        tokens: list[Token] = []
+        for batch_token_ids, batch_tokens in self.iter_batches():
+            token_ids.update(batch_token_ids)
+            tokens.extend(batch_tokens)
+        return token_ids, tokens
+
+    def iter_batches(
+        self, offsets: list[int] | None = None
+    ) -> Iterator[tuple[list[int], list[Token]]]:
+        """Yields the requested token ids and fetched tokens of journaled batches
+        one at a time, in the order they were journaled or at the given file
+        offsets of their lines. Yields nothing if the journal does not exist."""
+        try:
+            with open(self.filename, "rb") as journal_file:
+                for line in _iter_lines(journal_file, offsets):
+                    batch = self._parse_line(line)
+                    if batch is not None:
+                        yield batch["token_ids"], [
+                            Token.from_dict(token) for token in batch["tokens"]
+                        ]
+        except FileNotFoundError:
+            pass
+
+    def iter_tokens_in_token_id_order(self) -> Iterator[Token]:
+        """Yields journaled tokens one batch at a time, so that the journal can be
+        written to the cache without holding all tokens in memory.
+
+        Batches are ordered by their first requested token id, and the tokens of
+        every batch by token id. Resumed downloads request the missing token ids
+        in batches of the same size as the interrupted download, so this is
+        token id order unless the batch size was changed in between.
+        """
+        batch_offsets: list[tuple[int, int]] = []
+        try:
+            with open(self.filename, "rb") as journal_file:
+                offset = 0
+                for line in journal_file:
+                    batch = self._parse_line(line)
+                    if batch is not None and batch["token_ids"]:
+                        batch_offsets.append((min(batch["token_ids"]), offset))
+                    offset += len(line)
+        except FileNotFoundError:
+            return
+
+        for _, tokens in self.iter_batches(
+            offsets=[offset for _, offset in sorted(batch_offsets)]
+        ):
+            yield from sorted(tokens, key=_get_token_id_sort_key)
+
+    def append(self, token_ids: list[int], tokens: list[Token]) -> None:
+        """Appends a fetched batch to the journal. Thread-safe."""
+        line = json.dumps(
+            {"token_ids": token_ids, "tokens": [token.to_dict() for token in tokens]},
+            default=_encode_journal_object,
+        )
+        with self._lock:
+            if not self._partial_line_removed:
+                self._remove_partial_line()
+                self._partial_line_removed = True
+            with open(self.filename, "a") as journal_file:
+                journal_file.write(line + "\n")
+
+    def remove(self) -> None:
+        try:
+            os.remove(self.filename)
+        except FileNotFoundError:
+            pass
+
+    def _parse_line(self, line: bytes) -> dict | None:
+        try:
+            return json.loads(line, object_hook=_decode_journal_object)
+        except json.JSONDecodeError:
+            logger.warning(f"Skipping invalid line of download journal {self.filename}")
+            return None
+
+    def _remove_partial_line(self) -> None:
+        """Truncates the journal after its last complete line, so that appended
+        batches are not written onto the end of a partially written line."""
+        try:
+            with open(self.filename, "rb+") as journal_file:
+                end = journal_file.seek(0, os.SEEK_END)
+                # Search backwards for the last newline, one block at a time
+                position = end
+                while position > 0:
+                    block_start = max(position - io.DEFAULT_BUFFER_SIZE, 0)
+                    journal_file.seek(block_start)
+                    newline = journal_file.read(position - block_start).rfind(b"\n")
+                    if newline >= 0:
+                        position = block_start + newline + 1
+                        break
+                    position = block_start
+                if position < end:
+                    logger.warning(
+                        "Removing partial last line of download journal %s",
+                        self.filename,
+                    )
+                    journal_file.truncate(position)
+        except FileNotFoundError:
+            pass
+
+
+def _iter_lines(file: BinaryIO, offsets: list[int] | None) -> Iterator[bytes]:
+    """Yields all lines of a file, or the lines starting at the given offsets."""
+    if offsets is None:
+        yield from file
+        return
+    for offset in offsets:
+        file.seek(offset)
+        yield file.readline()
+
+
+def _encode_journal_object(obj):
+    # Date attribute values are datetimes in Token.to_dict()
+    if isinstance(obj, datetime.datetime):
+        return {"__timestamp__": obj.timestamp()}
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _decode_journal_object(obj: dict):
+    if "__timestamp__" in obj:
+        return datetime.datetime.fromtimestamp(obj["__timestamp__"])
+    return obj
+
 
 # Error is thrown if computatation is requested on a non-ERC721/1155
 # token or collection. This is due to library only working for these
@@ -54,7 +241,9 @@ def fetch_opensea_collection_data(slug: str) -> dict:
     Raises:
         Exception: If API request fails
     """
-    response = requests.get(OS_COLLECTION_URL.format(slug=slug), headers=HEADERS)
+    response = default_rate_limiter.request(
+        "GET", OS_COLLECTION_URL.format(slug=slug), headers=HEADERS
+    )
 
     if response.status_code != 200:
         logger.debug(
@@ -67,7 +256,13 @@ def fetch_opensea_collection_data(slug: str) -> dict:
     return response.json()["collection"]
 
 
-def fetch_opensea_assets_data(slug: str, token_ids: list[int], limit=30) -> list[dict]:
+def fetch_opensea_assets_data(
+    slug: str,
+    token_ids: list[int],
+    limit=30,
+    session: requests.Session | None = None,
+    rate_limiter: RateLimiter | None = None,
+) -> list[dict]:
     """Fetches asset data from Opensea's GET assets endpoint for the given token ids
 
     Parameters
@@ -78,6 +273,11 @@ def fetch_opensea_assets_data(slug: str, token_ids: list[int], limit=30) -> list
         the token id
     limit: int, optional
         How many to fetch at once. Defaults to 30, with a max of 30, by default 30.
+    session: requests.Session, optional
+        Session to make the request with, e.g. from create_opensea_session,
+        by default None.
+    rate_limiter: RateLimiter, optional
+        Rate limiter to make the request through, by default default_rate_limiter.
 
     Returns
     -------
@@ -101,9 +301,10 @@ def fetch_opensea_assets_data(slug: str, token_ids: list[int], limit=30) -> list
         "limit": limit,
     }
 
-    response = requests.request(
+    response = (rate_limiter or default_rate_limiter).request(
         "GET",
         OS_ASSETS_URL,
+        session=session,
         headers=HEADERS,
         params=querystring,
     )
@@ -142,7 +343,7 @@ def opensea_traits_to_token_metadata(asset_traits: list) -> TokenMetadata:
 
     for trait in asset_traits:
         if is_string_trait(trait):
-            string_attr[trait["trait_type"]] = StringAttribute(
+            string_attr[trait["trait_type"]] = intern_string_attribute(
                 name=trait["trait_type"],
                 value=trait["value"],
             )
@@ -171,75 +372,286 @@ def get_all_collection_tokens(
     total_supply: int,
     batch_size: int = 30,
     use_cache: bool = True,
+    cache_format: CacheFormat = CacheFormat.JSON,
+    max_concurrent_requests: int = OS_MAX_CONCURRENT_REQUESTS,
+    rate_limiter: RateLimiter | None = None,
 ) -> list[Token]:
     """Returns a list of Token's with all metadata filled, either populated
-    from Opensea API or fetched from a local cache file.
-    """
-    tokens: list[Token] = []
+    from Opensea API or fetched from a local cache file of the given format.
 
+    Batches of tokens are fetched from Opensea by up to `max_concurrent_requests`
+    threads sharing a pool of keep-alive connections, rate limited by
+    `rate_limiter` (by default default_rate_limiter). Tokens are returned in
+    token id order.
+    """
     # For performance optimization and re-runs for the same collection,
     # we optionally check if an already cached file for the collection
     # data exists since they tend to be static.
     if use_cache:
-        tokens = read_collection_data_from_file(expected_supply=total_supply, slug=slug)
+        tokens = read_collection_data_from_file(
+            expected_supply=total_supply, slug=slug, cache_format=cache_format
+        )
+        if tokens:
+            return tokens
     else:
         logger.info(f"Not using cache for fetching collection tokens for: {slug}")
 
     # This means either cache file didn't exist or did not have data.
     # Fetch all token trait data from opensea.
-    if len(tokens) == 0:
-        tokens = []
-        num_batches = math.ceil(total_supply / batch_size)
-        initial_token_id = 0
-
-        # Returns a list of `batch_size` token IDs, such that no token ID
-        # can exceed `max_token_id` (in which case len(return_value) < `batch_size`)
-        def get_token_ids(
-            batch_id: int, max_token_id: int = total_supply - 1
-        ) -> list[int]:
-            token_id_start = initial_token_id + (batch_id * batch_size)
-            token_id_end = int(min(token_id_start + batch_size - 1, max_token_id))
-            return list(range(token_id_start, token_id_end + 1))
-
-        for batch_id in range(num_batches):
-            token_ids = get_token_ids(batch_id)
-            tokens_batch = get_tokens_from_opensea(
-                opensea_slug=slug,
-                token_ids=token_ids,
+    tokens = list(
+        _iter_collection_tokens_from_opensea(
+            slug=slug,
+            total_supply=total_supply,
+            batch_size=batch_size,
+            use_cache=use_cache,
+            cache_format=cache_format,
+            max_concurrent_requests=max_concurrent_requests,
+            rate_limiter=rate_limiter,
+        )
+    )
+    # Journaled tokens of a resumed download were fetched out of order
+    tokens.sort(key=_get_token_id_sort_key)
+    return tokens
+
+
+def iter_all_collection_tokens(
+    slug: str,
+    total_supply: int,
+    batch_size: int = 30,
+    use_cache: bool = True,
+    cache_format: CacheFormat = CacheFormat.JSON,
+    max_concurrent_requests: int = OS_MAX_CONCURRENT_REQUESTS,
+    rate_limiter: RateLimiter | None = None,
+) -> Iterator[Token]:
+    """Generator variant of get_all_collection_tokens, which yields tokens as
+    they are read from the cache or fetched, e.g. to build a collection with
+    Collection.from_token_stream while later batches are still being fetched.
+
+    Fetched tokens are yielded in token id order, after the tokens journaled by
+    an interrupted download if it is resumed. When using the cache, the cache
+    file is only written once all tokens were consumed. It is written from the
+    download journal one batch at a time, so memory use stays bounded by a batch
+    of tokens, except for the binary cache format which holds the (compact)
+    columns of all tokens before writing them.
+    """
+    if use_cache:
+        tokens_read = False
+        for token in iter_collection_data_from_file(
+            slug=slug, cache_format=cache_format
+        ):
+            tokens_read = True
+            yield token
+        if tokens_read:
+            return
+    else:
+        logger.info(f"Not using cache for fetching collection tokens for: {slug}")
+
+    yield from _iter_collection_tokens_from_opensea(
+        slug=slug,
+        total_supply=total_supply,
+        batch_size=batch_size,
+        use_cache=use_cache,
+        cache_format=cache_format,
+        max_concurrent_requests=max_concurrent_requests,
+        rate_limiter=rate_limiter,
+    )
+
+
+def _iter_collection_tokens_from_opensea(
+    slug: str,
+    total_supply: int,
+    batch_size: int,
+    use_cache: bool,
+    cache_format: CacheFormat,
+    max_concurrent_requests: int,
+    rate_limiter: RateLimiter | None,
+) -> Iterator[Token]:
+    """Fetches all tokens of a collection from Opensea, see
+    iter_all_collection_tokens."""
+    # Batches are journaled as they are fetched when using the cache, so that
+    # a failed download resumes with the batches that were not fetched yet.
+    journal = DownloadJournal(OS_DOWNLOAD_JOURNAL_FILENAME_FORMAT % slug)
+    fetched_token_ids: set[int] = set()
+    token_count = 0
+    if use_cache:
+        for batch_token_ids, batch_tokens in journal.iter_batches():
+            fetched_token_ids.update(batch_token_ids)
+            token_count += len(batch_tokens)
+            yield from batch_tokens
+        if fetched_token_ids:
+            logger.info(
+                f"Resuming download of {slug} with {len(fetched_token_ids)} "
+                f"token ids fetched from journal: {journal.filename}"
             )
 
-            tokens.extend(tokens_batch)
+    # Batches of `batch_size` token ids that were not fetched yet
+    missing_token_ids = [
+        token_id
+        for token_id in range(total_supply)
+        if token_id not in fetched_token_ids
+    ]
+    token_ids_batches = [
+        missing_token_ids[start : start + batch_size]
+        for start in range(0, len(missing_token_ids), batch_size)
+    ]
 
-        # It's possible for some collections to start at token id 1 instead of 0,
-        # so attempt fetch of more tokens if they exist
+    with create_opensea_session(max_connections=max_concurrent_requests) as session:
+        for token in iter_tokens_batches_from_opensea(
+            opensea_slug=slug,
+            token_ids_batches=token_ids_batches,
+            max_concurrent_requests=max_concurrent_requests,
+            session=session,
+            rate_limiter=rate_limiter,
+            on_batch_fetched=journal.append if use_cache else None,
+        ):
+            token_count += 1
+            yield token
+
+        # It's possible for some collections to start at token id 1 instead
+        # of 0, so attempt fetch of more tokens if they exist
         token_id = total_supply
         while True:
+            if token_id in fetched_token_ids:
+                token_id += 1
+                continue
             try:
                 extra_tokens = get_tokens_from_opensea(
                     opensea_slug=slug,
                     token_ids=[token_id],
+                    session=session,
+                    rate_limiter=rate_limiter,
                 )
                 if len(extra_tokens) == 0:
                     break
-                tokens.extend(extra_tokens)
+                if use_cache:
+                    journal.append([token_id], extra_tokens)
+                token_count += len(extra_tokens)
+                yield from extra_tokens
                 token_id += 1
             except Exception:
                 break
 
-        if len(tokens) > total_supply:
-            logger.warning(
-                f"Warning: Found more tokens ({len(tokens)}) than "
-                f"token supply ({total_supply}) fetched from collection stats"
-            )
+    if token_count > total_supply:
+        logger.warning(
+            f"Warning: Found more tokens ({token_count}) than "
+            f"token supply ({total_supply}) fetched from collection stats"
+        )
 
-        # Write to local disk the fetched data for later caching
-        if use_cache:
-            write_collection_data_to_file(slug=slug, tokens=tokens)
+    # Write to local disk the fetched data for later caching, which
+    # replaces the journal
+    if use_cache:
+        write_collection_data_to_file(
+            slug=slug,
+            tokens=journal.iter_tokens_in_token_id_order(),
+            cache_format=cache_format,
+        )
+        journal.remove()
+
+
+def _get_token_id_sort_key(token: Token) -> int:
+    token_identifier = token.token_identifier
+    assert isinstance(token_identifier, EVMContractTokenIdentifier)
+    return token_identifier.token_id
+
+
+def get_tokens_batches_from_opensea(
+    opensea_slug: str,
+    token_ids_batches: list[list[int]],
+    max_concurrent_requests: int = OS_MAX_CONCURRENT_REQUESTS,
+    session: requests.Session | None = None,
+    rate_limiter: RateLimiter | None = None,
+    on_batch_fetched: Callable[[list[int], list[Token]], None] | None = None,
+) -> list[Token]:
+    """Fetches batches of tokens from opensea API concurrently, see
+    get_tokens_from_opensea.
+
+    Parameters
+    ----------
+    opensea_slug : str
+        Opensea collection slug
+    token_ids_batches : list[list[int]]
+        List of batches of token ids to fetch for, each fetched with one request
+    max_concurrent_requests : int, optional
+        Maximum number of requests made at once, by default
+        OS_MAX_CONCURRENT_REQUESTS.
+    session : requests.Session, optional
+        Session to make requests with, which should keep at least
+        `max_concurrent_requests` connections alive. By default a new session
+        is created for the batches.
+    rate_limiter : RateLimiter, optional
+        Rate limiter to make requests through, by default default_rate_limiter.
+    on_batch_fetched : Callable[[list[int], list[Token]], None], optional
+        Called with the token ids and fetched tokens of every batch as soon as
+        it is fetched, from the thread that fetched it. By default None.
+
+    Returns
+    -------
+    list[Token]
+        Tokens of all batches, in order of the batches.
+
+    Raises
+    ------
+    HTTPError
+        if any request to opensea fails
+    """
+    return list(
+        iter_tokens_batches_from_opensea(
+            opensea_slug=opensea_slug,
+            token_ids_batches=token_ids_batches,
+            max_concurrent_requests=max_concurrent_requests,
+            session=session,
+            rate_limiter=rate_limiter,
+            on_batch_fetched=on_batch_fetched,
+        )
+    )
 
-    return tokens
+
+def iter_tokens_batches_from_opensea(
+    opensea_slug: str,
+    token_ids_batches: list[list[int]],
+    max_concurrent_requests: int = OS_MAX_CONCURRENT_REQUESTS,
+    session: requests.Session | None = None,
+    rate_limiter: RateLimiter | None = None,
+    on_batch_fetched: Callable[[list[int], list[Token]], None] | None = None,
+) -> Iterator[Token]:
+    """Generator variant of get_tokens_batches_from_opensea, which yields the
+    tokens of every batch as soon as it and all batches before it are fetched.
+    """
+    if session is None:
+        with create_opensea_session(max_connections=max_concurrent_requests) as session:
+            yield from iter_tokens_batches_from_opensea(
+                opensea_slug=opensea_slug,
+                token_ids_batches=token_ids_batches,
+                max_concurrent_requests=max_concurrent_requests,
+                session=session,
+                rate_limiter=rate_limiter,
+                on_batch_fetched=on_batch_fetched,
+            )
+        return
+
+    def get_tokens(token_ids: list[int]) -> list[Token]:
+        tokens = get_tokens_from_opensea(
+            opensea_slug=opensea_slug,
+            token_ids=token_ids,
+            session=session,
+            rate_limiter=rate_limiter,
+        )
+        if on_batch_fetched:
+            on_batch_fetched(token_ids, tokens)
+        return tokens
+
+    with ThreadPoolExecutor(max_workers=max_concurrent_requests) as executor:
+        # Executor.map returns results in order of the batches
+        for tokens_batch in executor.map(get_tokens, token_ids_batches):
+            yield from tokens_batch
 
 
-def get_tokens_from_opensea(opensea_slug: str, token_ids: list[int]) -> list[Token]:
+def get_tokens_from_opensea(
+    opensea_slug: str,
+    token_ids: list[int],
+    session: requests.Session | None = None,
+    rate_limiter: RateLimiter | None = None,
+) -> list[Token]:
     """Fetches eth nft data from opensea API and stores them into Token objects
 
     Parameters
@@ -248,6 +660,10 @@ def get_tokens_from_opensea(opensea_slug: str, token_ids: list[int]) -> list[Tok
         Opensea collection slug
     token_ids : list[int]
         List of token ids to fetch for
+    session : requests.Session, optional
+        Session to make the request with, by default None.
+    rate_limiter : RateLimiter, optional
+        Rate limiter to make the request through, by default default_rate_limiter.
 
     Returns
     -------
@@ -262,7 +678,12 @@ def get_tokens_from_opensea(opensea_slug: str, token_ids: list[int]) -> list[Tok
         if request to opensea fails
     """
     try:
-        assets = fetch_opensea_assets_data(slug=opensea_slug, token_ids=token_ids)
+        assets = fetch_opensea_assets_data(
+            slug=opensea_slug,
+            token_ids=token_ids,
+            session=session,
+            rate_limiter=rate_limiter,
+        )
     except HTTPError as e:
         logger.exception(
             "FAILED: get_assets: could not fetch opensea assets for %s: %s",
@@ -352,7 +773,10 @@ def get_collection_with_metadata_from_opensea(
 
 
 def get_collection_from_opensea(
-    slug: str, batch_size: int = 30, use_cache: bool = True
+    slug: str,
+    batch_size: int = 30,
+    use_cache: bool = True,
+    cache_format: CacheFormat = CacheFormat.JSON,
 ) -> Collection:
     """Fetches collection and token data with OpenSea endpoint and API key
     and stores it in the Collection object. If local cache file is used and
@@ -371,6 +795,9 @@ def get_collection_from_opensea(
         set to True to look for a local cached version of the collection and token
         metadata fetched from opensea to prevent re-fetching.
 
+    cache_format: CacheFormat
+        format of the local cache, by default CacheFormat.JSON.
+
     Returns
     -------
     Collection
@@ -393,56 +820,79 @@ def get_collection_from_opensea(
         total_supply=total_supply,
         batch_size=batch_size,
         use_cache=use_cache,
+        cache_format=cache_format,
     )
 
     return Collection(name=collection_obj["name"], tokens=tokens)
 
 
-def get_cache_filename(slug: str) -> str:
+def get_cache_filename(slug: str, cache_format: CacheFormat = CacheFormat.JSON) -> str:
+    if cache_format == CacheFormat.BINARY:
+        return OS_BINARY_CACHE_DIRNAME_FORMAT % slug
     return OS_CACHE_FILENAME_FORMAT % slug
 
 
-def write_collection_data_to_file(slug: str, tokens: list[Token]):
-    cache_filename = get_cache_filename(slug)
-    json_output = []
-    for token in tokens:
-        # Note: We assume EVM token here
-        json_output.append(token.to_dict())
+def write_collection_data_to_file(
+    slug: str, tokens: Iterable[Token], cache_format: CacheFormat = CacheFormat.JSON
+):
+    """Writes tokens to the cache file of the given format. Tokens are consumed
+    one at a time, and JSON is written token by token, so that tokens can be
+    written from a stream without holding all of them in memory."""
+    cache_filename = get_cache_filename(slug, cache_format=cache_format)
+    if cache_format == CacheFormat.BINARY:
+        _write_binary_collection_data(cache_dirname=cache_filename, tokens=tokens)
+        logger.debug(f"Wrote token data to cache directory: {cache_filename}")
+        return
+
+    # Same format as json.dump(tokens_data, jsonfile, indent=4)
     with open(cache_filename, "w+") as jsonfile:
-        json.dump(json_output, jsonfile, indent=4)
+        jsonfile.write("[")
+        token_count = 0
+        for token in tokens:
+            # Note: We assume EVM token here
+            token_json = json.dumps(token.to_dict(), indent=4)
+            jsonfile.write(",\n    " if token_count else "\n    ")
+            jsonfile.write(token_json.replace("\n", "\n    "))
+            token_count += 1
+        jsonfile.write("\n]" if token_count else "]")
     logger.debug(f"Wrote token data to cache file: {cache_filename}")
 
 
-def read_collection_data_from_file(expected_supply: int, slug: str) -> list[Token]:
-    cache_filename = get_cache_filename(slug)
+def read_collection_data_from_file(
+    expected_supply: int, slug: str, cache_format: CacheFormat = CacheFormat.JSON
+) -> list[Token]:
+    cache_filename = get_cache_filename(slug, cache_format=cache_format)
     tokens = []
     try:
-        with open(cache_filename) as jsonfile:
-            tokens_data = json.load(jsonfile)
-            if len(tokens_data) != expected_supply:
-                logger.warning(
-                    "Warning: Data cache file for %s collection has data for %s tokens "
-                    "but total supply fetched from opensea is %s",
-                    slug,
-                    len(tokens_data),
-                    expected_supply,
-                )
-            non_null_tokens = 0
-            if len(tokens_data) > 0:
-                for token_data in tokens_data:
-                    if token_data["metadata_dict"]:
-                        non_null_tokens += 1
-                        tokens.append(Token.from_dict(token_data))
-            null_tokens = len(tokens_data) - non_null_tokens
-            if null_tokens:
-                msg = (
-                    f"Warning: Data cache file had empty metadata for {null_tokens} "
-                    "tokens. This is expected if those tokens are burned or "
-                    "unrevealed. However, they are not taken into account into "
-                    "rarity. Please check the cache file for errors."
-                )
-                logger.warning(msg)
-                print(msg)
+        if cache_format == CacheFormat.BINARY:
+            tokens = list(_iter_binary_collection_data(cache_dirname=cache_filename))
+            cached_tokens = _get_binary_cached_token_count(cache_filename)
+        else:
+            with open(cache_filename) as jsonfile:
+                tokens_data = json.load(jsonfile)
+            cached_tokens = len(tokens_data)
+            for token_data in tokens_data:
+                if token_data["metadata_dict"]:
+                    tokens.append(Token.from_dict(token_data))
+
+        if cached_tokens != expected_supply:
+            logger.warning(
+                "Warning: Data cache file for %s collection has data for %s tokens "
+                "but total supply fetched from opensea is %s",
+                slug,
+                cached_tokens,
+                expected_supply,
+            )
+        null_tokens = cached_tokens - len(tokens)
+        if null_tokens:
+            msg = (
+                f"Warning: Data cache file had empty metadata for {null_tokens} "
+                "tokens. This is expected if those tokens are burned or "
+                "unrevealed. However, they are not taken into account into "
+                "rarity. Please check the cache file for errors."
+            )
+            logger.warning(msg)
+            print(msg)
         logger.debug(f"Read {len(tokens)} tokens from cache file: {cache_filename}")
     except FileNotFoundError:
         logger.warning(f"No opensea cache file found for {slug}: {cache_filename}")
@@ -458,6 +908,295 @@ def read_collection_data_from_file(expected_supply: int, slug: str) -> list[Toke
     return tokens
 
 
+def iter_collection_data_from_file(
+    slug: str, cache_format: CacheFormat = CacheFormat.JSON
+) -> Iterator[Token]:
+    """Generator variant of read_collection_data_from_file, which yields the
+    cached tokens with metadata one at a time. Yields no tokens if the cache
+    does not exist or cannot be parsed.
+
+    The binary cache is read in chunks (see _iter_binary_collection_data), while
+    the JSON cache is a single JSON list which is loaded at once, and only tokens
+    are created one at a time. Errors raised after the first token was yielded
+    are not caught, so that a broken cache is not taken for a smaller collection.
+    """
+    cache_filename = get_cache_filename(slug, cache_format=cache_format)
+    tokens: Iterator[Token]
+    try:
+        if cache_format == CacheFormat.BINARY:
+            tokens = _iter_binary_collection_data(cache_dirname=cache_filename)
+        else:
+            with open(cache_filename) as jsonfile:
+                tokens_data = json.load(jsonfile)
+            tokens = (
+                Token.from_dict(token_data)
+                for token_data in tokens_data
+                if token_data["metadata_dict"]
+            )
+        first_token = next(tokens, None)
+    except FileNotFoundError:
+        logger.warning(f"No opensea cache file found for {slug}: {cache_filename}")
+        return
+    except Exception:
+        logger.exception(
+            "Failed to parse valid cache data for %s from %s",
+            slug,
+            cache_filename,
+            exc_info=True,
+        )
+        return
+
+    if first_token is not None:
+        yield first_token
+        yield from tokens
+
+
+# Arrays of the binary cache format, each stored as {name}.npy
+BINARY_CACHE_ARRAY_NAMES: tuple[str, ...] = (
+    "string_offsets",
+    "string_data",
+    "token_ids",
+    "contract_addresses",
+    "token_standards",
+    "string_attribute_offsets",
+    "string_attribute_names",
+    "string_attribute_values",
+    "integer_attribute_offsets",
+    "integer_attribute_names",
+    "integer_attribute_values",
+    "float_attribute_offsets",
+    "float_attribute_names",
+    "float_attribute_values",
+    "date_attribute_offsets",
+    "date_attribute_names",
+    "date_attribute_values",
+)
+
+# Attribute types of the binary cache format, with the dtype of their values
+BINARY_CACHE_ATTRIBUTE_TYPES: dict[str, type] = {
+    "string": np.int32,
+    "integer": np.int64,
+    "float": np.float64,
+    "date": np.int64,
+}
+
+# Number of tokens read from the memory mapped arrays of the binary cache at once
+BINARY_CACHE_READ_CHUNK_SIZE = 10_000
+
+
+def _write_binary_collection_data(cache_dirname: str, tokens: Iterable[Token]):
+    """Writes tokens into a directory of .npy arrays (see BINARY_CACHE_ARRAY_NAMES).
+
+    All strings (contract addresses, token standard names, attribute names and
+    string attribute values) are stored once in a strings table and referred to
+    by their index in it. The table is stored as the UTF-8 bytes of all strings in
+    "string_data", where string i is at string_offsets[i] to
+    string_offsets[i + 1]. Every token has a row in "token_ids",
+    "contract_addresses" and "token_standards". Attributes of each type (see
+    BINARY_CACHE_ATTRIBUTE_TYPES) are stored in columnar arrays of names and
+    values, where the attributes of token i are at indices offsets[i] to
+    offsets[i + 1]. Integer and float numeric attributes are stored separately,
+    so that integers are not rounded to floats.
+
+    Arrays are written to a temporary directory which then replaces cache_dirname,
+    so that an interrupted write does not leave a partially written cache.
+    """
+    string_ids: dict[str, int] = {}
+
+    def get_string_id(value: str) -> int:
+        return string_ids.setdefault(value, len(string_ids))
+
+    token_ids: list[int] = []
+    contract_addresses: list[int] = []
+    token_standards: list[int] = []
+    attribute_columns: dict[str, tuple[list[int], list[int], list]] = {
+        attribute_type: ([0], [], []) for attribute_type in BINARY_CACHE_ATTRIBUTE_TYPES
+    }
+    for token in tokens:
+        token_identifier = token.token_identifier
+        if not isinstance(token_identifier, EVMContractTokenIdentifier):
+            raise ValueError(
+                f"Binary cache only supports EVM tokens, got {token_identifier}"
+            )
+        token_ids.append(token_identifier.token_id)
+        contract_addresses.append(get_string_id(token_identifier.contract_address))
+        token_standards.append(get_string_id(token.token_standard.name))
+
+        for string_attribute in token.metadata.string_attributes.values():
+            _, names, values = attribute_columns["string"]
+            names.append(get_string_id(string_attribute.name))
+            values.append(get_string_id(string_attribute.value))
+        for numeric_attribute in token.metadata.numeric_attributes.values():
+            _, names, values = attribute_columns[
+                "integer" if isinstance(numeric_attribute.value, int) else "float"
+            ]
+            names.append(get_string_id(numeric_attribute.name))
+            values.append(numeric_attribute.value)
+        for date_attribute in token.metadata.date_attributes.values():
+            _, names, values = attribute_columns["date"]
+            names.append(get_string_id(date_attribute.name))
+            values.append(date_attribute.value)
+        for offsets, names, _ in attribute_columns.values():
+            offsets.append(len(names))
+
+    encoded_strings = [string.encode("utf-8") for string in string_ids]
+    arrays: dict[str, np.ndarray] = {
+        "string_offsets": np.cumsum(
+            [0] + [len(string) for string in encoded_strings], dtype=np.int64
+        ),
+        "string_data": np.frombuffer(b"".join(encoded_strings), dtype=np.uint8),
+        # uint256 token ids that do not fit are stored as strings
+        "token_ids": _to_int64_array(token_ids),
+        "contract_addresses": np.array(contract_addresses, dtype=np.int32),
+        "token_standards": np.array(token_standards, dtype=np.int32),
+    }
+    for attribute_type, values_dtype in BINARY_CACHE_ATTRIBUTE_TYPES.items():
+        offsets, names, values = attribute_columns[attribute_type]
+        arrays[f"{attribute_type}_attribute_offsets"] = np.array(offsets, np.int64)
+        arrays[f"{attribute_type}_attribute_names"] = np.array(names, np.int32)
+        arrays[f"{attribute_type}_attribute_values"] = (
+            # Integers that do not fit are stored as strings
+            _to_int64_array(values)
+            if attribute_type == "integer"
+            else np.array(values, values_dtype)
+        )
+
+    cache_dirname = os.path.normpath(cache_dirname)
+    temp_dirname = tempfile.mkdtemp(
+        prefix=f".{os.path.basename(cache_dirname)}.",
+        dir=os.path.dirname(cache_dirname) or ".",
+    )
+    try:
+        for array_name in BINARY_CACHE_ARRAY_NAMES:
+            np.save(os.path.join(temp_dirname, f"{array_name}.npy"), arrays[array_name])
+        if os.path.exists(cache_dirname):
+            # Directories cannot be replaced, so the previous cache is moved aside
+            previous_dirname = f"{temp_dirname}.previous"
+            os.replace(cache_dirname, previous_dirname)
+            os.replace(temp_dirname, cache_dirname)
+            shutil.rmtree(previous_dirname)
+        else:
+            os.replace(temp_dirname, cache_dirname)
+    finally:
+        if os.path.exists(temp_dirname):
+            shutil.rmtree(temp_dirname)
+
+
+def _to_int64_array(values: list[int]) -> np.ndarray:
+    try:
+        return np.array(values, dtype=np.int64)
+    except OverflowError:
+        return np.array([str(value) for value in values])
+
+
+def _get_binary_cached_token_count(cache_dirname: str) -> int:
+    """Returns the number of tokens written by _write_binary_collection_data."""
+    return len(np.load(os.path.join(cache_dirname, "token_ids.npy"), mmap_mode="r"))
+
+
+def _iter_binary_collection_data(
+    cache_dirname: str, chunk_size: int = BINARY_CACHE_READ_CHUNK_SIZE
+) -> Iterator[Token]:
+    """Reads tokens written by _write_binary_collection_data, skipping tokens
+    without any attributes. Arrays are memory mapped and read chunk_size tokens at
+    a time, so that memory use is bounded by a chunk and the strings table instead
+    of the whole collection. Tokens are built directly from the arrays without
+    intermediate dictionaries. Every distinct string attribute is created once and
+    shared by all tokens that have it.
+    """
+    arrays = {
+        array_name: np.load(
+            os.path.join(cache_dirname, f"{array_name}.npy"), mmap_mode="r"
+        )
+        for array_name in BINARY_CACHE_ARRAY_NAMES
+    }
+    string_data = arrays["string_data"].tobytes()
+    string_offsets: list[int] = arrays["string_offsets"].tolist()
+    strings = [
+        string_data[start:end].decode("utf-8")
+        for start, end in zip(string_offsets, string_offsets[1:])
+    ]
+    del string_data
+    token_standards: dict[int, TokenStandard] = {}
+    string_attributes: dict[tuple[int, int], StringAttribute] = {}
+
+    for chunk_start in range(0, len(arrays["token_ids"]), chunk_size):
+        chunk_end = min(chunk_start + chunk_size, len(arrays["token_ids"]))
+        # Attributes of the chunk's tokens, with offsets relative to the chunk
+        chunk_attributes: dict[str, tuple[list[int], list[int], list]] = {}
+        for attribute_type in BINARY_CACHE_ATTRIBUTE_TYPES:
+            offsets = arrays[f"{attribute_type}_attribute_offsets"][
+                chunk_start : chunk_end + 1
+            ]
+            attributes = slice(offsets[0], offsets[-1])
+            values = arrays[f"{attribute_type}_attribute_values"][attributes].tolist()
+            if attribute_type == "integer":
+                values = [int(value) for value in values]
+            chunk_attributes[attribute_type] = (
+                (offsets - offsets[0]).tolist(),
+                arrays[f"{attribute_type}_attribute_names"][attributes].tolist(),
+                values,
+            )
+        string_offsets, string_names, string_values = chunk_attributes["string"]
+        date_offsets, date_names, date_values = chunk_attributes["date"]
+
+        for idx, (token_id, contract_address, token_standard) in enumerate(
+            zip(
+                arrays["token_ids"][chunk_start:chunk_end].tolist(),
+                arrays["contract_addresses"][chunk_start:chunk_end].tolist(),
+                arrays["token_standards"][chunk_start:chunk_end].tolist(),
+            )
+        ):
+            token_string_attributes = {}
+            for attr_idx in range(string_offsets[idx], string_offsets[idx + 1]):
+                key = (string_names[attr_idx], string_values[attr_idx])
+                attribute = string_attributes.get(key)
+                if attribute is None:
+                    attribute = StringAttribute(
+                        name=strings[key[0]], value=strings[key[1]]
+                    )
+                    string_attributes[key] = attribute
+                token_string_attributes[attribute.name] = attribute
+            token_numeric_attributes = {
+                strings[numeric_names[attr_idx]]: NumericAttribute(
+                    name=strings[numeric_names[attr_idx]],
+                    value=numeric_values[attr_idx],
+                )
+                for numeric_offsets, numeric_names, numeric_values in [
+                    chunk_attributes["integer"],
+                    chunk_attributes["float"],
+                ]
+                for attr_idx in range(numeric_offsets[idx], numeric_offsets[idx + 1])
+            }
+            token_date_attributes = {
+                strings[date_names[attr_idx]]: DateAttribute(
+                    name=strings[date_names[attr_idx]], value=date_values[attr_idx]
+                )
+                for attr_idx in range(date_offsets[idx], date_offsets[idx + 1])
+            }
+            if not (
+                token_string_attributes
+                or token_numeric_attributes
+                or token_date_attributes
+            ):
+                continue
+
+            if token_standard not in token_standards:
+                token_standards[token_standard] = TokenStandard[strings[token_standard]]
+            yield Token(
+                token_identifier=EVMContractTokenIdentifier(
+                    contract_address=strings[contract_address],
+                    token_id=int(token_id),
+                ),
+                token_standard=token_standards[token_standard],
+                metadata=TokenMetadata(
+                    string_attributes=token_string_attributes,
+                    numeric_attributes=token_numeric_attributes,
+                    date_attributes=token_date_attributes,
+                ),
+            )
+
+
 # NFT metadata standard type definitions described here:
 # https://docs.opensea.io/docs/metadata-standards
 def is_string_trait(trait: dict) -> bool:
@@ -1,6 +1,9 @@
-import json
 import logging
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+
+import numpy as np
 
 from open_rarity.models.token_identifier import EVMContractTokenIdentifier
 from open_rarity.resolver.models.collection_with_metadata import CollectionWithMetadata
@@ -12,12 +15,42 @@ from open_rarity.resolver.models.token_with_rarity_data import (
 )
 
 from .rank_resolver import RankResolver
+from .rank_store import MISSING_RANK, RankStore, to_token_id_array
 from .rarity_sniffer import RaritySnifferResolver
 from .rarity_sniper import RaritySniperResolver
 from .trait_sniper import TraitSniperResolver
 
 logger = logging.getLogger("open_rarity_logger")
 
+# Number of Rarity Sniper ranks fetched at once. Requests are rate limited by
+# default_rate_limiter regardless of the number of workers.
+RARITY_SNIPER_MAX_WORKERS = 8
+# Number of fetched Rarity Sniper ranks after which the cache file is written
+RARITY_SNIPER_CACHE_FLUSH_INTERVAL = 500
+
+
+@dataclass
+class FetchProgress:
+    """Progress of fetching ranks one token at a time from a provider.
+
+    Attributes
+    ----------
+    total : int
+        number of tokens to fetch ranks for
+    fetched : int
+        number of tokens a rank was fetched for
+    failed : int
+        number of tokens no rank could be fetched for
+    """
+
+    total: int = 0
+    fetched: int = 0
+    failed: int = 0
+
+    @property
+    def done(self) -> int:
+        return self.fetched + self.failed
+
 
 def get_external_resolver(rank_provider: RankProvider) -> RankResolver:
     if rank_provider == RankProvider.TRAITS_SNIPER:
@@ -35,10 +68,14 @@ class ExternalRarityProvider:
     # The data must be a dictionary of <token id as int> to <rank as int>
     CACHE_FILENAME_FORMAT: str = "cached_data/%s_%s_cached_ranks.json"
 
-    # Dictionary of slug -> {token_id (str) -> rank (int)}
-    _trait_sniper_cache: dict[str, dict[str, int]] = defaultdict(dict)
-    _rarity_sniffer_cache: dict[str, dict[str, int]] = defaultdict(dict)
-    _rarity_sniper_cache: dict[str, dict[str, int]] = defaultdict(dict)
+    # Dictionary of slug -> ranks by token id
+    _trait_sniper_cache: dict[str, RankStore] = defaultdict(RankStore)
+    _rarity_sniffer_cache: dict[str, RankStore] = defaultdict(RankStore)
+    _rarity_sniper_cache: dict[str, RankStore] = defaultdict(RankStore)
+
+    def __init__(self) -> None:
+        # Progress of the last fetch of ranks per token, by provider
+        self.progress: dict[RankProvider, FetchProgress] = {}
 
     def cache_filename(self, rank_provider: RankProvider, slug: str) -> str:
         rank_name = rank_provider.name.lower()
@@ -54,6 +91,11 @@ class ExternalRarityProvider:
         """Fetches ranks from available providers gem, rarity sniper and/or trait sniper
         and adds them to the rarities field in `tokens_with_rarity`
 
+        Providers are independent hosts with independent rate limits, so ranks
+        are fetched from all providers concurrently, each into its own cache.
+        The fetched ranks are added to `tokens_with_rarity` once all providers
+        are done, in order of `rank_providers`.
+
         Parameters
         ----------
         collection : Collection
@@ -71,28 +113,25 @@ class ExternalRarityProvider:
             tokens with fetched external rarity data
         """
         logger.debug(f"Fetching external rarity for {len(tokens_with_rarity)} tokens")
+        token_ids = self._get_token_ids(tokens_with_rarity)
+
+        with ThreadPoolExecutor(max_workers=max(len(rank_providers), 1)) as executor:
+            futures = {
+                rank_provider: executor.submit(
+                    self._fetch_ranks,
+                    rank_provider=rank_provider,
+                    collection_with_metadata=collection_with_metadata,
+                    token_ids=token_ids,
+                    cache_external_ranks=cache_external_ranks,
+                )
+                for rank_provider in rank_providers
+            }
 
-        for rank_provider in rank_providers:
+        for rank_provider, future in futures.items():
             # Note: Not all providers have rankings for all collections,
             # so do a best effort.
-            print("\t\tProcessing provider: ", rank_provider)
             try:
-                if rank_provider in {
-                    RankProvider.RARITY_SNIFFER,
-                    RankProvider.TRAITS_SNIPER,
-                }:
-                    self._add_rarity_data(
-                        rank_provider=rank_provider,
-                        collection_with_metadata=collection_with_metadata,
-                        tokens_with_rarity=tokens_with_rarity,
-                        cache_external_ranks=cache_external_ranks,
-                    )
-                elif rank_provider == RankProvider.RARITY_SNIPER:
-                    self._add_rarity_sniper_rarity_data(
-                        collection_with_metadata=collection_with_metadata,
-                        tokens_with_rarity=tokens_with_rarity,
-                        cache_external_ranks=cache_external_ranks,
-                    )
+                future.result()
             except Exception:
                 logger.exception(
                     f"Exception: Could not get ranks from {rank_provider} for "
@@ -100,29 +139,58 @@ class ExternalRarityProvider:
                     exc_info=True,
                 )
                 continue
+            self._add_cached_ranks(
+                rank_provider=rank_provider,
+                slug=collection_with_metadata.opensea_slug,
+                tokens_with_rarity=tokens_with_rarity,
+                token_ids=token_ids,
+            )
         return tokens_with_rarity
 
     # Private methods
-    def _add_rarity_data(
+    def _fetch_ranks(
         self,
         rank_provider: RankProvider,
         collection_with_metadata: CollectionWithMetadata,
-        tokens_with_rarity: list[TokenWithRarityData],
+        token_ids: np.ndarray,
         cache_external_ranks: bool = True,
-    ) -> list[TokenWithRarityData]:
-        """Modifies `tokens_with_rarity` by adding external provider rank data
+    ) -> None:
+        """Fetches the ranks of the given token ids from the given provider into
+        its cache."""
+        logger.debug(f"Processing provider: {rank_provider}")
+        if rank_provider in {
+            RankProvider.RARITY_SNIFFER,
+            RankProvider.TRAITS_SNIPER,
+        }:
+            self._fetch_all_ranks(
+                rank_provider=rank_provider,
+                collection_with_metadata=collection_with_metadata,
+                cache_external_ranks=cache_external_ranks,
+            )
+        elif rank_provider == RankProvider.RARITY_SNIPER:
+            self._fetch_rarity_sniper_ranks(
+                collection_with_metadata=collection_with_metadata,
+                token_ids=token_ids,
+                cache_external_ranks=cache_external_ranks,
+            )
+
+    def _fetch_all_ranks(
+        self,
+        rank_provider: RankProvider,
+        collection_with_metadata: CollectionWithMetadata,
+        cache_external_ranks: bool = True,
+    ) -> None:
+        """Fetches the ranks of all tokens of the collection from a provider that
+        supports bulk rank fetching into its cache, unless they are cached.
         Currently only works for EVM collections
 
         Parameters
         ----------
+        rank_provider : RankProvider
         collection_with_metadata : CollectionWithMetadata
-        tokens_with_rarity : list[TokenWithRarityData]
-            list of tokens with rarity to augment
-
-        Returns
-        -------
-        list[TokenWithRarityData]
-            list of augmeneted tokens
+        cache_external_ranks : bool
+            If set to true, loads ranks from the local cache file if it exists,
+            and otherwise writes fetched ranks to it.
         """
         slug = collection_with_metadata.opensea_slug
         logger.debug(f"Resolving {rank_provider} data for {slug}")
@@ -163,30 +231,22 @@ class ExternalRarityProvider:
             if cache_external_ranks:
                 self.write_cache_to_file(slug, rank_provider)
 
-        # Fill in ranks for each token
-        for token_with_rarity in tokens_with_rarity:
-            token_identifer = token_with_rarity.token.token_identifier
-            # Needed for type-checking
-            assert isinstance(token_identifer, EVMContractTokenIdentifier)
-            token_id = token_identifer.token_id
-
-            rank = self._get_cached_rank(
-                slug=slug, rank_provider=rank_provider, token_id=token_id
-            )
-
-            if rank:
-                token_with_rarity.rarities.append(
-                    RarityData(provider=rank_provider, rank=rank)
-                )
-
-        return tokens_with_rarity
-
-    def _add_rarity_sniper_rarity_data(
+    def _fetch_rarity_sniper_ranks(
         self,
         collection_with_metadata: CollectionWithMetadata,
-        tokens_with_rarity: list[TokenWithRarityData],
+        token_ids: np.ndarray,
         cache_external_ranks: bool = True,
-    ) -> list[TokenWithRarityData]:
+        max_workers: int = RARITY_SNIPER_MAX_WORKERS,
+        cache_flush_interval: int = RARITY_SNIPER_CACHE_FLUSH_INTERVAL,
+    ) -> None:
+        """Fetches Rarity Sniper ranks of the given tokens into its cache.
+
+        Rarity Sniper only serves ranks one token at a time, so ranks missing from
+        the cache are fetched by up to `max_workers` threads, rate limited by
+        default_rate_limiter. Progress is tracked in self.progress, and fetched
+        ranks are written to the cache file every `cache_flush_interval` fetches
+        so that an interrupted run keeps them.
+        """
         # We're currently using opensea slug to calculate trait sniper slug
         opensea_slug = collection_with_metadata.opensea_slug
         slug = RaritySniperResolver.get_slug(opensea_slug=opensea_slug)
@@ -194,53 +254,100 @@ class ExternalRarityProvider:
         if cache_external_ranks:
             self._load_cache_from_file(slug=opensea_slug, rank_provider=rank_provider)
 
-        for token_with_rarity in tokens_with_rarity:
-            token = token_with_rarity.token
-            token_identifer = token.token_identifier
-            # Needed for type-checking
-            assert isinstance(token_identifer, EVMContractTokenIdentifier)
-            token_id = token_identifer.token_id
-            rank = self._get_cached_rank(
-                slug=opensea_slug,
-                rank_provider=rank_provider,
-                token_id=token_id,
-            )
-
-            if rank is None:
-                try:
-                    rank = RaritySniperResolver.get_rank(
-                        collection_slug=slug, token_id=token_id
-                    )
-                    print(
-                        f"[RaritySniper] Fetched from api: {rank=} {token_id=} {slug=}"
-                    )
+        cache = self._get_cache_for_collection(opensea_slug, rank_provider)
+        unique_token_ids = np.unique(token_ids)
+        missing_token_ids = unique_token_ids[
+            cache.lookup(unique_token_ids) == MISSING_RANK
+        ].tolist()
+        progress = FetchProgress(total=len(missing_token_ids))
+        self.progress[rank_provider] = progress
+        # Fetched ranks are added to the cache in batches
+        fetched_ranks: dict[int, int] = {}
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(
+                    self._fetch_rarity_sniper_rank,
+                    opensea_slug=opensea_slug,
+                    slug=slug,
+                    token_id=token_id,
+                ): token_id
+                for token_id in missing_token_ids
+            }
+            # Ranks are stored from this thread only, as fetches complete
+            for future in as_completed(futures):
+                rank = future.result()
+                if rank is None:
+                    progress.failed += 1
+                else:
+                    fetched_ranks[futures[future]] = rank
+                    progress.fetched += 1
+
+                if progress.done % cache_flush_interval == 0:
                     logger.debug(
-                        "Resolved rarity sniper rarity for "
-                        f"{opensea_slug=}/{slug=} {token_id=}: {rank}"
-                    )
-                except Exception:
-                    logger.exception(
-                        "[Rarity Sniper] Failed to resolve from API:"
-                        f"{opensea_slug=}/{slug=} {token_id=}: {rank}",
-                        exc_info=True,
+                        f"[RaritySniper] Fetched {progress.done}/{progress.total} "
+                        f"ranks for {opensea_slug=}/{slug=}"
                     )
+                    cache.update(fetched_ranks)
+                    fetched_ranks.clear()
+                    if cache_external_ranks:
+                        self.write_cache_to_file(opensea_slug, rank_provider)
 
-                # Store in cache
-                if rank is not None:
-                    self._get_cache_for_collection(opensea_slug, rank_provider)[
-                        str(token_id)
-                    ] = rank
-
-            if rank:
-                token_with_rarity.rarities.append(
-                    RarityData(provider=rank_provider, rank=rank)
-                )
-
+        cache.update(fetched_ranks)
         if cache_external_ranks:
             self.write_cache_to_file(opensea_slug, rank_provider)
 
+    def _add_cached_ranks(
+        self,
+        rank_provider: RankProvider,
+        slug: str,
+        tokens_with_rarity: list[TokenWithRarityData],
+        token_ids: np.ndarray | None = None,
+    ) -> list[TokenWithRarityData]:
+        """Modifies `tokens_with_rarity` by adding the cached ranks of the given
+        provider. `token_ids` are the token ids of `tokens_with_rarity`, so that
+        they are only extracted once for all providers."""
+        if token_ids is None:
+            token_ids = self._get_token_ids(tokens_with_rarity)
+        ranks = self._get_cache_for_collection(slug, rank_provider).lookup(token_ids)
+        for index in np.flatnonzero(ranks != MISSING_RANK).tolist():
+            tokens_with_rarity[index].rarities.append(
+                RarityData(provider=rank_provider, rank=int(ranks[index]))
+            )
+
         return tokens_with_rarity
 
+    @staticmethod
+    def _get_token_ids(tokens_with_rarity: list[TokenWithRarityData]) -> np.ndarray:
+        token_ids = []
+        for token_with_rarity in tokens_with_rarity:
+            token_identifer = token_with_rarity.token.token_identifier
+            # Needed for type-checking
+            assert isinstance(token_identifer, EVMContractTokenIdentifier)
+            token_ids.append(token_identifer.token_id)
+        return to_token_id_array(token_ids)
+
+    @staticmethod
+    def _fetch_rarity_sniper_rank(
+        opensea_slug: str, slug: str, token_id: int
+    ) -> int | None:
+        rank = None
+        try:
+            rank = RaritySniperResolver.get_rank(
+                collection_slug=slug, token_id=token_id
+            )
+            logger.debug(
+                "Resolved rarity sniper rarity for "
+                f"{opensea_slug=}/{slug=} {token_id=}: {rank}"
+            )
+        except Exception:
+            logger.exception(
+                "[Rarity Sniper] Failed to resolve from API:"
+                f"{opensea_slug=}/{slug=} {token_id=}: {rank}",
+                exc_info=True,
+            )
+        return rank
+
     # Cache methods
     def _load_cache_from_file(
         self,
@@ -254,11 +361,10 @@ class ExternalRarityProvider:
 
         cache_filename = self.cache_filename(rank_provider=rank_provider, slug=slug)
         try:
-            with open(cache_filename) as jsonfile:
-                external_rank_data = json.load(jsonfile)
+            rank_store = RankStore.from_file(cache_filename)
             logger.debug(
                 f"Successfully loaded cached external ranks from: {cache_filename}: "
-                f"Found {len(external_rank_data)} token ranks"
+                f"Found {len(rank_store)} token ranks"
             )
         except FileNotFoundError:
             logger.warning(f"Cache file does not exist: {cache_filename}.")
@@ -269,29 +375,26 @@ class ExternalRarityProvider:
             )
             return False
 
-        self._set_cache(
-            slug=slug, rank_provider=rank_provider, rank_data=external_rank_data
-        )
+        self._get_cache(rank_provider)[slug] = rank_store
         return True
 
     def write_cache_to_file(self, slug: str, rank_provider: RankProvider):
-        cache_data = self._get_cache_for_collection(
+        rank_store = self._get_cache_for_collection(
             slug=slug, rank_provider=rank_provider
         )
         cache_filename = self.cache_filename(rank_provider=rank_provider, slug=slug)
         logger.debug(
             f"Writing external rank data ({rank_provider}) to cache for: {slug} "
-            f"to file: {cache_filename}. Contains {len(cache_data)} token ranks."
+            f"to file: {cache_filename}. Contains {len(rank_store)} token ranks."
         )
-        with open(cache_filename, "w+") as jsonfile:
-            json.dump(cache_data, jsonfile, indent=4)
+        rank_store.write_to_file(cache_filename)
 
     def _set_cache(
         self, slug: str, rank_provider: RankProvider, rank_data: dict[str, int]
     ) -> None:
-        self._get_cache(rank_provider)[slug] = rank_data
+        self._get_cache(rank_provider)[slug] = RankStore.from_dict(rank_data)
 
-    def _get_cache(self, rank_provider: RankProvider) -> dict[str, dict[str, int]]:
+    def _get_cache(self, rank_provider: RankProvider) -> dict[str, RankStore]:
         if rank_provider == RankProvider.TRAITS_SNIPER:
             return self._trait_sniper_cache
         if rank_provider == RankProvider.RARITY_SNIFFER:
@@ -302,16 +405,9 @@ class ExternalRarityProvider:
 
     def _get_cache_for_collection(
         self, slug: str, rank_provider: RankProvider
-    ) -> dict[str, int]:
+    ) -> RankStore:
         return self._get_cache(rank_provider)[slug]
 
-    def _get_cached_rank(
-        self, slug: str, rank_provider: RankProvider, token_id: int
-    ) -> int | None:
-        return self._get_cache_for_collection(slug, rank_provider).get(
-            str(token_id), None
-        )
-
     def _is_cache_loaded(self, slug: str, rank_provider: RankProvider):
         return (
             len(self._get_cache_for_collection(rank_provider=rank_provider, slug=slug))
@@ -0,0 +1,155 @@
+import json
+import os
+import tempfile
+from typing import Iterable
+
+import numpy as np
+
+# Rank of tokens without a rank in RankStore.lookup. Providers rank from 1.
+MISSING_RANK = 0
+
+# Ranks are stored in a dense array indexed by token id if the token ids span at
+# most this many times the number of ranks, e.g. collections with burned tokens.
+DENSE_MAX_SPAN_RATIO = 2
+
+
+class RankStore:
+    """Ranks of a provider for the tokens of a collection, indexed by integer
+    token id.
+
+    Ranks are stored in a dense array indexed by token id when token ids are
+    (nearly) contiguous, which is the case for most collections, and otherwise
+    in arrays sorted by token id that are looked up with binary search. Either
+    way, the ranks of many tokens are looked up at once with lookup().
+
+    Parameters
+    ----------
+    token_ids : Iterable[int], optional
+        Token ids, by default no token ids.
+    ranks : Iterable[int], optional
+        Ranks of the token ids, in the same order.
+    """
+
+    def __init__(
+        self,
+        token_ids: Iterable[int] | None = None,
+        ranks: Iterable[int] | None = None,
+    ):
+        token_ids_array = to_token_id_array([] if token_ids is None else token_ids)
+        ranks_array = np.asarray([] if ranks is None else list(ranks), dtype=np.int64)
+        if len(token_ids_array) != len(ranks_array):
+            raise ValueError(
+                f"Got {len(token_ids_array)} token ids for {len(ranks_array)} ranks"
+            )
+        self._set_ranks(token_ids_array, ranks_array)
+
+    @classmethod
+    def from_dict(cls, token_ids_to_ranks: dict[str, int] | dict[int, int]):
+        """Creates a store from a dictionary of token id (as str or int) to rank,
+        the format returned by RankResolver.get_all_ranks."""
+        return cls(
+            token_ids=[int(token_id) for token_id in token_ids_to_ranks],
+            ranks=token_ids_to_ranks.values(),
+        )
+
+    @classmethod
+    def from_file(cls, filename: str):
+        """Loads a store from a JSON file written by write_to_file."""
+        with open(filename) as jsonfile:
+            return cls.from_dict(json.load(jsonfile))
+
+    @property
+    def is_dense(self) -> bool:
+        return self._dense_ranks is not None
+
+    def __len__(self) -> int:
+        return len(self._token_ids)
+
+    def get(self, token_id: int) -> int | None:
+        """Returns the rank of the given token id, or None if it has no rank."""
+        rank = int(self.lookup([token_id])[0])
+        return None if rank == MISSING_RANK else rank
+
+    def lookup(self, token_ids: Iterable[int]) -> np.ndarray:
+        """Returns the ranks of the given token ids, with MISSING_RANK for token
+        ids without a rank."""
+        query = to_token_id_array(token_ids)
+        ranks = np.full(len(query), MISSING_RANK, dtype=np.int64)
+        if len(self._token_ids) == 0 or len(query) == 0:
+            return ranks
+
+        if self._dense_ranks is not None:
+            indices = query - self._token_ids[0]
+            found = (indices >= 0) & (indices < len(self._dense_ranks))
+            ranks[found] = self._dense_ranks[indices[found].astype(np.int64)]
+        else:
+            indices = np.searchsorted(self._token_ids, query)
+            found = indices < len(self._token_ids)
+            found[found] = self._token_ids[indices[found]] == query[found]
+            ranks[found] = self._ranks[indices[found]]
+        return ranks
+
+    def update(self, token_ids_to_ranks: dict[int, int]) -> None:
+        """Adds or replaces the ranks of the given token ids."""
+        if not token_ids_to_ranks:
+            return
+        token_ids = to_token_id_array(token_ids_to_ranks)
+        ranks = np.fromiter(
+            token_ids_to_ranks.values(), dtype=np.int64, count=len(token_ids)
+        )
+        # New ranks come first, so that they are kept over existing ranks
+        self._set_ranks(
+            np.concatenate([token_ids, self._token_ids]),
+            np.concatenate([ranks, self._ranks]),
+        )
+
+    def to_dict(self) -> dict[str, int]:
+        """Returns a dictionary of token id (as str) to rank, in token id order."""
+        return {
+            str(token_id): rank
+            for token_id, rank in zip(self._token_ids.tolist(), self._ranks.tolist())
+        }
+
+    def write_to_file(self, filename: str) -> None:
+        """Writes the ranks to a JSON file of token id (as str) to rank.
+
+        The ranks are written to a temporary file in the same directory that
+        then replaces the file, so an existing file is kept if writing fails.
+        """
+        filename = os.path.normpath(filename)
+        file_descriptor, temp_filename = tempfile.mkstemp(
+            prefix=f".{os.path.basename(filename)}.",
+            dir=os.path.dirname(filename) or ".",
+        )
+        try:
+            with os.fdopen(file_descriptor, "w") as jsonfile:
+                json.dump(self.to_dict(), jsonfile, indent=4)
+            os.replace(temp_filename, filename)
+        finally:
+            if os.path.exists(temp_filename):
+                os.remove(temp_filename)
+
+    # Private methods
+    def _set_ranks(self, token_ids: np.ndarray, ranks: np.ndarray) -> None:
+        # Sorts by token id and keeps the first rank of duplicate token ids
+        self._token_ids, first_indices = np.unique(token_ids, return_index=True)
+        self._ranks = ranks[first_indices]
+
+        self._dense_ranks: np.ndarray | None = None
+        if len(self._token_ids) > 0:
+            span = int(self._token_ids[-1]) - int(self._token_ids[0]) + 1
+            if span <= DENSE_MAX_SPAN_RATIO * len(self._token_ids):
+                self._dense_ranks = np.full(span, MISSING_RANK, dtype=np.int64)
+                self._dense_ranks[
+                    (self._token_ids - self._token_ids[0]).astype(np.int64)
+                ] = self._ranks
+
+
+def to_token_id_array(token_ids: Iterable[int]) -> np.ndarray:
+    """Returns the given token ids as an array to look up ranks with."""
+    token_ids = list(token_ids)
+    try:
+        return np.array(token_ids, dtype=np.int64)
+    except OverflowError:
+        # Token ids of e.g. ERC1155 tokens can be up to 256 bits
+        return np.array(token_ids, dtype=object)
@@ -1,6 +1,6 @@
 import logging
 
-import requests
+from open_rarity.resolver.rate_limiter import default_rate_limiter
 
 from .rank_resolver import RankResolver
 
@@ -44,7 +44,7 @@ class RaritySnifferResolver(RankResolver):
             "traitCount": "true",
         }
 
-        response = requests.request(
+        response = default_rate_limiter.request(
             "GET",
             RARITY_SNIFFER_API_URL,
             params=querystring,
@@ -1,6 +1,6 @@
 import logging
 
-import requests
+from open_rarity.resolver.rate_limiter import default_rate_limiter
 
 from .rank_resolver import RankResolver
 
@@ -38,7 +38,7 @@ class RaritySniperResolver(RankResolver):
     def get_rank(collection_slug: str, token_id: int) -> int | None:
         url = RARITY_SNIPER_API_URL.format(slug=collection_slug, token_id=token_id)
         logger.debug("{url}".format(url=url))
-        response = requests.request("GET", url, headers=USER_AGENT)
+        response = default_rate_limiter.request("GET", url, headers=USER_AGENT)
         if response.status_code == 200:
             return response.json()["rank"]
         else:
@@ -1,8 +1,7 @@
 import logging
 import os
-import time
 
-import requests
+from open_rarity.resolver.rate_limiter import default_rate_limiter
 
 from .rank_resolver import RankResolver
 
@@ -38,9 +37,6 @@ class TraitSniperResolver(RankResolver):
             rank_data_page = TraitSniperResolver.get_ranks(contract_address, page=page)
             all_rank_data.extend(rank_data_page)
             page += 1
-            # Due to rate limits we need to slow things down a bit...
-            # Free tier is 5 request per second
-            time.sleep(12)
 
         return {
             str(rank_data["token_id"]): int(rank_data["rarity_rank"])
@@ -91,7 +87,9 @@ class TraitSniperResolver(RankResolver):
             "limit": max(limit, 200),
             "page": page,
         }
-        response = requests.request("GET", url, headers=headers, params=query_params)
+        response = default_rate_limiter.request(
+            "GET", url, headers=headers, params=query_params
+        )
         if response.status_code == 200:
             return response.json()["ranks"]
         else:
@@ -147,7 +145,9 @@ class TraitSniperResolver(RankResolver):
             raise ValueError(msg)
 
         url = TRAIT_SNIPER_NFTS_URL.format(slug=collection_slug)
-        response = requests.request("GET", url, params=querystring, headers=USER_AGENT)
+        response = default_rate_limiter.request(
+            "GET", url, params=querystring, headers=USER_AGENT
+        )
         if response.status_code == 200:
             return int(response.json()["nfts"][0]["rarity_rank"])
         else:
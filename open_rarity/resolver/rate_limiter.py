@@ -0,0 +1,204 @@
+import email.utils
+import logging
+import os
+import random
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+
+logger = logging.getLogger("open_rarity_logger")
+
+# Requests per second allowed by the API of each provider
+HOST_REQUESTS_PER_SECOND: dict[str, float] = {
+    # Opensea allows more requests with an API key
+    "api.opensea.io": 4.0 if os.environ.get("OS_API_KEY") else 1.0,
+    # Same as the 12 second pause between pages that was used before rate
+    # limiting, since the limit of the API is not documented
+    "api.traitsniper.com": 1 / 12,
+    "api.raritysniper.com": 2.0,
+    "raritysniffer.com": 1.0,
+}
+DEFAULT_REQUESTS_PER_SECOND = 2.0
+
+# Status codes of responses asking to slow down and retry later
+RETRY_STATUS_CODES = {429, 503}
+
+
+class TokenBucket:
+    """Thread-safe token bucket which allows `rate` requests per second on
+    average, with bursts of up to `capacity` requests.
+
+    The rate adapts to the server: backoff() halves the rate and pauses all
+    requests, and every successful request recovers part of the original rate.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.max_rate = rate
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Blocks until a request may be made."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                wait = self._paused_until - now
+                if wait <= 0 and self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = max(wait, (1 - self._tokens) / self.rate)
+            time.sleep(wait)
+
+    def backoff(self, delay: float) -> None:
+        """Pauses requests for `delay` seconds and halves the rate."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._paused_until = max(self._paused_until, now + delay)
+            self._tokens = 0
+            self.rate = max(self.rate / 2, self.max_rate / 64)
+
+    def recover(self) -> None:
+        """Recovers a tenth of the original rate after a successful request."""
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate / 10)
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated_at) * self.rate
+        )
+        self._updated_at = now
+
+
+class RateLimiter:
+    """Rate limits requests with a token bucket per host, shared by every thread
+    making requests through it. Requests that are rate limited by the server
+    (429 or 503 responses) are retried with exponential backoff and jitter, or
+    after the delay given by the Retry-After header.
+
+    Resolvers make requests through default_rate_limiter, so that requests to a
+    provider are rate limited across all resolvers and threads.
+
+    Parameters
+    ----------
+    host_requests_per_second : dict[str, float], optional
+        Requests per second allowed by each host, by default
+        HOST_REQUESTS_PER_SECOND.
+    default_requests_per_second : float, optional
+        Requests per second allowed by other hosts, by default
+        DEFAULT_REQUESTS_PER_SECOND.
+    max_retries : int, optional
+        Number of times a rate limited request is retried, by default 5.
+    backoff_seconds : float, optional
+        Backoff of the first retry without Retry-After header, doubled for every
+        following retry, by default 1.
+    max_backoff_seconds : float, optional
+        Maximum backoff of a retry, by default 60.
+    """
+
+    def __init__(
+        self,
+        host_requests_per_second: dict[str, float] | None = None,
+        default_requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND,
+        max_retries: int = 5,
+        backoff_seconds: float = 1.0,
+        max_backoff_seconds: float = 60.0,
+    ):
+        self.host_requests_per_second = (
+            HOST_REQUESTS_PER_SECOND
+            if host_requests_per_second is None
+            else host_requests_per_second
+        )
+        self.default_requests_per_second = default_requests_per_second
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self._buckets: dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, host: str) -> TokenBucket:
+        """Returns the token bucket of the given host."""
+        with self._lock:
+            if host not in self._buckets:
+                self._buckets[host] = TokenBucket(
+                    rate=self.host_requests_per_second.get(
+                        host, self.default_requests_per_second
+                    )
+                )
+            return self._buckets[host]
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        session: requests.Session | None = None,
+        **kwargs,
+    ) -> requests.Response:
+        """Makes a request once the rate limit of the url's host allows it, see
+        requests.request for parameters.
+
+        Returns
+        -------
+        requests.Response
+            The response, which is still rate limited by the server if all
+            retries were rate limited.
+        """
+        bucket = self.bucket(urlparse(url).netloc)
+        attempt = 0
+        while True:
+            bucket.acquire()
+            response = (session or requests).request(method, url, **kwargs)
+            if response.status_code not in RETRY_STATUS_CODES:
+                bucket.recover()
+                return response
+            if attempt >= self.max_retries:
+                logger.warning(
+                    f"Request to {url} still rate limited after {attempt} retries. "
+                    f"Received {response.status_code}: {response.reason}"
+                )
+                return response
+
+            delay = self._get_backoff_delay(response, attempt)
+            logger.debug(
+                f"Request to {url} rate limited with {response.status_code}, "
+                f"retrying in {delay:.2f}s"
+            )
+            bucket.backoff(delay)
+            attempt += 1
+
+    def _get_backoff_delay(self, response: requests.Response, attempt: int) -> float:
+        retry_after = _parse_retry_after(response.headers.get("Retry-After"))
+        if retry_after is not None:
+            # Spread out the retries of concurrent requests a little
+            return min(retry_after, self.max_backoff_seconds) + random.uniform(
+                0, self.backoff_seconds
+            )
+        # Full jitter of exponential backoff
+        return random.uniform(
+            0, min(self.max_backoff_seconds, self.backoff_seconds * 2**attempt)
+        )
+
+
+def _parse_retry_after(retry_after: str | None) -> float | None:
+    """Parses a Retry-After header value, given either in seconds or as a date."""
+    if not retry_after:
+        return None
+    try:
+        return max(float(retry_after), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_date = email.utils.parsedate_to_datetime(retry_after)
+    except (TypeError, ValueError):
+        return None
+    return max(retry_date.timestamp() - time.time(), 0.0)
+
+
+default_rate_limiter = RateLimiter()
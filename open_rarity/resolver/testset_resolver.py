@@ -8,7 +8,7 @@ import os
 import pkgutil
 from dataclasses import dataclass
 from time import strftime, time
-from typing import Iterable
+from typing import Iterable, Iterator
 
 import numpy as np
 
@@ -30,27 +30,16 @@ from open_rarity.resolver.rarity_providers.external_rarity_provider import (
     EXTERNAL_RANK_PROVIDERS,
     ExternalRarityProvider,
 )
-from open_rarity.scoring.handlers.arithmetic_mean_scoring_handler import (
-    ArithmeticMeanScoringHandler,
+from open_rarity.scoring.metrics import (
+    ARITHMETIC_METRIC,
+    GEOMETRIC_METRIC,
+    HARMONIC_METRIC,
+    INFORMATION_CONTENT_METRIC,
+    SUM_METRIC,
+    score_metrics,
 )
-from open_rarity.scoring.handlers.geometric_mean_scoring_handler import (
-    GeometricMeanScoringHandler,
-)
-from open_rarity.scoring.handlers.harmonic_mean_scoring_handler import (
-    HarmonicMeanScoringHandler,
-)
-from open_rarity.scoring.handlers.information_content_scoring_handler import (
-    InformationContentScoringHandler,
-)
-from open_rarity.scoring.handlers.sum_scoring_handler import SumScoringHandler
 from open_rarity.scoring.token_feature_extractor import TokenFeatureExtractor
 
-harmonic_handler = HarmonicMeanScoringHandler()
-arithmetic_handler = ArithmeticMeanScoringHandler()
-geometric_handler = GeometricMeanScoringHandler()
-sum_handler = SumScoringHandler()
-ic_handler = InformationContentScoringHandler()
-
 RankScore = tuple[int, float]
 # Token ID -> Score
 ScoredTokens = dict[int, float]
@@ -413,47 +402,28 @@ def resolve_open_rarity_score(
 
     logger.debug("OpenRarity scoring")
 
-    for token in tokens:
+    metric_dicts = {
+        ARITHMETIC_METRIC: arthimetic_dict,
+        GEOMETRIC_METRIC: geometric_dict,
+        HARMONIC_METRIC: harmonic_dict,
+        SUM_METRIC: sum_dict,
+        INFORMATION_CONTENT_METRIC: ic_dict,
+    }
+    for token, token_scores in _iter_token_metric_scores(collection, tokens):
         token_identifier = token.token_identifier
         assert isinstance(token_identifier, EVMContractTokenIdentifier)
         token_id = str(token_identifier.token_id)
 
-        try:
-            token_features = TokenFeatureExtractor.extract_unique_attribute_count(
-                token=token, collection=collection
-            )
-
-            harmonic_dict[token_id] = TokenRarity(
-                token=token,
-                token_features=token_features,
-                score=harmonic_handler.score_token(collection=collection, token=token),
-            )
-            arthimetic_dict[token_id] = TokenRarity(
-                token=token,
-                token_features=token_features,
-                score=arithmetic_handler.score_token(
-                    collection=collection, token=token
-                ),
-            )
-            geometric_dict[token_id] = TokenRarity(
-                token=token,
-                token_features=token_features,
-                score=geometric_handler.score_token(collection=collection, token=token),
-            )
-            sum_dict[token_id] = TokenRarity(
-                token=token,
-                token_features=token_features,
-                score=sum_handler.score_token(collection=collection, token=token),
-            )
-            ic_dict[token_id] = TokenRarity(
+        token_features = TokenFeatureExtractor.extract_unique_attribute_count(
+            token=token, collection=collection
+        )
+        for metric, metric_dict in metric_dicts.items():
+            metric_dict[token_id] = TokenRarity(
                 token=token,
                 token_features=token_features,
-                score=ic_handler.score_token(collection=collection, token=token),
+                score=token_scores[metric],
             )
 
-        except Exception:
-            logger.exception(f"Can't score token {token} with OpenRarity")
-
     # Calculate ranks of all assets given the scores
     arthimetic_ranked_tokens = extract_rank(arthimetic_dict)
     geometric_ranked_tokens = extract_rank(geometric_dict)
@@ -477,6 +447,39 @@ def resolve_open_rarity_score(
     )
 
 
+def _iter_token_metric_scores(
+    collection: Collection, tokens: list[Token]
+) -> Iterator[tuple[Token, dict[str, float]]]:
+    """Yields every token that can be scored with the scores of all metrics.
+
+    Scores of all metrics share the attribute scores of the tokens, so tokens are
+    scored in a single batch. If the batch fails, tokens are scored one by one,
+    so that a token that cannot be scored only loses its own scores.
+    """
+    try:
+        metric_scores = score_metrics(collection=collection, tokens=tokens)
+    except Exception:
+        logger.exception(
+            f"Can't score tokens of {collection} in a batch, scoring them one by one"
+        )
+    else:
+        for index, token in enumerate(tokens):
+            yield token, {
+                metric: float(scores[index]) for metric, scores in metric_scores.items()
+            }
+        return
+
+    for token in tokens:
+        try:
+            token_metric_scores = score_metrics(collection=collection, tokens=[token])
+        except Exception:
+            logger.exception(f"Can't score token {token} with OpenRarity")
+            continue
+        yield token, {
+            metric: float(scores[0]) for metric, scores in token_metric_scores.items()
+        }
+
+
 def _get_provider_rank(
     provider: RankProvider, token_with_rarity: TokenWithRarityData
 ) -> int | None:
@@ -3,7 +3,11 @@ import numpy as np
 from open_rarity.models.collection import Collection, CollectionAttribute
 from open_rarity.models.token import Token
 from open_rarity.models.token_metadata import AttributeName
-from open_rarity.scoring.utils import get_token_attributes_scores_and_weights
+from open_rarity.scoring.utils import (
+    get_attribute_weights,
+    get_token_attributes_scores_and_weights,
+    get_token_attributes_scores_matrix,
+)
 
 
 class HarmonicMeanScoringHandler:
@@ -28,7 +32,15 @@ class HarmonicMeanScoringHandler:
         tokens: list[Token],
     ) -> list[float]:
         # Memoize for performance
-        collection_null_attributes = collection.extract_null_attributes()
+        collection_null_attributes = collection.statistics.null_attributes
+        scores_matrix = get_token_attributes_scores_matrix(
+            collection=collection,
+            tokens=tokens,
+            collection_null_attributes=collection_null_attributes,
+        )
+        if scores_matrix is not None:
+            return self.score_tokens_from_matrix(collection, *scores_matrix).tolist()
+
         return [
             self._score_token(
                 collection, t, self.normalized, collection_null_attributes
@@ -36,6 +48,36 @@ class HarmonicMeanScoringHandler:
             for t in tokens
         ]
 
+    def score_tokens_from_matrix(
+        self,
+        collection: Collection,
+        attr_scores: np.ndarray,
+        attr_cardinalities: np.ndarray,
+    ) -> np.ndarray:
+        """Scores tokens by taking the harmonic mean of every row of attribute
+        scores in a single reduction. Results equal those of score_token up to
+        floating point rounding, e.g. compare them with np.isclose.
+
+        Parameters
+        ----------
+        collection : Collection
+            The collection to score from
+        attr_scores : np.ndarray
+            Attribute scores of every token, see get_token_attributes_scores_matrix.
+        attr_cardinalities : np.ndarray
+            Number of possible values of every attribute name, see
+            get_token_attributes_scores_matrix.
+
+        Returns
+        -------
+        np.ndarray
+            The score of every token
+        """
+        attr_weights = get_attribute_weights(attr_cardinalities, self.normalized)
+        return (
+            np.average(np.reciprocal(attr_scores), axis=1, weights=attr_weights) ** -1
+        )
+
     # Private methods
     def _score_token(
         self,
@@ -58,7 +100,7 @@ class HarmonicMeanScoringHandler:
             Set to true to enable individual trait normalizations based on
             total number of possible values for an attribute name, by default True.
         collection_null_attributes : dict[AttributeName, CollectionAttribute], optional
-            Optional memoization of collection.extract_null_attributes(),
+            Optional memoization of collection.statistics.null_attributes,
             by default None.
 
         Returns
@@ -5,7 +5,10 @@ import numpy as np
 from open_rarity.models.collection import Collection, CollectionAttribute
 from open_rarity.models.token import Token
 from open_rarity.models.token_metadata import AttributeName
-from open_rarity.scoring.utils import get_token_attributes_scores_and_weights
+from open_rarity.scoring.utils import (
+    get_token_attribute_codes,
+    get_token_attributes_scores_and_weights,
+)
 
 logger = logging.getLogger("open_rarity_logger")
 
@@ -64,26 +67,111 @@ class InformationContentScoringHandler:
 
         """
         # Precompute for performance
-        collection_null_attributes = collection.extract_null_attributes()
-        collection_attributes = collection.extract_collection_attributes()
-        collection_entropy = self._get_collection_entropy(
-            collection=collection,
-            collection_attributes=collection_attributes,
-            collection_null_attributes=collection_null_attributes,
+        collection_null_attributes = collection.statistics.null_attributes
+        collection_entropy_normalization = self.get_collection_entropy_normalization(
+            collection.statistics.entropy
+        )
+
+        ic_token_scores = self._get_ic_scores(
+            collection, tokens, collection_null_attributes=collection_null_attributes
         )
+        if ic_token_scores is not None:
+            return (ic_token_scores / collection_entropy_normalization).tolist()
+
         return [
             self._score_token(
                 collection=collection,
                 token=t,
                 collection_null_attributes=collection_null_attributes,
-                # covering the corner case when collection has one item.
-                collection_entropy_normalization=collection_entropy
-                if collection_entropy
-                else 1,
+                collection_entropy_normalization=collection_entropy_normalization,
             )
             for t in tokens
         ]
 
+    def score_tokens_from_matrix(
+        self,
+        collection: Collection,
+        attr_scores: np.ndarray,
+        attr_cardinalities: np.ndarray,
+    ) -> np.ndarray:
+        """Scores tokens from a matrix of their attribute scores in a single
+        reduction, with the same results as score_tokens.
+
+        Parameters
+        ----------
+        collection : Collection
+            The collection to score from, whose entropy normalizes the scores.
+        attr_scores : np.ndarray
+            Attribute scores of every token, see get_token_attributes_scores_matrix.
+        attr_cardinalities : np.ndarray
+            Number of possible values of every attribute name, see
+            get_token_attributes_scores_matrix. Information content does not
+            weigh attributes, so it is not used.
+
+        Returns
+        -------
+        np.ndarray
+            The score of every token
+        """
+        return -np.sum(
+            np.log2(np.reciprocal(attr_scores)), axis=1
+        ) / self.get_collection_entropy_normalization(collection.statistics.entropy)
+
+    def get_collection_entropy_normalization(self, collection_entropy: float) -> float:
+        """Returns the factor token information content scores are divided by,
+        which is the collection entropy, or 1 for collections without entropy."""
+        # covering the corner case when collection has one item.
+        return collection_entropy if collection_entropy else 1
+
+    def get_ic_tables(
+        self,
+        collection: Collection,
+        tokens: list[Token],
+        collection_null_attributes: dict[AttributeName, CollectionAttribute]
+        | None = None,
+    ) -> tuple[np.ndarray, np.ndarray] | None:
+        """Returns the attribute bucket indices of every token and the information
+        content of every bucket, from which token scores are computed with a single
+        gather and row-wise sum, see _get_ic_scores.
+
+        Parameters
+        ----------
+        collection : Collection
+            The collection to score from
+        tokens : list[Token]
+            a batch of tokens belonging to collection to be scored
+        collection_null_attributes : dict[AttributeName, CollectionAttribute], optional
+            Optional memoization of collection.statistics.null_attributes,
+            by default None.
+
+        Returns
+        -------
+        tuple[np.ndarray, np.ndarray] | None
+            (len(tokens), attribute names) matrix of bucket indices and the
+            information content of every bucket, or None if the tokens cannot be
+            encoded against the collection attributes.
+        """
+        encoded = get_token_attribute_codes(
+            collection=collection,
+            tokens=tokens,
+            collection_null_attributes=collection_null_attributes,
+        )
+        if encoded is None:
+            return None
+        table_indices, counts_table = encoded
+
+        return table_indices, self.get_information_table(collection, counts_table)
+
+    def get_information_table(
+        self, collection: Collection, counts_table: np.ndarray
+    ) -> np.ndarray:
+        """Returns the information content of every attribute bucket of the counts
+        table of get_token_attribute_codes."""
+        # Null buckets of attributes every token has are empty and never indexed
+        with np.errstate(divide="ignore"):
+            attr_scores = collection.token_total_supply / counts_table
+            return np.log2(np.reciprocal(attr_scores))
+
     # Private methods
     def _score_token(
         self,
@@ -103,7 +191,7 @@ class InformationContentScoringHandler:
         token : Token
             The token to score
         collection_null_attributes : dict[AttributeName, CollectionAttribute], optional
-            Optional memoization of collection.extract_null_attributes(),
+            Optional memoization of collection.statistics.null_attributes,
             by default None.
         collection_entropy_normalization : float, optional
             Optional memoization of the collection entropy normalization factor,
@@ -124,11 +212,7 @@ class InformationContentScoringHandler:
         # Now, calculate the collection entropy to use as a normalization for
         # the token score if its not provided
         if collection_entropy_normalization is None:
-            collection_entropy = self._get_collection_entropy(
-                collection=collection,
-                collection_attributes=collection.extract_collection_attributes(),
-                collection_null_attributes=collection_null_attributes,
-            )
+            collection_entropy = collection.statistics.entropy
         else:
             collection_entropy = collection_entropy_normalization
         normalized_token_score = ic_token_score / collection_entropy
@@ -162,6 +246,35 @@ class InformationContentScoringHandler:
         # the sum of the logarithms of the attributes' scores.
         return -np.sum(np.log2(np.reciprocal(attr_scores)))
 
+    def _get_ic_scores(
+        self,
+        collection: Collection,
+        tokens: list[Token],
+        collection_null_attributes: dict[AttributeName, CollectionAttribute]
+        | None = None,
+    ) -> np.ndarray | None:
+        """Vectorized equivalent of _get_ic_score for a batch of tokens.
+
+        Tokens are encoded into a matrix of attribute bucket indices, and the
+        information content of every bucket is computed once. Each token score is
+        then a single gather and row-wise sum, summing the attributes in the same
+        order as _get_ic_score so that scores are identical.
+
+        Returns
+        -------
+        np.ndarray | None
+            Information content score of every token, in order of `tokens`, or None
+            if the tokens cannot be encoded against the collection attributes.
+        """
+        ic_tables = self.get_ic_tables(
+            collection, tokens, collection_null_attributes=collection_null_attributes
+        )
+        if ic_tables is None:
+            return None
+        table_indices, information_table = ic_tables
+
+        return -np.sum(information_table[table_indices], axis=1)
+
     def _get_collection_entropy(
         self,
         collection: Collection,
@@ -177,11 +290,11 @@ class InformationContentScoringHandler:
         collection : Collection
             The collection to calculate probability on
         collection_attributes : dict[AttributeName, list[CollectionAttribute]], optional
-            Optional memoization of collection.extract_collection_attributes(),
-            by default None.
+            Attributes to compute the entropy of instead of
+            collection.statistics.collection_attributes, by default None.
         collection_null_attributes : dict[AttributeName, CollectionAttribute], optional
-            Optional memoization of collection.extract_null_attributes(),
-            by default None.
+            Null attributes to compute the entropy of instead of
+            collection.statistics.null_attributes, by default None.
 
         Returns
         -------
@@ -192,11 +305,14 @@ class InformationContentScoringHandler:
         -----------
             Does not take into account non-String attributes during scoring.
         """
+        if collection_attributes is None and collection_null_attributes is None:
+            return collection.statistics.entropy
+
         attributes: dict[str, list[CollectionAttribute]] = (
-            collection_attributes or collection.extract_collection_attributes()
+            collection_attributes or collection.statistics.collection_attributes
         )
         null_attributes: dict[str, CollectionAttribute] = (
-            collection_null_attributes or collection.extract_null_attributes()
+            collection_null_attributes or collection.statistics.null_attributes
         )
 
         # Create a list of all probabilities for every attribute name/value pair,
@@ -204,8 +320,7 @@ class InformationContentScoringHandler:
         collection_probabilities: list[float] = []
         for attr_name, attr_values in attributes.items():
             if attr_name in null_attributes:
-                null_attr = null_attributes[attr_name]
-                attr_values.append(null_attr)
+                attr_values = attr_values + [null_attributes[attr_name]]
 
             # Create an array of the probability of all possible attr_name/value combos
             # existing in the collection
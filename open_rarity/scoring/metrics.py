@@ -0,0 +1,108 @@
+import numpy as np
+
+from open_rarity.models.collection import Collection
+from open_rarity.models.token import Token
+from open_rarity.scoring.handlers.arithmetic_mean_scoring_handler import (
+    ArithmeticMeanScoringHandler,
+)
+from open_rarity.scoring.handlers.geometric_mean_scoring_handler import (
+    GeometricMeanScoringHandler,
+)
+from open_rarity.scoring.handlers.harmonic_mean_scoring_handler import (
+    HarmonicMeanScoringHandler,
+)
+from open_rarity.scoring.handlers.information_content_scoring_handler import (
+    InformationContentScoringHandler,
+)
+from open_rarity.scoring.handlers.sum_scoring_handler import SumScoringHandler
+from open_rarity.scoring.utils import get_token_attributes_scores_matrix
+
+INFORMATION_CONTENT_METRIC = "information_content"
+ARITHMETIC_METRIC = "arithmetic"
+GEOMETRIC_METRIC = "geometric"
+HARMONIC_METRIC = "harmonic"
+SUM_METRIC = "sum"
+
+MetricScoringHandler = (
+    InformationContentScoringHandler
+    | ArithmeticMeanScoringHandler
+    | GeometricMeanScoringHandler
+    | HarmonicMeanScoringHandler
+    | SumScoringHandler
+)
+
+# Scoring metrics by name, with the handler that scores tokens with the metric
+METRIC_HANDLERS: dict[str, type[MetricScoringHandler]] = {
+    INFORMATION_CONTENT_METRIC: InformationContentScoringHandler,
+    ARITHMETIC_METRIC: ArithmeticMeanScoringHandler,
+    GEOMETRIC_METRIC: GeometricMeanScoringHandler,
+    HARMONIC_METRIC: HarmonicMeanScoringHandler,
+    SUM_METRIC: SumScoringHandler,
+}
+
+
+def score_metrics(
+    collection: Collection,
+    tokens: list[Token],
+    metrics: list[str] | None = None,
+) -> dict[str, np.ndarray]:
+    """Scores tokens with several scoring metrics at once.
+
+    The attribute scores of all tokens are computed once into a matrix (see
+    get_token_attributes_scores_matrix), which every metric reduces to token
+    scores with a single NumPy operation. Scores are identical to the scores of
+    the metric's handler, with the mean and sum handlers normalized.
+
+    Parameters
+    ----------
+    collection : Collection
+        The collection to score from
+    tokens : list[Token]
+        a batch of tokens belonging to collection to be scored
+    metrics : list[str], optional
+        Names of the metrics to score tokens with, see METRIC_HANDLERS,
+        by default all metrics.
+
+    Returns
+    -------
+    dict[str, np.ndarray]
+        scores of the tokens in order of `tokens`, by metric name in order of
+        `metrics`
+
+    Raises
+    ------
+    ValueError
+        If a metric name is unknown.
+    """
+    if metrics is None:
+        metrics = list(METRIC_HANDLERS)
+    unknown_metrics = [metric for metric in metrics if metric not in METRIC_HANDLERS]
+    if unknown_metrics:
+        raise ValueError(
+            f"Unknown scoring metrics {unknown_metrics}. "
+            f"Supported metrics: {list(METRIC_HANDLERS)}"
+        )
+
+    handlers = {metric: METRIC_HANDLERS[metric]() for metric in metrics}
+    collection_null_attributes = collection.statistics.null_attributes
+    scores_matrix = get_token_attributes_scores_matrix(
+        collection=collection,
+        tokens=tokens,
+        collection_null_attributes=collection_null_attributes,
+    )
+    if scores_matrix is None:
+        return {
+            metric: np.array(
+                handler.score_tokens(collection=collection, tokens=tokens),
+                dtype=np.float64,
+            )
+            for metric, handler in handlers.items()
+        }
+
+    attr_scores, attr_cardinalities = scores_matrix
+    scores: dict[str, np.ndarray] = {}
+    for metric, handler in handlers.items():
+        scores[metric] = handler.score_tokens_from_matrix(
+            collection, attr_scores, attr_cardinalities
+        )
+    return scores
@@ -0,0 +1,269 @@
+from concurrent.futures import Executor, wait
+from dataclasses import dataclass
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from open_rarity.models.attribute_vocabulary import NULL_ATTRIBUTE_CODE
+from open_rarity.models.collection import Collection
+from open_rarity.models.token import Token
+from open_rarity.models.token_identifier import EVMContractTokenIdentifier
+from open_rarity.models.token_metadata import (
+    AttributeName,
+    AttributeValue,
+    StringAttribute,
+    TokenMetadata,
+)
+from open_rarity.models.token_standard import TokenStandard
+from open_rarity.scoring.handlers.information_content_scoring_handler import (
+    InformationContentScoringHandler,
+)
+from open_rarity.scoring.scoring_handler import ScoringHandler
+from open_rarity.scoring.utils import (
+    get_attribute_counts_table,
+    get_attribute_table_indices,
+)
+
+
+@dataclass
+class CompactCollection:
+    """Class represents the string attributes of a collection in a compact form,
+    e.g. to send a collection to another process for scoring without pickling
+    every Token object.
+
+    Only the data needed to score the collection is kept, so the collection
+    must be validated for scoring before it is made compact.
+
+    Attributes
+    ----------
+    name : str
+        name of the collection
+    attribute_names : list[AttributeName]
+        collection.vocabulary.names
+    attribute_values : list[list[AttributeValue]]
+        collection.vocabulary.values
+    attribute_codes : np.ndarray
+        collection.attribute_codes
+    """
+
+    name: str
+    attribute_names: list[AttributeName]
+    attribute_values: list[list[AttributeValue]]
+    attribute_codes: np.ndarray
+
+    @classmethod
+    def from_collection(cls, collection: Collection) -> "CompactCollection":
+        vocabulary = collection.vocabulary
+        return cls(
+            name=collection.name,
+            attribute_names=vocabulary.names,
+            attribute_values=vocabulary.values,
+            attribute_codes=collection.attribute_codes,
+        )
+
+    def to_collection(self) -> Collection:
+        """Rebuilds a collection with tokens that have the same string attributes
+        as the original collection's tokens, in the same order.
+
+        Token identifiers are not kept, so tokens are identified by their index.
+        Attributes are added to tokens in order of attribute name ids, which
+        interns the attributes in the same order as the original collection,
+        so that scores are identical.
+        """
+        tokens = []
+        for token_id, token_codes in enumerate(self.attribute_codes.tolist()):
+            string_attributes = {
+                self.attribute_names[name_id]: StringAttribute(
+                    name=self.attribute_names[name_id],
+                    value=self.attribute_values[name_id][value_id],
+                )
+                for name_id, value_id in enumerate(token_codes)
+                if value_id != NULL_ATTRIBUTE_CODE
+            }
+            tokens.append(
+                Token(
+                    token_identifier=EVMContractTokenIdentifier(
+                        contract_address=self.name, token_id=token_id
+                    ),
+                    token_standard=TokenStandard.ERC721,
+                    metadata=TokenMetadata(string_attributes=string_attributes),
+                )
+            )
+
+        return Collection(tokens=tokens, name=self.name)
+
+
+@dataclass
+class SharedArray:
+    """Class describes a numpy array in shared memory, so that worker processes
+    can attach to the array by name instead of receiving a copy of it.
+
+    Attributes
+    ----------
+    name : str
+        name of the shared memory block
+    shape : tuple[int, ...]
+        shape of the array
+    dtype : str
+        numpy dtype string of the array
+    """
+
+    name: str
+    shape: tuple[int, ...]
+    dtype: str
+
+    @classmethod
+    def create(cls, array: np.ndarray) -> tuple["SharedArray", SharedMemory]:
+        """Copies array into a new shared memory block. The caller owns the
+        returned shared memory block and must close and unlink it."""
+        shared_memory = SharedMemory(create=True, size=max(array.nbytes, 1))
+        np.ndarray(array.shape, dtype=array.dtype, buffer=shared_memory.buf)[
+            ...
+        ] = array
+        return cls(shared_memory.name, array.shape, array.dtype.str), shared_memory
+
+    def attach(self) -> tuple[np.ndarray, SharedMemory]:
+        """Returns a view of the shared array and its shared memory block, which
+        must be closed once the view is no longer used."""
+        shared_memory = SharedMemory(name=self.name)
+        array = np.ndarray(self.shape, dtype=self.dtype, buffer=shared_memory.buf)
+        return array, shared_memory
+
+
+def score_compact_collection(
+    handler: ScoringHandler, compact_collection: CompactCollection
+) -> list[float]:
+    """Scores all tokens of a compact collection, in order of the original
+    collection's tokens. Used by Scorer to score collections in worker processes.
+    """
+    collection = compact_collection.to_collection()
+    return handler.score_tokens(collection=collection, tokens=collection.tokens)
+
+
+def score_collection_sharded(
+    handler: InformationContentScoringHandler,
+    collection: Collection,
+    executor: Executor,
+    chunk_size: int,
+) -> list[float] | None:
+    """Scores collection.tokens with the information content handler in chunks of
+    at most chunk_size tokens, each scored by a worker of executor.
+
+    Workers score rows of collection.attribute_codes, so that tokens are neither
+    encoded in this process nor sent to the workers. The attribute codes and the
+    information content of every attribute bucket, which is computed once from
+    the collection statistics, are shared with the workers in shared memory.
+    Workers map their rows to attribute buckets and write the scores of their
+    chunk into a shared scores array. Scores are identical to
+    handler.score_tokens.
+
+    Returns
+    -------
+    list[float] | None
+        list of scores in order of collection.tokens, or None if the tokens cannot
+        be expressed in terms of the collection attribute buckets.
+    """
+    name_ids, offsets, counts_table = get_attribute_counts_table(collection)
+    information_table = handler.get_information_table(collection, counts_table)
+    total_supply = collection.token_total_supply
+
+    shared_memories: list[SharedMemory] = []
+    try:
+        shared_arrays = []
+        for array in [
+            collection.attribute_codes,
+            information_table,
+            counts_table,
+            np.zeros(total_supply),
+        ]:
+            shared_array, shared_memory = SharedArray.create(array)
+            shared_arrays.append(shared_array)
+            shared_memories.append(shared_memory)
+
+        (
+            shared_attribute_codes,
+            shared_information_table,
+            shared_counts_table,
+            shared_scores,
+        ) = shared_arrays
+        futures = [
+            executor.submit(
+                _score_ic_chunk,
+                attribute_codes=shared_attribute_codes,
+                information_table=shared_information_table,
+                counts_table=shared_counts_table,
+                scores=shared_scores,
+                name_ids=name_ids,
+                offsets=offsets,
+                start=start,
+                end=start + chunk_size,
+            )
+            for start in range(0, total_supply, chunk_size)
+        ]
+        wait(futures)
+        if not all([future.result() for future in futures]):
+            return None
+
+        ic_token_scores = np.ndarray(
+            (total_supply,), dtype=np.float64, buffer=shared_memories[-1].buf
+        ).copy()
+    finally:
+        for shared_memory in shared_memories:
+            shared_memory.close()
+            shared_memory.unlink()
+
+    return (
+        ic_token_scores
+        / handler.get_collection_entropy_normalization(collection.statistics.entropy)
+    ).tolist()
+
+
+def _score_ic_chunk(
+    attribute_codes: SharedArray,
+    information_table: SharedArray,
+    counts_table: SharedArray,
+    scores: SharedArray,
+    name_ids: np.ndarray,
+    offsets: np.ndarray,
+    start: int,
+    end: int,
+) -> bool:
+    """Worker of score_collection_sharded, which scores the tokens of rows start
+    to end of the attribute codes. Returns False if a token has an attribute
+    bucket that no token in the collection has."""
+    shared_memories: list[SharedMemory] = []
+    try:
+        arrays = []
+        for shared_array in [attribute_codes, information_table, counts_table, scores]:
+            array, shared_memory = shared_array.attach()
+            arrays.append(array)
+            shared_memories.append(shared_memory)
+
+        (
+            attribute_codes_array,
+            information_table_array,
+            counts_table_array,
+            scores_array,
+        ) = arrays
+        table_indices = get_attribute_table_indices(
+            attribute_codes=attribute_codes_array[start:end],
+            name_ids=name_ids,
+            offsets=offsets,
+            counts_table=counts_table_array,
+        )
+        if table_indices is not None:
+            scores_array[start:end] = -np.sum(
+                information_table_array[table_indices], axis=1
+            )
+        # Views must be released before their shared memory can be closed
+        del (
+            arrays,
+            attribute_codes_array,
+            information_table_array,
+            counts_table_array,
+            scores_array,
+        )
+        return table_indices is not None
+    finally:
+        for shared_memory in shared_memories:
+            shared_memory.close()
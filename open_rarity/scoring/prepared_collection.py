@@ -0,0 +1,130 @@
+import numpy as np
+
+from open_rarity.models.collection import Collection, CollectionStatistics
+from open_rarity.models.token import Token
+from open_rarity.models.token_metadata import AttributeName, AttributeValue
+from open_rarity.scoring.handlers.information_content_scoring_handler import (
+    InformationContentScoringHandler,
+)
+from open_rarity.scoring.scoring_handler import ScoringHandler
+
+
+class PreparedCollection:
+    """Class represents a validated collection with everything needed to score
+    single tokens precomputed, for scoring tokens one at a time, e.g. per API
+    request. See Scorer.prepare.
+
+    For the information content handler, the information content of every
+    attribute name/value pair and null bucket is computed once, along with the
+    score of a token without attributes. A token is then scored by adjusting that
+    score for each of its attributes, so scoring takes time in the number of token
+    attributes instead of collection attributes. Tokens do not need to belong to
+    the collection, e.g. hypothetical tokens for what-if previews. Scores equal
+    handler.score_tokens up to floating point rounding.
+
+    Other handlers score tokens with handler.score_token.
+
+    The precomputed data is rebuilt on the next score after the collection is
+    modified with add_tokens, remove_tokens or update_token_metadata.
+
+    Parameters
+    ----------
+    collection : Collection
+        The collection to score tokens against, which is expected to be valid
+        for scoring, see Scorer.validate_collection.
+    handler : ScoringHandler
+        The handler to score tokens with.
+    """
+
+    def __init__(self, collection: Collection, handler: ScoringHandler):
+        self.collection = collection
+        self.handler = handler
+        self._statistics: CollectionStatistics | None = None
+        self._information: dict[AttributeName, dict[AttributeValue, float]] = {}
+        self._null_information: dict[AttributeName, float] = {}
+        self._empty_token_information = 0.0
+        self._normalization = 1.0
+        if isinstance(handler, InformationContentScoringHandler):
+            self._prepare()
+
+    def score_token(self, token: Token) -> float:
+        """Scores a token against the collection, which may be any token with
+        string attributes, not only a token of the collection.
+
+        Parameters
+        ----------
+        token : Token
+            The token to score
+
+        Returns
+        -------
+        float
+            The token score
+
+        Raises
+        ------
+        ValueError
+            If the token has an attribute name/value pair that no token in the
+            collection has, which has no probability to score it with.
+        """
+        if not isinstance(self.handler, InformationContentScoringHandler):
+            return self.handler.score_token(collection=self.collection, token=token)
+        if self._statistics is not self.collection.statistics:
+            self._prepare()
+
+        information = self._empty_token_information
+        # NOTE: We currently only support string attributes
+        for attribute in token.metadata.string_attributes.values():
+            value_information = self._information.get(attribute.name, {}).get(
+                attribute.value
+            )
+            if value_information is None:
+                raise ValueError(
+                    f"No token in the collection has attribute {attribute.name}="
+                    f"{attribute.value}"
+                )
+            # The token has the attribute instead of the null attribute
+            information += value_information - self._null_information.get(
+                attribute.name, 0.0
+            )
+
+        return information / self._normalization
+
+    def score_tokens(self, tokens: list[Token]) -> list[float]:
+        """Scores every token with score_token.
+
+        Returns
+        -------
+        list[float]
+            list of scores in order of `tokens`
+        """
+        return [self.score_token(token) for token in tokens]
+
+    # Private methods
+    def _prepare(self) -> None:
+        statistics = self.collection.statistics
+        total_supply = statistics.total_supply
+        assert isinstance(self.handler, InformationContentScoringHandler)
+
+        self._information = {
+            attr_name: dict(
+                zip(
+                    value_counts.keys(),
+                    (
+                        -np.log2(np.array(list(value_counts.values())) / total_supply)
+                    ).tolist(),
+                )
+            )
+            for attr_name, value_counts in (
+                self.collection.attributes_frequency_counts.items()
+            )
+        }
+        self._null_information = {
+            attr_name: float(-np.log2(null_attr.total_tokens / total_supply))
+            for attr_name, null_attr in statistics.null_attributes.items()
+        }
+        self._empty_token_information = sum(self._null_information.values())
+        self._normalization = self.handler.get_collection_entropy_normalization(
+            statistics.entropy
+        )
+        self._statistics = statistics
@@ -1,9 +1,20 @@
+from concurrent.futures import Executor, ProcessPoolExecutor
+
+import numpy as np
+
 from open_rarity.models.collection import Collection
 from open_rarity.models.token import Token
 from open_rarity.models.token_standard import TokenStandard
 from open_rarity.scoring.handlers.information_content_scoring_handler import (
     InformationContentScoringHandler,
 )
+from open_rarity.scoring.metrics import score_metrics
+from open_rarity.scoring.parallel import (
+    CompactCollection,
+    score_collection_sharded,
+    score_compact_collection,
+)
+from open_rarity.scoring.prepared_collection import PreparedCollection
 from open_rarity.scoring.scoring_handler import ScoringHandler
 
 
@@ -62,17 +73,62 @@ class Scorer:
         self.validate_collection(collection=collection)
         return self.handler.score_token(collection=collection, token=token)
 
-    def score_tokens(self, collection: Collection, tokens: list[Token]) -> list[float]:
+    def prepare(self, collection: Collection) -> PreparedCollection:
+        """Validates the collection once and precomputes everything needed to
+        score single tokens against it, for scoring many tokens one at a time,
+        e.g. per API request. Unlike score_token, scoring with the returned
+        PreparedCollection does not depend on the size of the collection.
+
+        Parameters
+        ----------
+        collection : Collection
+            The collection to score from
+
+        Returns
+        -------
+        PreparedCollection
+            Scores tokens against the collection with prepared.score_token(token),
+            including tokens that are not in the collection.
+        """
+        self.validate_collection(collection=collection)
+        return PreparedCollection(collection=collection, handler=self.handler)
+
+    def score_tokens(
+        self,
+        collection: Collection,
+        tokens: list[Token],
+        executor: Executor | None = None,
+        max_workers: int | None = None,
+        chunk_size: int = 100_000,
+    ) -> list[float]:
         """Used if you only want to score a batch of tokens that belong to collection.
         This will typically be more efficient than calling score_token for each
         token in `tokens`.
 
+        If executor or max_workers is provided and `tokens` are collection.tokens,
+        tokens are scored in chunks by parallel worker processes, which is only
+        worth it for very large collections. Workers score chunks of rows of
+        collection.attribute_codes, and collection statistics are computed once
+        and shared with the workers in shared memory, see
+        score_collection_sharded. Other tokens are scored sequentially, since
+        sending Token objects to workers costs more than scoring them. Only
+        supported by the information content handler, other handlers score
+        tokens sequentially.
+
         Parameters
         ----------
         collection : Collection
             The collection to score from
         tokens : list[Token]
             a batch of tokens belonging to collection to be scored
+        executor: Executor, optional
+            Executor to score token chunks with in parallel, e.g. a
+            ProcessPoolExecutor, by default None.
+        max_workers: int, optional
+            Number of worker processes to score token chunks with in parallel if
+            no executor is provided, by default None.
+        chunk_size: int, optional
+            Maximum number of tokens scored by a worker at once, by default 100,000.
 
         Returns
         -------
@@ -80,7 +136,32 @@ class Scorer:
             list of scores in order of `tokens`
         """
         self.validate_collection(collection=collection)
-        return self.handler.score_tokens(collection=collection, tokens=tokens)
+        if (
+            (executor is None and max_workers is None)
+            or not isinstance(self.handler, InformationContentScoringHandler)
+            or tokens is not collection.tokens
+            or not collection.has_tokens
+        ):
+            return self.handler.score_tokens(collection=collection, tokens=tokens)
+
+        if executor is None:
+            with ProcessPoolExecutor(max_workers=max_workers) as process_executor:
+                return self.score_tokens(
+                    collection,
+                    tokens,
+                    executor=process_executor,
+                    chunk_size=chunk_size,
+                )
+
+        scores = score_collection_sharded(
+            handler=self.handler,
+            collection=collection,
+            executor=executor,
+            chunk_size=chunk_size,
+        )
+        if scores is None:
+            return self.handler.score_tokens(collection=collection, tokens=tokens)
+        return scores
 
     def score_collection(self, collection: Collection) -> list[float]:
         """Scores all tokens on collection.tokens
@@ -94,30 +175,134 @@ class Scorer:
         -------
         list[float]
             list of scores in order of `collection.tokens`
+
+        Raises
+        ------
+        ValueError
+            If the collection cannot be scored, or if the tokens of the collection
+            were dropped (see Collection.from_token_stream).
         """
         self.validate_collection(collection=collection)
+        self._check_has_tokens(collection)
         return self.handler.score_tokens(
             collection=collection,
             tokens=collection.tokens,
         )
 
-    def score_collections(self, collections: list[Collection]) -> list[list[float]]:
+    def score_all_metrics(
+        self,
+        collection: Collection,
+        metrics: list[str] | None = None,
+        tokens: list[Token] | None = None,
+    ) -> dict[str, np.ndarray]:
+        """Scores tokens with several scoring metrics in one pass, e.g. to compare
+        OpenRarity scores with other scoring metrics. The attribute scores of the
+        tokens are computed once and shared by all metrics, see score_metrics.
+
+        Parameters
+        ----------
+        collection : Collection
+            The collection to score from
+        metrics : list[str], optional
+            Names of the metrics to score tokens with: "information_content"
+            (OpenRarity scores), "arithmetic", "geometric", "harmonic" and "sum",
+            by default all metrics.
+        tokens : list[Token], optional
+            a batch of tokens belonging to collection to be scored, by default
+            collection.tokens.
+
+        Returns
+        -------
+        dict[str, np.ndarray]
+            scores of the tokens in order of `tokens`, by metric name
+
+        Raises
+        ------
+        ValueError
+            If the collection cannot be scored or a metric name is unknown, or if
+            tokens are not given and the tokens of the collection were dropped.
+        """
+        self.validate_collection(collection=collection)
+        if tokens is None:
+            self._check_has_tokens(collection)
+        return score_metrics(
+            collection=collection,
+            tokens=collection.tokens if tokens is None else tokens,
+            metrics=metrics,
+        )
+
+    def score_collections(
+        self,
+        collections: list[Collection],
+        executor: Executor | None = None,
+        max_workers: int | None = None,
+    ) -> list[list[float]] | list[list[float] | Exception]:
         """Scores all tokens in every collection provided.
 
+        If executor or max_workers is provided, collections are scored in parallel
+        by worker processes. Collections are sent to the workers in a compact form
+        (see CompactCollection) instead of pickling all of their tokens, and an
+        error scoring one collection does not stop scoring the others.
+
         Parameters
         ----------
         collections: list[Collection])
             The collections to score
+        executor: Executor, optional
+            Executor to score collections with in parallel, e.g. a
+            ProcessPoolExecutor, by default None.
+        max_workers: int, optional
+            Number of worker processes to score collections with in parallel if
+            no executor is provided, by default None.
 
         Returns
         -------
-        list[list[float]]
+        list[list[float]] | list[list[float] | Exception]
             A list of scores for all tokens in each given Collection,
             ordered by the collection's `tokens` field.
+            When scoring in parallel, the list has the exception raised while
+            validating or scoring a collection in place of its scores.
         """
-        for collection in collections:
-            self.validate_collection(collection=collection)
-        return [
-            self.handler.score_tokens(collection=c, tokens=c.tokens)
-            for c in collections
-        ]
+        if executor is None and max_workers is None:
+            for collection in collections:
+                self.validate_collection(collection=collection)
+                self._check_has_tokens(collection)
+            return [
+                self.handler.score_tokens(collection=c, tokens=c.tokens)
+                for c in collections
+            ]
+
+        if executor is None:
+            with ProcessPoolExecutor(max_workers=max_workers) as process_executor:
+                return self.score_collections(collections, executor=process_executor)
+
+        results: list[list[float] | Exception] = []
+        futures = {}
+        for idx, collection in enumerate(collections):
+            try:
+                self.validate_collection(collection=collection)
+            except ValueError as e:
+                results.append(e)
+                continue
+            results.append([])
+            futures[idx] = executor.submit(
+                score_compact_collection,
+                self.handler,
+                CompactCollection.from_collection(collection),
+            )
+
+        for idx, future in futures.items():
+            try:
+                results[idx] = future.result()
+            except Exception as e:
+                results[idx] = e
+
+        return results
+
+    # Private methods
+    def _check_has_tokens(self, collection: Collection) -> None:
+        if not collection.has_tokens:
+            raise ValueError(
+                f"Tokens of {collection} were dropped, so collection.tokens cannot "
+                "be scored"
+            )
@@ -1,3 +1,5 @@
+import numpy as np
+
 from open_rarity.models import Token
 from open_rarity.models.collection import Collection
 from open_rarity.models.token_ranking_features import TokenRankingFeatures
@@ -38,3 +40,56 @@ class TokenFeatureExtractor:
                 unique_attributes_count += 1
 
         return TokenRankingFeatures(unique_attribute_count=unique_attributes_count)
+
+    @staticmethod
+    def extract_unique_attribute_counts(
+        tokens: list[Token], collection: Collection
+    ) -> np.ndarray:
+        """Batch equivalent of extract_unique_attribute_count, which extracts the
+        unique attributes count of all tokens at once.
+
+        Tokens are encoded into the collection attribute codes, and an attribute
+        is unique if the count of its attribute value id is one.
+
+        Parameters
+        ----------
+        tokens : list[Token]
+            The tokens to extract features from
+        collection : Collection
+            The collection with the attributes frequency counts to base the
+            token trait probabilities on to calculate score.
+
+        Returns
+        -------
+        np.ndarray
+            unique attributes count of every token, in order of `tokens`
+        """
+        try:
+            attribute_codes = collection.encode_tokens(tokens)
+        except ValueError:
+            # Tokens have attributes the collection does not have
+            return np.array(
+                [
+                    TokenFeatureExtractor.extract_unique_attribute_count(
+                        token=token, collection=collection
+                    ).unique_attribute_count
+                    for token in tokens
+                ],
+                dtype=np.int64,
+            )
+
+        vocabulary = collection.vocabulary
+        unique_attributes_counts = np.zeros(len(tokens), dtype=np.int64)
+        for name_id, attr_name in enumerate(vocabulary.names):
+            value_counts = collection.attributes_frequency_counts.get(attr_name, {})
+            # NULL_ATTRIBUTE_CODE (-1) indexes the trailing False
+            unique_values = np.array(
+                [
+                    value_counts.get(value, 0) == 1
+                    for value in vocabulary.values[name_id]
+                ]
+                + [False]
+            )
+            unique_attributes_counts += unique_values[attribute_codes[:, name_id]]
+
+        return unique_attributes_counts
@@ -1,3 +1,5 @@
+import numpy as np
+
 from open_rarity.models.collection import Collection, CollectionAttribute
 from open_rarity.models.token import Token
 from open_rarity.models.token_metadata import AttributeName
@@ -23,7 +25,8 @@ def get_token_attributes_scores_and_weights(
         Set to true to enable individual trait normalizations based on total
         number of possible values for an attribute, by default True.
     collection_null_attributes : dict[ AttributeName, CollectionAttribute ], optional
-        Optional memoization of collection.extract_null_attributes(), by default None.
+        Optional memoization of collection.statistics.null_attributes, by default
+        None.
 
     Returns
     -------
@@ -39,7 +42,7 @@ def get_token_attributes_scores_and_weights(
     # it uses the value's probability, and if it doesn't have the attribute,
     # uses the probability of that attribute being null.
     if collection_null_attributes is None:
-        null_attributes = collection.extract_null_attributes()
+        null_attributes = collection.statistics.null_attributes
     else:
         null_attributes = collection_null_attributes
 
@@ -81,3 +84,203 @@ def _convert_to_collection_attributes_dict(collection, token):
         )
         for attribute in token.metadata.string_attributes.values()
     }
+
+
+def get_token_attribute_codes(
+    collection: Collection,
+    tokens: list[Token],
+    collection_null_attributes: dict[AttributeName, CollectionAttribute] | None = None,
+) -> tuple[np.ndarray, np.ndarray] | None:
+    """Encodes tokens into a dense matrix of attribute bucket indices so that
+    attribute lookups for a whole batch of tokens can be done with array indexing.
+
+    Columns are the collection attribute names in sorted order, matching the
+    attribute order used by get_token_attributes_scores_and_weights. Every column
+    owns a contiguous slice of the returned count table: the first slot of the
+    slice is the null bucket (tokens without the attribute) and the following slots
+    are the attribute values in order of their id in collection.vocabulary.
+
+    Parameters
+    ----------
+    collection : Collection
+        The collection to encode the tokens against.
+    tokens : list[Token]
+        The tokens to encode. If these are the collection tokens, the collection
+        attribute codes are used as is.
+    collection_null_attributes : dict[ AttributeName, CollectionAttribute ], optional
+        Optional memoization of collection.statistics.null_attributes, by default
+        None.
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray] | None
+        A tuple of (table indices, counts table).
+        table indices: (len(tokens), number of attribute names) matrix of indices
+            into the counts table, one per token and attribute name.
+        counts table: number of tokens in the collection for every attribute
+            name/value pair and null bucket.
+        Returns None if a token cannot be expressed in terms of the collection
+        attribute buckets, e.g. it has an attribute value that no token in the
+        collection has, or it misses an attribute that every token in the
+        collection has.
+    """
+    try:
+        attribute_codes = collection.encode_tokens(tokens)
+    except ValueError:
+        return None
+
+    name_ids, offsets, counts_table = get_attribute_counts_table(
+        collection=collection, collection_null_attributes=collection_null_attributes
+    )
+    table_indices = get_attribute_table_indices(
+        attribute_codes=attribute_codes,
+        name_ids=name_ids,
+        offsets=offsets,
+        counts_table=counts_table,
+    )
+    if table_indices is None:
+        return None
+
+    return table_indices, counts_table
+
+
+def get_attribute_counts_table(
+    collection: Collection,
+    collection_null_attributes: dict[AttributeName, CollectionAttribute] | None = None,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Returns the counts table of get_token_attribute_codes, along with the
+    attribute name ids of its columns and the offset of every column's slice of
+    the table, which map attribute codes to table indices, see
+    get_attribute_table_indices.
+
+    Parameters
+    ----------
+    collection : Collection
+        The collection to count attributes of.
+    collection_null_attributes : dict[ AttributeName, CollectionAttribute ], optional
+        Optional memoization of collection.statistics.null_attributes, by default
+        None.
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray, np.ndarray]
+        A tuple of (name ids, offsets, counts table).
+    """
+    if collection_null_attributes is None:
+        null_attributes = collection.statistics.null_attributes
+    else:
+        null_attributes = collection_null_attributes
+
+    vocabulary = collection.vocabulary
+    attr_names = sorted(collection.attributes_frequency_counts.keys())
+    name_ids: list[int] = []
+    counts: list[int] = []
+    offsets: list[int] = []
+    for attr_name in attr_names:
+        name_id = vocabulary.name_id(attr_name)
+        assert name_id is not None
+        attr_values = collection.attributes_frequency_counts[attr_name]
+        null_attr = null_attributes.get(attr_name)
+        name_ids.append(name_id)
+        offsets.append(len(counts))
+        counts.append(null_attr.total_tokens if null_attr else 0)
+        counts.extend(
+            attr_values.get(attr_value, 0) for attr_value in vocabulary.values[name_id]
+        )
+
+    return (
+        np.array(name_ids, dtype=np.int64),
+        np.array(offsets, dtype=np.int64),
+        np.array(counts, dtype=np.int64),
+    )
+
+
+def get_attribute_table_indices(
+    attribute_codes: np.ndarray,
+    name_ids: np.ndarray,
+    offsets: np.ndarray,
+    counts_table: np.ndarray,
+) -> np.ndarray | None:
+    """Maps attribute codes (see Collection.attribute_codes) to the table indices
+    of get_token_attribute_codes, with the name ids, offsets and counts table of
+    get_attribute_counts_table.
+
+    Returns
+    -------
+    np.ndarray | None
+        (len(attribute_codes), len(name_ids)) matrix of table indices, or None if
+        a token has an attribute bucket that no token in the collection has.
+    """
+    # Keep a row-major layout so that row-wise reductions over gathered values
+    # sum every token's attributes in the same order as a single token's array.
+    table_indices = np.ascontiguousarray(attribute_codes[:, name_ids] + (offsets + 1))
+    if np.any(counts_table[table_indices] == 0):
+        return None
+
+    return table_indices
+
+
+def get_token_attributes_scores_matrix(
+    collection: Collection,
+    tokens: list[Token],
+    collection_null_attributes: dict[AttributeName, CollectionAttribute] | None = None,
+) -> tuple[np.ndarray, np.ndarray] | None:
+    """Vectorized equivalent of get_token_attributes_scores_and_weights for a batch
+    of tokens, which scoring handlers reduce to token scores in a single NumPy
+    operation, see e.g. ArithmeticMeanScoringHandler.score_tokens_from_matrix.
+
+    Parameters
+    ----------
+    collection : Collection
+        The collection to calculate probability on.
+    tokens : list[Token]
+        The tokens to score.
+    collection_null_attributes : dict[ AttributeName, CollectionAttribute ], optional
+        Optional memoization of collection.statistics.null_attributes, by default
+        None.
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray] | None
+        A tuple of attribute scores and attribute cardinalities.
+        attribute scores: (len(tokens), number of attribute names) matrix of the
+            attribute scores of every token, with a column for every collection
+            attribute name in sorted order, same as
+            get_token_attributes_scores_and_weights.
+        attribute cardinalities: number of possible values of every attribute
+            name, in column order, see get_attribute_weights.
+        Returns None if the tokens cannot be encoded against the collection
+        attributes, see get_token_attribute_codes.
+    """
+    encoded = get_token_attribute_codes(
+        collection=collection,
+        tokens=tokens,
+        collection_null_attributes=collection_null_attributes,
+    )
+    if encoded is None:
+        return None
+    table_indices, counts_table = encoded
+
+    attr_cardinalities = np.array(
+        [
+            collection.total_attribute_values(attr_name)
+            for attr_name in sorted(collection.attributes_frequency_counts.keys())
+        ],
+        dtype=np.int64,
+    )
+    # Null buckets of attributes every token has are empty and never indexed
+    with np.errstate(divide="ignore"):
+        scores_table = collection.token_total_supply / counts_table
+
+    return scores_table[table_indices], attr_cardinalities
+
+
+def get_attribute_weights(
+    attr_cardinalities: np.ndarray, normalized: bool
+) -> np.ndarray:
+    """Returns the weights of attribute scores with the given cardinalities, same
+    as get_token_attributes_scores_and_weights: the inverse cardinality if
+    normalized, and 1 otherwise."""
+    if normalized:
+        return 1 / attr_cardinalities
+    return np.ones(len(attr_cardinalities))
@@ -0,0 +1,101 @@
+import argparse
+import gc
+import resource
+import sys
+import time
+import tracemalloc
+
+from open_rarity import Collection, RarityRanker, Token, TokenMetadata, TokenRarity
+from open_rarity.models.token_ranking_features import TokenRankingFeatures
+
+parser = argparse.ArgumentParser()
+parser.add_argument(
+    "--tokens",
+    dest="token_count",
+    type=int,
+    default=100_000,
+    help="Number of tokens in the generated collection",
+)
+parser.add_argument(
+    "--attributes",
+    dest="attribute_count",
+    type=int,
+    default=8,
+    help="Number of string attributes of every token",
+)
+parser.add_argument(
+    "--values",
+    dest="values_per_attribute",
+    type=int,
+    default=20,
+    help="Number of possible values of every attribute",
+)
+
+
+def generate_tokens(
+    token_count: int, attribute_count: int, values_per_attribute: int
+) -> list[Token]:
+    return [
+        Token.from_erc721(
+            contract_address="0xa3049...",
+            token_id=token_id,
+            metadata_dict={
+                f"trait {attr_idx}": (
+                    f"value {(token_id * (attr_idx + 7)) % values_per_attribute}"
+                )
+                for attr_idx in range(attribute_count)
+            },
+        )
+        for token_id in range(token_count)
+    ]
+
+
+def get_peak_rss_mib() -> float:
+    # ru_maxrss is in KiB on Linux and in bytes on macOS
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def count_objects(types: tuple[type, ...]) -> int:
+    return sum(isinstance(obj, types) for obj in gc.get_objects())
+
+
+if __name__ == "__main__":
+    """Measures the memory of creating, scoring and ranking a generated collection,
+    to compare the memory footprint of the token models across versions.
+
+    Tracing allocations slows the run down. Peak RSS includes the tracing
+    overhead, so run with --tokens 0 to get the baseline of the interpreter.
+
+    Command:
+        `python -m scripts.benchmark_token_memory --tokens 100000`
+    """
+    args = parser.parse_args()
+    gc.collect()
+    tracemalloc.start()
+    start_time = time.time()
+
+    tokens = generate_tokens(
+        args.token_count, args.attribute_count, args.values_per_attribute
+    )
+    tokens_size, _ = tracemalloc.get_traced_memory()
+    tokens_blocks = sum(
+        stat.count for stat in tracemalloc.take_snapshot().statistics("filename")
+    )
+
+    collection = Collection(tokens=tokens, name="benchmark")
+    token_rarities = RarityRanker.rank_collection(collection=collection)
+    ranked_size, peak_size = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    elapsed = time.time() - start_time
+
+    model_count = count_objects(
+        (Token, TokenMetadata, TokenRarity, TokenRankingFeatures)
+    )
+    print(f"Tokens: {args.token_count} with {args.attribute_count} attributes")
+    print(f"Model objects alive: {model_count}")
+    print(f"Tokens: {tokens_size / 2**20:.1f} MiB in {tokens_blocks} blocks")
+    print(f"Tokens and ranks: {ranked_size / 2**20:.1f} MiB")
+    print(f"Peak traced memory: {peak_size / 2**20:.1f} MiB")
+    print(f"Peak RSS: {get_peak_rss_mib():.1f} MiB")
+    print(f"Elapsed: {elapsed:.1f}s")
@@ -3,7 +3,6 @@ import csv
 import json
 
 from open_rarity import RarityRanker
-from open_rarity.models.token_rarity import TokenRarity
 from open_rarity.resolver.opensea_api_helpers import get_collection_from_opensea
 
 parser = argparse.ArgumentParser()
@@ -48,18 +47,17 @@ def score_collection_and_output_results(
     print(f"Created collection {slug} with {collection.token_total_supply} tokens")
 
     # Score, rank  and sort ascending by token rarity rank
-    sorted_token_rarities: list[TokenRarity] = RarityRanker.rank_collection(
-        collection=collection
-    )
+    ranking = RarityRanker.rank_collection_result(collection=collection)
 
     # Print out ranks and scores
     print("Token ID and their ranks and scores, sorted by rank")
     json_output = {}
     csv_rows = []
-    for rarity_token in sorted_token_rarities:
-        token_id = rarity_token.token.token_identifier.token_id
-        rank = rarity_token.rank
-        score = rarity_token.score
+    tokens = collection.tokens
+    for token_index, rank, score in zip(
+        ranking.token_indices.tolist(), ranking.ranks.tolist(), ranking.scores.tolist()
+    ):
+        token_id = tokens[token_index].token_identifier.token_id
         json_output[token_id] = {"rank": rank, "score": score}
         csv_rows.append([token_id, rank, score])
 
@@ -1,3 +1,7 @@
+import numpy as np
+import pytest
+
+from open_rarity.models.attribute_vocabulary import NULL_ATTRIBUTE_CODE
 from open_rarity.models.collection import (
     TRAIT_COUNT_ATTRIBUTE_NAME,
     Collection,
@@ -10,6 +14,7 @@ from tests.helpers import (
     create_evm_token,
     create_numeric_evm_token,
     create_string_evm_token,
+    generate_collection_with_token_traits,
     generate_mixed_collection,
 )
 
@@ -149,6 +154,94 @@ class TestCollection:
             ]
         }
 
+    def test_statistics(self):
+        collection = Collection(tokens=self.tokens_with_attributes[0:81])
+        statistics = collection.statistics
+
+        assert statistics.total_supply == 81
+        assert statistics.null_attributes == collection.extract_null_attributes()
+        assert statistics.null_attributes == {
+            "hat": CollectionAttribute(StringAttribute("hat", "Null"), 1),
+            "pants": CollectionAttribute(StringAttribute("pants", "Null"), 1),
+        }
+        assert statistics.cardinalities == {
+            "hat": 2,
+            "pants": 2,
+            TRAIT_COUNT_ATTRIBUTE_NAME: 2,
+        }
+        assert statistics.singleton_attributes == {TRAIT_COUNT_ATTRIBUTE_NAME: {"0"}}
+        assert statistics.probabilities.tolist() == pytest.approx(
+            [20 / 81, 60 / 81, 1 / 81, 10 / 81, 70 / 81, 1 / 81, 80 / 81, 1 / 81]
+        )
+        assert statistics.entropy == pytest.approx(
+            -sum(p * np.log2(p) for p in statistics.probabilities)
+        )
+
+    def test_statistics_cached_until_modified(self):
+        tokens = [
+            create_evm_token(
+                token_id=i, metadata=TokenMetadata.from_attributes({"hat": "cap"})
+            )
+            for i in range(3)
+        ]
+        collection = Collection(tokens=tokens)
+        statistics = collection.statistics
+        assert collection.statistics is statistics
+        assert statistics.null_attributes == {}
+
+        collection.add_tokens(
+            [
+                create_evm_token(
+                    token_id=3,
+                    metadata=TokenMetadata.from_attributes({"shirt": "vest"}),
+                )
+            ]
+        )
+        assert collection.statistics is not statistics
+        assert collection.statistics.null_attributes["hat"].total_tokens == 1
+        assert collection.statistics.singleton_attributes["shirt"] == {"vest"}
+
+        statistics = collection.statistics
+        collection.update_token_metadata(
+            {tokens[0].token_identifier: TokenMetadata.from_attributes({"hat": "top"})}
+        )
+        assert collection.statistics is not statistics
+        assert collection.statistics.cardinalities["hat"] == 2
+
+        statistics = collection.statistics
+        collection.remove_tokens([tokens[0].token_identifier])
+        assert collection.statistics is not statistics
+        assert collection.statistics.cardinalities["hat"] == 1
+        fresh_statistics = Collection(tokens=collection.tokens).statistics
+        assert collection.statistics.null_attributes == fresh_statistics.null_attributes
+        assert collection.statistics.entropy == fresh_statistics.entropy
+
+    def test_attributes_frequency_counts_read_only(self):
+        collection = generate_collection_with_token_traits(
+            [{"hat": "cap"}, {"hat": "beanie"}]
+        )
+        counts = collection.attributes_frequency_counts
+
+        with pytest.raises(TypeError):
+            counts["hat"]["cap"] = 10  # type: ignore[index]
+        with pytest.raises(TypeError):
+            del counts["hat"]  # type: ignore[attr-defined]
+
+        collection.add_tokens(
+            [
+                create_evm_token(
+                    token_id=2,
+                    metadata=TokenMetadata.from_attributes({"shirt": "vest"}),
+                )
+            ]
+        )
+        assert counts["shirt"] == {"vest": 1}
+        collection.remove_tokens([collection.tokens[2].token_identifier])
+        assert "shirt" not in counts
+        assert (
+            counts == Collection(tokens=collection.tokens).attributes_frequency_counts
+        )
+
     def test_has_numeric_attributes(self):
         assert self.test_numeric_attributes_collection.has_numeric_attribute
         assert not self.test_collection_attributes.has_numeric_attribute
@@ -382,6 +475,47 @@ class TestCollection:
             == large_collection.attributes_frequency_counts
         )
 
+    def test_vocabulary_and_attribute_codes(self):
+        vocabulary = self.test_collection_attributes.vocabulary
+        assert vocabulary.names == ["hat", "pants", TRAIT_COUNT_ATTRIBUTE_NAME]
+        assert vocabulary.values == [["blue", "red"], ["jeans", "sweats"], ["2", "0"]]
+
+        codes = self.test_collection_attributes.attribute_codes
+        assert codes.shape == (100, 3)
+        assert codes[0].tolist() == [0, 0, 0]
+        assert codes[15].tolist() == [0, 1, 0]
+        assert codes[50].tolist() == [1, 1, 0]
+        assert codes[90].tolist() == [NULL_ATTRIBUTE_CODE, NULL_ATTRIBUTE_CODE, 1]
+
+        assert self.test_collection_no_attributes.vocabulary.names == [
+            TRAIT_COUNT_ATTRIBUTE_NAME
+        ]
+        assert self.test_collection_no_attributes.attribute_codes.shape == (100, 1)
+
+    def test_encode_tokens(self):
+        collection = self.test_collection_attributes
+        assert collection.encode_tokens(collection.tokens) is collection.attribute_codes
+
+        tokens = [
+            create_evm_token(
+                token_id=200,
+                metadata=TokenMetadata.from_attributes({"Pants ": "Sweats"}),
+            )
+        ]
+        assert collection.encode_tokens(tokens).tolist() == [
+            [NULL_ATTRIBUTE_CODE, 1, NULL_ATTRIBUTE_CODE]
+        ]
+
+        with pytest.raises(ValueError):
+            collection.encode_tokens(
+                [
+                    create_evm_token(
+                        token_id=201,
+                        metadata=TokenMetadata.from_attributes({"hat": "visor"}),
+                    )
+                ]
+            )
+
     def test_token_standards(self):
         assert self.test_collection_attributes.token_standards == [TokenStandard.ERC721]
         assert self.test_collection_no_attributes.token_standards == [
@@ -395,3 +529,262 @@ class TestCollection:
         assert set(mixed_standards) == set(
             [TokenStandard.ERC721, TokenStandard.ERC1155]
         )
+
+    def _assert_matches_fresh_collection(self, collection: Collection):
+        fresh_collection = Collection(tokens=collection.tokens)
+        assert (
+            collection.attributes_frequency_counts
+            == fresh_collection.attributes_frequency_counts
+        )
+        assert collection.extract_null_attributes() == (
+            fresh_collection.extract_null_attributes()
+        )
+        assert collection.has_numeric_attribute == (
+            fresh_collection.has_numeric_attribute
+        )
+        assert set(collection.token_standards) == set(fresh_collection.token_standards)
+        assert (
+            collection.attribute_codes.tolist()
+            == collection.encode_tokens(list(collection.tokens)).tolist()
+        )
+
+    def test_add_tokens(self):
+        collection = generate_collection_with_token_traits(
+            [{"hat": "cap", "shirt": "vest"}, {"hat": "beanie"}, {"hat": "cap"}]
+        )
+        tokens = [
+            create_evm_token(
+                token_id=10,
+                contract_address="0x0",
+                metadata=TokenMetadata.from_attributes({"hat": "cap", "shoes": "boot"}),
+            ),
+            create_numeric_evm_token(token_id=11, contract_address="0x0"),
+        ]
+
+        change_set = collection.add_tokens(tokens)
+
+        assert collection.token_total_supply == 5
+        assert collection.tokens[3:] == tokens
+        assert collection.has_numeric_attribute
+        assert change_set.added_token_indices == [3, 4]
+        assert change_set.previous_total_supply == 3
+        assert change_set.total_supply == 5
+        assert change_set.attributes_frequency_deltas == {
+            "hat": {"cap": 1},
+            "shoes": {"boot": 1},
+            TRAIT_COUNT_ATTRIBUTE_NAME: {"2": 1, "1": 1},
+        }
+        assert change_set.null_attribute_deltas == {"hat": 1, "shirt": 2, "shoes": 4}
+        self._assert_matches_fresh_collection(collection)
+
+    def test_remove_tokens(self):
+        collection = generate_collection_with_token_traits(
+            [{"hat": "cap", "shirt": "vest"}, {"hat": "beanie"}, {"hat": "cap"}]
+        )
+        tokens = list(collection.tokens)
+        removed_token = collection.tokens[0]
+
+        change_set = collection.remove_tokens(
+            [removed_token.token_identifier, removed_token.token_identifier]
+        )
+
+        assert collection.token_total_supply == 2
+        assert removed_token not in collection.tokens
+        # The last token moved into the place of the removed token
+        assert collection.tokens == [tokens[2], tokens[1]]
+        assert tokens[0] is removed_token
+        assert collection.get_token_indices(
+            [tokens[1].token_identifier, tokens[2].token_identifier]
+        ) == [1, 0]
+        assert change_set.removed_token_indices == [0]
+        assert change_set.moved_token_indices == {2: 0}
+        assert change_set.removed_tokens == [removed_token]
+        assert change_set.attributes_frequency_deltas == {
+            "hat": {"cap": -1},
+            "shirt": {"vest": -1},
+            TRAIT_COUNT_ATTRIBUTE_NAME: {"2": -1},
+        }
+        # "shirt" is no longer an attribute of the collection
+        assert "shirt" not in collection.attributes_frequency_counts
+        assert change_set.null_attribute_deltas == {"shirt": -2}
+        self._assert_matches_fresh_collection(collection)
+
+        with pytest.raises(ValueError):
+            collection.remove_tokens([removed_token.token_identifier])
+
+    def test_add_existing_tokens(self):
+        collection = generate_collection_with_token_traits(
+            [{"hat": "cap"}, {"hat": "beanie"}]
+        )
+        new_token = create_evm_token(
+            token_id=10,
+            contract_address="0x0",
+            metadata=TokenMetadata.from_attributes({"hat": "cap"}),
+        )
+
+        with pytest.raises(ValueError, match="already exist"):
+            collection.add_tokens([new_token, collection.tokens[0]])
+        with pytest.raises(ValueError, match="already exist"):
+            collection.add_tokens([new_token, new_token])
+        assert collection.token_total_supply == 2
+
+        collection.add_tokens([new_token])
+        with pytest.raises(ValueError, match="already exist"):
+            collection.add_tokens([new_token])
+        assert collection.get_token_indices([new_token.token_identifier]) == [2]
+
+    def test_modifications_do_not_change_tokens_argument(self):
+        tokens = generate_mixed_collection(max_total_supply=100).tokens
+        initial_tokens = list(tokens)
+        collection = Collection(tokens=tokens)
+
+        collection.remove_tokens([token.token_identifier for token in tokens[:10]])
+        collection.add_tokens([create_evm_token(token_id=1000, contract_address="0x0")])
+
+        assert tokens == initial_tokens
+        assert collection.token_total_supply == 91
+
+    def test_update_token_metadata(self):
+        collection = generate_collection_with_token_traits(
+            [{"hat": "cap", "shirt": "vest"}, {"hat": "beanie"}, {"hat": "cap"}]
+        )
+        token = collection.tokens[1]
+
+        change_set = collection.update_token_metadata(
+            {
+                token.token_identifier: TokenMetadata.from_attributes(
+                    {"hat": "cap", "shirt": "tee"}
+                )
+            }
+        )
+
+        assert token.metadata.string_attributes["shirt"].value == "tee"
+        assert change_set.updated_token_indices == [1]
+        assert change_set.attributes_frequency_deltas == {
+            "hat": {"cap": 1, "beanie": -1},
+            "shirt": {"tee": 1},
+            TRAIT_COUNT_ATTRIBUTE_NAME: {"2": 1, "1": -1},
+        }
+        assert change_set.null_attribute_deltas == {"shirt": -1}
+        self._assert_matches_fresh_collection(collection)
+
+    def test_incremental_updates_match_fresh_collection(self):
+        tokens = generate_mixed_collection(max_total_supply=1000).tokens
+        collection = Collection(tokens=tokens[:600])
+
+        collection.add_tokens(tokens[600:])
+        collection.remove_tokens([token.token_identifier for token in tokens[::7]])
+        collection.update_token_metadata(
+            {
+                token.token_identifier: TokenMetadata.from_attributes(
+                    {"hat": "visor", "shirt": "vest"}
+                )
+                for token in collection.tokens[::5]
+            }
+        )
+
+        self._assert_matches_fresh_collection(collection)
+        assert collection.get_token_indices(
+            [token.token_identifier for token in collection.tokens]
+        ) == list(range(collection.token_total_supply))
+
+    def test_from_token_stream(self):
+        collection = generate_mixed_collection(max_total_supply=1000)
+        # Attribute names first appear in later chunks
+        tokens = collection.tokens + [
+            create_evm_token(
+                token_id=1000,
+                metadata=TokenMetadata.from_attributes(
+                    {"hat": "cap", "shoes": "boots"}
+                ),
+            )
+        ]
+        collection = Collection(tokens=tokens)
+
+        stream_collection = Collection.from_token_stream(
+            iter(tokens), name="stream", chunk_size=300
+        )
+
+        assert stream_collection.name == "stream"
+        assert stream_collection.tokens == tokens
+        assert stream_collection.has_tokens
+        assert (
+            stream_collection.attributes_frequency_counts
+            == collection.attributes_frequency_counts
+        )
+        assert (
+            stream_collection.attribute_codes.tolist()
+            == collection.attribute_codes.tolist()
+        )
+        self._assert_matches_fresh_collection(stream_collection)
+
+    def test_from_token_stream_without_tokens(self):
+        collection = generate_mixed_collection(max_total_supply=1000)
+
+        stream_collection = Collection.from_token_stream(
+            (token for token in collection.tokens), keep_tokens=False, chunk_size=128
+        )
+
+        assert stream_collection.tokens == []
+        assert not stream_collection.has_tokens
+        assert stream_collection.token_total_supply == 1000
+        assert stream_collection.token_identifiers == [
+            token.token_identifier for token in collection.tokens
+        ]
+        assert stream_collection.get_token_indices(
+            [collection.tokens[10].token_identifier]
+        ) == [10]
+        assert (
+            stream_collection.attributes_frequency_counts
+            == collection.attributes_frequency_counts
+        )
+        assert stream_collection.extract_null_attributes() == (
+            collection.extract_null_attributes()
+        )
+        assert set(stream_collection.token_standards) == set(collection.token_standards)
+        assert (
+            stream_collection.attribute_codes.tolist()
+            == collection.attribute_codes.tolist()
+        )
+        with pytest.raises(ValueError):
+            stream_collection.add_tokens([self.evm_token])
+
+    def test_from_token_stream_without_token_identifiers(self):
+        collection = generate_mixed_collection(max_total_supply=1000)
+        # Attribute names first appear in later chunks
+        tokens = collection.tokens + [
+            create_evm_token(
+                token_id=1000,
+                metadata=TokenMetadata.from_attributes(
+                    {"hat": "cap", "shoes": "boots"}
+                ),
+            )
+        ]
+        collection = Collection(tokens=tokens)
+
+        stream_collection = Collection.from_token_stream(
+            iter(tokens),
+            keep_tokens=False,
+            chunk_size=100,
+            keep_token_identifiers=False,
+        )
+
+        assert stream_collection.tokens == []
+        assert stream_collection.token_identifiers == []
+        assert not stream_collection.has_tokens
+        assert stream_collection.token_total_supply == 1001
+        assert (
+            stream_collection.attributes_frequency_counts
+            == collection.attributes_frequency_counts
+        )
+        assert (
+            stream_collection.attribute_codes.tolist()
+            == collection.attribute_codes.tolist()
+        )
+
+    def test_from_empty_token_stream(self):
+        collection = Collection.from_token_stream(iter([]))
+
+        assert collection.tokens == []
+        assert collection.token_total_supply == 0
+        assert collection.attributes_frequency_counts == {}
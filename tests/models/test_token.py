@@ -1,3 +1,7 @@
+import pickle
+
+import pytest
+
 from open_rarity.models.token import Token
 from open_rarity.models.token_identifier import (
     EVMContractTokenIdentifier,
@@ -8,6 +12,8 @@ from open_rarity.models.token_metadata import (
     StringAttribute,
     TokenMetadata,
 )
+from open_rarity.models.token_ranking_features import TokenRankingFeatures
+from open_rarity.models.token_rarity import TokenRarity
 from open_rarity.models.token_standard import TokenStandard
 from tests.helpers import create_evm_token
 
@@ -216,3 +222,23 @@ class TestToken:
             ),
         )
         assert token_with_valid_null.trait_count() == 5
+
+    def test_token_models_have_no_instance_dict(self):
+        token_rarity = TokenRarity(
+            score=1.5,
+            token_features=TokenRankingFeatures(unique_attribute_count=1),
+            token=self.token,
+            rank=1,
+        )
+        for instance in [
+            self.token,
+            self.metadata,
+            self.metadata.numeric_attributes["level"],
+            token_rarity,
+            token_rarity.token_features,
+        ]:
+            assert not hasattr(instance, "__dict__")
+            assert pickle.loads(pickle.dumps(instance)) == instance
+
+        with pytest.raises(AttributeError):
+            self.token.not_a_field = 1  # type: ignore[attr-defined]
@@ -1,3 +1,5 @@
+import pickle
+from dataclasses import FrozenInstanceError
 from datetime import datetime
 
 import pytest
@@ -7,6 +9,7 @@ from open_rarity.models.token_metadata import (
     NumericAttribute,
     StringAttribute,
     TokenMetadata,
+    intern_string_attribute,
 )
 
 now = datetime.now()
@@ -139,3 +142,36 @@ class TestTokenMetadata:
         assert attribute_dict["created"] == datetime(
             now.year, now.month, now.day, now.hour, now.minute, now.second
         )
+
+    def test_string_attributes_are_shared(self):
+        token_metadata = TokenMetadata.from_attributes({"Hat ": " Blue Cap"})
+        token_metadata_2 = TokenMetadata.from_attributes({"Hat ": " Blue Cap"})
+
+        attribute = token_metadata.string_attributes["hat"]
+        assert attribute == StringAttribute(name="hat", value="blue cap")
+        assert attribute is token_metadata_2.string_attributes["hat"]
+        assert attribute is intern_string_attribute("Hat ", " Blue Cap")
+        # Equal normalized strings are the same objects
+        assert attribute.value is intern_string_attribute("hat", "BLUE CAP").value
+        assert not hasattr(attribute, "__dict__")
+
+        with pytest.raises(FrozenInstanceError):
+            attribute.value = "red cap"  # type: ignore
+
+    def test_normalize_shared_attribute_name(self):
+        attribute = intern_string_attribute("hat", "cap")
+        token_metadata = TokenMetadata(string_attributes={"Hat": attribute})
+
+        assert token_metadata.string_attributes == {
+            "hat": StringAttribute(name="hat", value="cap")
+        }
+        token_metadata = TokenMetadata(
+            string_attributes={"shirt": StringAttribute(name="hat", value="cap")}
+        )
+        assert token_metadata.string_attributes["shirt"].name == "shirt"
+        # The shared attribute was not modified
+        assert attribute.name == "hat"
+
+    def test_pickle_string_attribute(self):
+        attribute = intern_string_attribute("hat", "cap")
+        assert pickle.loads(pickle.dumps(attribute)) == attribute
@@ -1,3 +1,6 @@
+import json
+import threading
+
 import pytest
 
 from open_rarity.models.collection import Collection
@@ -89,3 +92,135 @@ class TestExternalRarityProvider:
                 assert rarity.rank == trait_sniper_rank
             else:
                 raise Exception("Unexpected provider")
+
+    def test_fetch_rarity_sniper_ranks_in_bulk(self, mocker, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "cached_data").mkdir()
+        collection = CollectionWithMetadata(
+            collection=Collection(tokens=[]),
+            contract_addresses=[self.bayc_address],
+            token_total_supply=50,
+            opensea_slug="bulk-test",
+        )
+        tokens_with_rarity = [
+            TokenWithRarityData(
+                token=Token.from_erc721(
+                    contract_address=self.bayc_address,
+                    token_id=token_id,
+                    metadata_dict={"hat": "cap"},
+                ),
+                rarities=[],
+            )
+            for token_id in range(50)
+        ]
+
+        def get_rank(collection_slug: str, token_id: int) -> int | None:
+            if token_id == 7:
+                raise ValueError("Unexpected response")
+            return None if token_id % 10 == 0 else token_id + 100
+
+        mocker.patch.object(RaritySniperResolver, "get_rank", side_effect=get_rank)
+        provider = ExternalRarityProvider()
+        write_cache_to_file = mocker.spy(provider, "write_cache_to_file")
+
+        token_ids = [
+            token_with_rarity.token.token_identifier.token_id
+            for token_with_rarity in tokens_with_rarity
+        ]
+        provider._fetch_rarity_sniper_ranks(
+            collection_with_metadata=collection,
+            token_ids=token_ids,
+            max_workers=4,
+            cache_flush_interval=10,
+        )
+        provider._add_cached_ranks(
+            rank_provider=RankProvider.RARITY_SNIPER,
+            slug="bulk-test",
+            tokens_with_rarity=tokens_with_rarity,
+        )
+
+        progress = provider.progress[RankProvider.RARITY_SNIPER]
+        assert (progress.total, progress.fetched, progress.failed) == (50, 44, 6)
+        # Cache is written every 10 fetches and at the end
+        assert write_cache_to_file.call_count == 6
+        with open(
+            provider.cache_filename(RankProvider.RARITY_SNIPER, "bulk-test")
+        ) as cache_file:
+            cached_ranks = json.load(cache_file)
+        assert len(cached_ranks) == 44
+        for token_with_rarity in tokens_with_rarity:
+            token_id = token_with_rarity.token.token_identifier.token_id
+            if token_id == 7 or token_id % 10 == 0:
+                assert token_with_rarity.rarities == []
+            else:
+                assert token_with_rarity.rarities[0].rank == token_id + 100
+                assert cached_ranks[str(token_id)] == token_id + 100
+
+        # Only ranks missing from the cache are fetched again
+        RaritySniperResolver.get_rank.reset_mock()
+        provider._fetch_rarity_sniper_ranks(
+            collection_with_metadata=collection, token_ids=token_ids
+        )
+        assert RaritySniperResolver.get_rank.call_count == 6
+
+    def test_fetch_ranks_from_providers_concurrently(self, mocker):
+        provider = ExternalRarityProvider()
+        collection = CollectionWithMetadata(
+            collection=Collection(tokens=[]),
+            contract_addresses=[self.bayc_address],
+            token_total_supply=2,
+            opensea_slug="concurrent-test",
+        )
+        tokens_with_rarity = [
+            TokenWithRarityData(
+                token=Token.from_erc721(
+                    contract_address=self.bayc_address,
+                    token_id=token_id,
+                    metadata_dict={"hat": "cap"},
+                ),
+                rarities=[],
+            )
+            for token_id in range(2)
+        ]
+        # Every provider waits until all providers are fetching
+        barrier = threading.Barrier(len(EXTERNAL_RANK_PROVIDERS), timeout=5)
+
+        def get_all_ranks(ranks: dict[str, int]):
+            def side_effect(contract_address: str) -> dict[str, int]:
+                barrier.wait()
+                return ranks
+
+            return side_effect
+
+        def get_rank(collection_slug: str, token_id: int) -> int:
+            if token_id == 0:
+                barrier.wait()
+            return token_id + 20
+
+        mocker.patch.object(
+            RaritySnifferResolver,
+            "get_all_ranks",
+            side_effect=get_all_ranks({"0": 10, "1": 11}),
+        )
+        mocker.patch.object(
+            TraitSniperResolver, "get_all_ranks", side_effect=get_all_ranks({"1": 31})
+        )
+        mocker.patch.object(RaritySniperResolver, "get_rank", side_effect=get_rank)
+
+        provider.fetch_and_update_ranks(
+            collection_with_metadata=collection,
+            tokens_with_rarity=tokens_with_rarity,
+            cache_external_ranks=False,
+        )
+
+        # Ranks are added in order of the providers
+        assert [
+            (rarity.provider, rarity.rank) for rarity in tokens_with_rarity[0].rarities
+        ] == [(RankProvider.RARITY_SNIFFER, 10), (RankProvider.RARITY_SNIPER, 20)]
+        assert [
+            (rarity.provider, rarity.rank) for rarity in tokens_with_rarity[1].rarities
+        ] == [
+            (RankProvider.TRAITS_SNIPER, 31),
+            (RankProvider.RARITY_SNIFFER, 11),
+            (RankProvider.RARITY_SNIPER, 21),
+        ]
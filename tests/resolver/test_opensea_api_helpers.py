@@ -0,0 +1,469 @@
+import datetime
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+from requests.models import HTTPError
+
+from open_rarity.models.collection import Collection
+from open_rarity.models.token import Token
+from open_rarity.models.token_identifier import EVMContractTokenIdentifier
+from open_rarity.models.token_metadata import TokenMetadata
+from open_rarity.models.token_standard import TokenStandard
+from open_rarity.resolver import opensea_api_helpers
+from open_rarity.resolver.opensea_api_helpers import (
+    OS_DOWNLOAD_JOURNAL_FILENAME_FORMAT,
+    CacheFormat,
+    DownloadJournal,
+    get_all_collection_tokens,
+    iter_all_collection_tokens,
+    iter_collection_data_from_file,
+    read_collection_data_from_file,
+    write_collection_data_to_file,
+)
+from open_rarity.resolver.rate_limiter import RateLimiter
+from open_rarity.scoring.scorer import Scorer
+from tests.helpers import generate_mixed_collection
+
+
+class TestOpenseaApiHelpers:
+    tokens = [
+        Token(
+            token_identifier=EVMContractTokenIdentifier(
+                contract_address="0xabc", token_id=1
+            ),
+            token_standard=TokenStandard.ERC721,
+            metadata=TokenMetadata.from_attributes(
+                {
+                    "hat": "Cap ",
+                    "level": 3,
+                    "speed": 1.5,
+                }
+            ),
+        ),
+        # Unrevealed token is skipped when reading
+        Token(
+            token_identifier=EVMContractTokenIdentifier(
+                contract_address="0xabc", token_id=2
+            ),
+            token_standard=TokenStandard.ERC721,
+            metadata=TokenMetadata(),
+        ),
+        Token(
+            token_identifier=EVMContractTokenIdentifier(
+                contract_address="0xdef", token_id=2**200
+            ),
+            token_standard=TokenStandard.ERC1155,
+            metadata=TokenMetadata.from_attributes({"hat": "cap", "shirt": "vest"}),
+        ),
+    ]
+
+    @pytest.mark.parametrize("cache_format", [CacheFormat.JSON, CacheFormat.BINARY])
+    def test_write_and_read_collection_data(self, cache_format, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "cached_data").mkdir()
+
+        write_collection_data_to_file(
+            slug="test", tokens=self.tokens, cache_format=cache_format
+        )
+        tokens = read_collection_data_from_file(
+            expected_supply=3, slug="test", cache_format=cache_format
+        )
+
+        assert tokens == [self.tokens[0], self.tokens[2]]
+        assert isinstance(tokens[0].metadata.numeric_attributes["level"].value, int)
+
+    def test_write_and_read_binary_date_attributes(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "cached_data").mkdir()
+        tokens = [
+            Token(
+                token_identifier=EVMContractTokenIdentifier(
+                    contract_address="0xabc", token_id=1
+                ),
+                token_standard=TokenStandard.ERC721,
+                metadata=TokenMetadata.from_attributes(
+                    {"hat": "cap", "birthday": datetime.datetime(2022, 1, 1)}
+                ),
+            )
+        ]
+
+        write_collection_data_to_file(
+            slug="test", tokens=tokens, cache_format=CacheFormat.BINARY
+        )
+
+        assert (
+            read_collection_data_from_file(
+                expected_supply=1, slug="test", cache_format=CacheFormat.BINARY
+            )
+            == tokens
+        )
+
+    def test_write_and_read_binary_exact_values(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "cached_data").mkdir()
+        long_value = "x" * 5000
+        tokens = [
+            Token(
+                token_identifier=EVMContractTokenIdentifier(
+                    contract_address="0xabc", token_id=token_id
+                ),
+                token_standard=TokenStandard.ERC721,
+                metadata=TokenMetadata.from_attributes(
+                    {
+                        "hat": long_value if token_id == 0 else f"cap ü {token_id}\0",
+                        "level": 2**53 + 1,
+                        "power": 2**70 + token_id,
+                        "speed": 0.1,
+                    }
+                ),
+            )
+            for token_id in range(2000)
+        ]
+
+        write_collection_data_to_file(
+            slug="test", tokens=tokens, cache_format=CacheFormat.BINARY
+        )
+
+        assert (
+            read_collection_data_from_file(
+                expected_supply=2000, slug="test", cache_format=CacheFormat.BINARY
+            )
+            == tokens
+        )
+        # Strings are stored as UTF-8 bytes instead of fixed width strings
+        strings_size = sum(
+            os.path.getsize(f"cached_data/test_cached_os_trait_data/{name}.npy")
+            for name in ["string_offsets", "string_data"]
+        )
+        assert strings_size < 100_000
+
+    def test_interrupted_binary_write_keeps_cache(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "cached_data").mkdir()
+        write_collection_data_to_file(
+            slug="test", tokens=self.tokens, cache_format=CacheFormat.BINARY
+        )
+        save = opensea_api_helpers.np.save
+
+        def failing_save(filename, array):
+            if filename.endswith("date_attribute_names.npy"):
+                raise OSError("No space left on device")
+            save(filename, array)
+
+        monkeypatch.setattr(opensea_api_helpers.np, "save", failing_save)
+        with pytest.raises(OSError):
+            write_collection_data_to_file(
+                slug="test", tokens=self.tokens[:1], cache_format=CacheFormat.BINARY
+            )
+
+        assert read_collection_data_from_file(
+            expected_supply=3, slug="test", cache_format=CacheFormat.BINARY
+        ) == [self.tokens[0], self.tokens[2]]
+        assert os.listdir("cached_data") == ["test_cached_os_trait_data"]
+
+    def test_binary_collection_data_scores(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "cached_data").mkdir()
+        collection = generate_mixed_collection(max_total_supply=1000)
+
+        write_collection_data_to_file(
+            slug="mixed", tokens=collection.tokens, cache_format=CacheFormat.BINARY
+        )
+        tokens = read_collection_data_from_file(
+            expected_supply=1000, slug="mixed", cache_format=CacheFormat.BINARY
+        )
+
+        scorer = Scorer()
+        assert scorer.score_collection(
+            Collection(tokens=tokens)
+        ) == scorer.score_collection(collection)
+
+    @pytest.mark.parametrize("chunk_size", [1, 7, 64])
+    def test_read_binary_collection_data_in_chunks(
+        self, chunk_size, tmp_path, monkeypatch
+    ):
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "cached_data").mkdir()
+        tokens = self.tokens + generate_mixed_collection(max_total_supply=100).tokens
+
+        write_collection_data_to_file(
+            slug="test", tokens=tokens, cache_format=CacheFormat.BINARY
+        )
+
+        assert list(
+            opensea_api_helpers._iter_binary_collection_data(
+                cache_dirname="cached_data/test_cached_os_trait_data",
+                chunk_size=chunk_size,
+            )
+        ) == [token for token in tokens if token.metadata != TokenMetadata()]
+
+    def test_read_missing_binary_collection_data(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        assert (
+            read_collection_data_from_file(
+                expected_supply=1, slug="missing", cache_format=CacheFormat.BINARY
+            )
+            == []
+        )
+
+    def test_read_corrupt_collection_data(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "cached_data").mkdir()
+        with open("cached_data/test_cached_os_trait_data.json", "w") as jsonfile:
+            jsonfile.write('[{"token_identifier": ')
+
+        assert list(iter_collection_data_from_file(slug="test")) == []
+
+    def test_iter_collection_data_error_after_first_token(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "cached_data").mkdir()
+        write_collection_data_to_file(slug="test", tokens=self.tokens)
+        with open("cached_data/test_cached_os_trait_data.json") as jsonfile:
+            tokens_data = json.load(jsonfile)
+        del tokens_data[2]["token_identifier"]
+        with open("cached_data/test_cached_os_trait_data.json", "w") as jsonfile:
+            json.dump(tokens_data, jsonfile)
+
+        tokens = iter_collection_data_from_file(slug="test")
+
+        assert next(tokens) == self.tokens[0]
+        with pytest.raises(KeyError):
+            next(tokens)
+
+
+class StubOpenseaServer(ThreadingHTTPServer):
+    """Local HTTP server serving the Opensea assets endpoint for a collection
+    of `total_supply` tokens, which records how it was requested."""
+
+    def __init__(self, total_supply: int, response_delay: float = 0.01):
+        super().__init__(("127.0.0.1", 0), StubOpenseaRequestHandler)
+        self.total_supply = total_supply
+        self.response_delay = response_delay
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.client_ports: set[int] = set()
+        # Requests for these token ids fail
+        self.failing_token_ids: set[int] = set()
+        self.requested_token_ids: list[list[int]] = []
+
+    @property
+    def assets_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/api/v1/assets"
+
+
+class StubOpenseaRequestHandler(BaseHTTPRequestHandler):
+    # Keep connections alive between requests
+    protocol_version = "HTTP/1.1"
+    server: StubOpenseaServer
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests += 1
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+            server.client_ports.add(self.client_address[1])
+        time.sleep(server.response_delay)
+
+        token_ids = [
+            int(token_id)
+            for token_id in parse_qs(urlparse(self.path).query)["token_ids"]
+            if int(token_id) < server.total_supply
+        ]
+        with server.lock:
+            server.requested_token_ids.append(token_ids)
+        if server.failing_token_ids.intersection(token_ids):
+            with server.lock:
+                server.in_flight -= 1
+            self._send_json(500, {})
+            return
+
+        # Opensea does not return assets sorted by token id
+        assets = [
+            {
+                "token_id": str(token_id),
+                "traits": [
+                    {
+                        "trait_type": "hat",
+                        "value": str(token_id % 3),
+                        "display_type": None,
+                    }
+                ],
+                "asset_contract": {
+                    "address": "0xabc",
+                    "asset_contract_type": "non-fungible",
+                },
+            }
+            for token_id in reversed(token_ids)
+        ]
+        with server.lock:
+            server.in_flight -= 1
+        self._send_json(200, {"assets": assets})
+
+    def _send_json(self, status_code: int, data: dict):
+        body = json.dumps(data).encode()
+        self.send_response(status_code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub_opensea_server(monkeypatch):
+    server = StubOpenseaServer(total_supply=95)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(opensea_api_helpers, "OS_ASSETS_URL", server.assets_url)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+class TestOpenseaConcurrentFetch:
+    def test_get_all_collection_tokens(self, stub_opensea_server):
+        tokens = get_all_collection_tokens(
+            slug="test",
+            total_supply=95,
+            batch_size=10,
+            use_cache=False,
+            max_concurrent_requests=3,
+            rate_limiter=RateLimiter(default_requests_per_second=1000),
+        )
+
+        assert [t.token_identifier.token_id for t in tokens] == list(range(95))
+        assert tokens[4].metadata.string_attributes["hat"].value == "1"
+        # 10 batches and 1 request for a token past the total supply
+        assert stub_opensea_server.requests == 11
+        assert 1 < stub_opensea_server.max_in_flight <= 3
+        # Connections are kept alive and reused
+        assert len(stub_opensea_server.client_ports) <= 3
+
+    def test_resume_collection_download(
+        self, stub_opensea_server, tmp_path, monkeypatch
+    ):
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "cached_data").mkdir()
+        journal_filename = OS_DOWNLOAD_JOURNAL_FILENAME_FORMAT % "test"
+        rate_limiter = RateLimiter(default_requests_per_second=1000)
+        stub_opensea_server.failing_token_ids = {42}
+
+        with pytest.raises(HTTPError):
+            get_all_collection_tokens(
+                slug="test",
+                total_supply=95,
+                batch_size=10,
+                max_concurrent_requests=3,
+                rate_limiter=rate_limiter,
+            )
+
+        # Batches fetched before the failed one are journaled, and batches after
+        # it may have been fetched or cancelled
+        fetched_token_ids, tokens = DownloadJournal(journal_filename).read()
+        assert set(range(40)).issubset(fetched_token_ids)
+        assert not fetched_token_ids.intersection(range(40, 50))
+        assert len(tokens) == len(fetched_token_ids)
+
+        stub_opensea_server.failing_token_ids = set()
+        stub_opensea_server.requested_token_ids = []
+        tokens = get_all_collection_tokens(
+            slug="test",
+            total_supply=95,
+            batch_size=10,
+            max_concurrent_requests=3,
+            rate_limiter=rate_limiter,
+        )
+
+        assert [t.token_identifier.token_id for t in tokens] == list(range(95))
+        # Download resumes from the first missing token id, and only fetches
+        # missing tokens and a token past the total supply
+        requested_token_ids = stub_opensea_server.requested_token_ids
+        assert list(range(40, 50)) in requested_token_ids
+        assert requested_token_ids[-1] == []
+        assert sorted(sum(requested_token_ids, [])) == sorted(
+            set(range(95)) - fetched_token_ids
+        )
+        # Journal is compacted into the cache file
+        assert not os.path.exists(journal_filename)
+        assert read_collection_data_from_file(expected_supply=95, slug="test") == tokens
+
+    def test_download_journal(self, tmp_path):
+        journal = DownloadJournal(str(tmp_path / "journal.jsonl"))
+        assert journal.read() == (set(), [])
+
+        tokens = TestOpenseaApiHelpers.tokens
+        journal.append([1, 2], tokens[:2])
+        journal.append([3], [])
+        # Partially written line of an interrupted download
+        with open(journal.filename, "a") as journal_file:
+            journal_file.write('{"token_ids": [4')
+
+        assert journal.read() == ({1, 2, 3}, tokens[:2])
+
+        # Resumed download appends after the last complete line
+        resumed_journal = DownloadJournal(journal.filename)
+        resumed_journal.append([4], tokens[2:])
+        resumed_journal.append([5], [])
+        assert journal.read() == ({1, 2, 3, 4, 5}, tokens)
+        journal.remove()
+        assert journal.read() == (set(), [])
+
+    def test_download_journal_tokens_in_token_id_order(self, tmp_path):
+        journal = DownloadJournal(str(tmp_path / "journal.jsonl"))
+        tokens = generate_mixed_collection(max_total_supply=100).tokens
+        token_ids = [t.token_identifier.token_id for t in tokens]
+        # Batches are journaled in the order their requests complete
+        for start in [30, 0, 90, 10, 60, 20, 50, 80, 40, 70]:
+            batch_tokens = tokens[start : start + 10]
+            journal.append(token_ids[start : start + 10], batch_tokens[::-1])
+
+        assert list(journal.iter_tokens_in_token_id_order()) == sorted(
+            tokens, key=lambda t: t.token_identifier.token_id
+        )
+
+    def test_iter_all_collection_tokens(
+        self, stub_opensea_server, tmp_path, monkeypatch
+    ):
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "cached_data").mkdir()
+
+        def iter_tokens():
+            return iter_all_collection_tokens(
+                slug="test",
+                total_supply=95,
+                batch_size=10,
+                cache_format=CacheFormat.BINARY,
+                max_concurrent_requests=3,
+                rate_limiter=RateLimiter(default_requests_per_second=1000),
+            )
+
+        collection = Collection.from_token_stream(iter_tokens(), chunk_size=20)
+
+        assert [t.token_identifier.token_id for t in collection.tokens] == list(
+            range(95)
+        )
+        assert collection.attributes_frequency_counts["hat"] == {
+            "0": 32,
+            "1": 32,
+            "2": 31,
+        }
+        # Cache is written once all tokens are consumed, and used afterwards
+        requests = stub_opensea_server.requests
+        cached_tokens = list(iter_tokens())
+        assert stub_opensea_server.requests == requests
+        assert [t.token_identifier for t in cached_tokens] == [
+            t.token_identifier for t in collection.tokens
+        ]
+        assert Collection(tokens=cached_tokens).attributes_frequency_counts == (
+            collection.attributes_frequency_counts
+        )
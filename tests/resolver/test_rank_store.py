@@ -0,0 +1,90 @@
+import os
+
+import numpy as np
+import pytest
+
+from open_rarity.resolver.rarity_providers.rank_store import MISSING_RANK, RankStore
+
+
+class TestRankStore:
+    def test_lookup_contiguous_token_ids(self):
+        store = RankStore.from_dict({"3": 30, "1": 10, "2": 20, "5": 50})
+
+        assert store.is_dense
+        assert len(store) == 4
+        assert store.lookup([5, 1, 4, 0, 6, 2]).tolist() == [
+            50,
+            10,
+            MISSING_RANK,
+            MISSING_RANK,
+            MISSING_RANK,
+            20,
+        ]
+        assert store.get(3) == 30
+        assert store.get(4) is None
+
+    def test_lookup_sparse_token_ids(self):
+        token_ids = [7, 1_000, 2**40, 3]
+        store = RankStore(token_ids=token_ids, ranks=[1, 2, 3, 4])
+
+        assert not store.is_dense
+        assert store.lookup(
+            np.array([2**40, 8, 3, 2_000_000, 7, 1_000])
+        ).tolist() == [
+            3,
+            MISSING_RANK,
+            4,
+            MISSING_RANK,
+            1,
+            2,
+        ]
+
+    def test_lookup_large_token_ids(self):
+        large_token_id = 2**200
+        store = RankStore(token_ids=[large_token_id, 5], ranks=[1, 2])
+
+        assert store.lookup([5, large_token_id, large_token_id + 1]).tolist() == [
+            2,
+            1,
+            MISSING_RANK,
+        ]
+
+    def test_empty_store(self):
+        store = RankStore()
+
+        assert len(store) == 0
+        assert store.lookup([1, 2]).tolist() == [MISSING_RANK, MISSING_RANK]
+        assert store.get(1) is None
+        assert store.to_dict() == {}
+
+    def test_update(self):
+        store = RankStore.from_dict({"1": 10, "2": 20})
+        store.update({2: 21, 1_000: 5})
+
+        assert not store.is_dense
+        assert store.to_dict() == {"1": 10, "2": 21, "1000": 5}
+        assert store.lookup([1, 2, 1_000]).tolist() == [10, 21, 5]
+
+    def test_file_round_trip(self, tmp_path):
+        filename = str(tmp_path / "ranks.json")
+        store = RankStore.from_dict({"2": 1, "0": 3, "1": 2})
+        store.write_to_file(filename)
+
+        loaded_store = RankStore.from_file(filename)
+        assert loaded_store.to_dict() == {"0": 3, "1": 2, "2": 1}
+        assert loaded_store.lookup([0, 1, 2]).tolist() == [3, 2, 1]
+
+    def test_failed_write_keeps_file(self, tmp_path, monkeypatch):
+        filename = str(tmp_path / "ranks.json")
+        RankStore.from_dict({"0": 1, "1": 2}).write_to_file(filename)
+
+        def failing_to_dict(self):
+            raise RuntimeError("Failed to serialize ranks")
+
+        monkeypatch.setattr(RankStore, "to_dict", failing_to_dict)
+        with pytest.raises(RuntimeError):
+            RankStore.from_dict({"0": 2, "1": 1}).write_to_file(filename)
+        monkeypatch.undo()
+
+        assert RankStore.from_file(filename).to_dict() == {"0": 1, "1": 2}
+        assert os.listdir(tmp_path) == ["ranks.json"]
@@ -0,0 +1,101 @@
+import email.utils
+import threading
+import time
+
+from requests import Response
+
+from open_rarity.resolver.rate_limiter import (
+    RateLimiter,
+    TokenBucket,
+    _parse_retry_after,
+)
+
+
+class StubSession:
+    """Session returning responses with the given status codes in order."""
+
+    def __init__(self, status_codes: list[int], retry_after: str | None = None):
+        self.status_codes = status_codes
+        self.retry_after = retry_after
+        self.requests: list[str] = []
+
+    def request(self, method, url, **kwargs) -> Response:
+        response = Response()
+        response.status_code = self.status_codes[len(self.requests)]
+        if self.retry_after is not None:
+            response.headers["Retry-After"] = self.retry_after
+        self.requests.append(url)
+        return response
+
+
+class TestRateLimiter:
+    def test_token_bucket_rate(self):
+        bucket = TokenBucket(rate=100)
+        start = time.monotonic()
+        threads = [threading.Thread(target=bucket.acquire) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # First request uses the initial token, others wait for a refill
+        assert time.monotonic() - start >= 0.035
+
+    def test_token_bucket_backoff(self):
+        bucket = TokenBucket(rate=100)
+        bucket.backoff(0.05)
+        assert bucket.rate == 50
+
+        start = time.monotonic()
+        bucket.acquire()
+        assert time.monotonic() - start >= 0.05
+
+        for _ in range(10):
+            bucket.recover()
+        assert bucket.rate == 100
+
+    def test_buckets_per_host(self):
+        rate_limiter = RateLimiter(
+            host_requests_per_second={"api.opensea.io": 4},
+            default_requests_per_second=2,
+        )
+        assert rate_limiter.bucket("api.opensea.io").rate == 4
+        assert rate_limiter.bucket("example.com").rate == 2
+        assert rate_limiter.bucket("api.opensea.io") is rate_limiter.bucket(
+            "api.opensea.io"
+        )
+
+    def test_retry_rate_limited_request(self):
+        rate_limiter = RateLimiter(
+            default_requests_per_second=1000, backoff_seconds=0.01
+        )
+        session = StubSession([429, 503, 200], retry_after="0")
+
+        response = rate_limiter.request(
+            "GET", "http://example.com/ranks", session=session
+        )
+
+        assert response.status_code == 200
+        assert len(session.requests) == 3
+        # Rate is halved on every rate limited response and partially recovered
+        assert rate_limiter.bucket("example.com").rate == 1000 / 4 + 100
+
+    def test_retries_exhausted(self):
+        rate_limiter = RateLimiter(
+            default_requests_per_second=1000, max_retries=2, backoff_seconds=0.01
+        )
+        session = StubSession([429, 429, 429, 200])
+
+        response = rate_limiter.request(
+            "GET", "http://example.com/ranks", session=session
+        )
+
+        assert response.status_code == 429
+        assert len(session.requests) == 3
+
+    def test_parse_retry_after(self):
+        assert _parse_retry_after(None) is None
+        assert _parse_retry_after("invalid") is None
+        assert _parse_retry_after("12") == 12
+        retry_date = email.utils.formatdate(time.time() + 30, usegmt=True)
+        assert 28 <= _parse_retry_after(retry_date) <= 30
@@ -2,8 +2,14 @@ import csv
 
 import pytest
 
+from open_rarity.resolver import testset_resolver
 from open_rarity.resolver.models.token_with_rarity_data import RankProvider
-from open_rarity.resolver.testset_resolver import resolve_collection_data
+from open_rarity.resolver.testset_resolver import (
+    resolve_collection_data,
+    resolve_open_rarity_score,
+)
+from open_rarity.scoring.metrics import score_metrics
+from tests.helpers import generate_mixed_collection
 
 
 class TestTestsetResolver:
@@ -215,3 +221,22 @@ class TestTestsetResolver:
                         assert row[9] == self.ic_bayc_token_ids_to_ranks[token_id]
 
         assert rows == 10_001
+
+    def test_resolve_open_rarity_score_per_token_fallback(self, monkeypatch):
+        collection = generate_mixed_collection(max_total_supply=100)
+        failing_token = collection.tokens[3]
+
+        def failing_score_metrics(collection, tokens, metrics=None):
+            if failing_token in tokens:
+                raise ValueError("Cannot score token")
+            return score_metrics(collection, tokens, metrics)
+
+        expected_scores = resolve_open_rarity_score(collection, collection.tokens)
+        monkeypatch.setattr(testset_resolver, "score_metrics", failing_score_metrics)
+        scores = resolve_open_rarity_score(collection, collection.tokens)
+
+        failing_token_id = failing_token.token_identifier.token_id
+        assert failing_token_id not in scores.information_content_scores
+        assert len(scores.information_content_scores) == 99
+        for token_id, (_, score) in scores.sum_scores.items():
+            assert score == expected_scores.sum_scores[token_id][1]
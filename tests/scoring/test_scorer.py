@@ -1,10 +1,28 @@
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 
-from open_rarity import Collection, OpenRarityScorer, TokenStandard
+from open_rarity import Collection, OpenRarityScorer, TokenMetadata, TokenStandard
+from open_rarity.scoring.handlers.arithmetic_mean_scoring_handler import (
+    ArithmeticMeanScoringHandler,
+)
+from open_rarity.scoring.handlers.geometric_mean_scoring_handler import (
+    GeometricMeanScoringHandler,
+)
+from open_rarity.scoring.handlers.harmonic_mean_scoring_handler import (
+    HarmonicMeanScoringHandler,
+)
 from open_rarity.scoring.handlers.information_content_scoring_handler import (
     InformationContentScoringHandler,
 )
-from tests.helpers import create_evm_token, generate_collection_with_token_traits
+from open_rarity.scoring.handlers.sum_scoring_handler import SumScoringHandler
+from open_rarity.scoring.parallel import CompactCollection
+from tests.helpers import (
+    create_evm_token,
+    generate_collection_with_token_traits,
+    generate_mixed_collection,
+)
 
 
 class TestScorer:
@@ -81,3 +99,181 @@ class TestScorer:
             "OpenRarity currently only supports ERC721/Non-fungible standards"
             in str(excinfo.value)
         )
+
+    def test_prepare(self):
+        collection = generate_collection_with_token_traits(
+            [
+                {"bottom": "1", "hat": "1", "special": "true"},
+                {"bottom": "1", "hat": "1"},
+                {"bottom": "2", "hat": "2", "special": "false"},
+                {"bottom": "2", "hat": "2", "special": "false"},
+                {"bottom": "pants", "hat": "cap", "special": "false"},
+            ]
+        )
+        prepared = self.scorer.prepare(collection)
+
+        assert prepared.score_tokens(collection.tokens) == pytest.approx(
+            self.scorer.score_collection(collection)
+        )
+
+        # Tokens that are not in the collection
+        for token_traits in [
+            {"bottom": "2", "hat": "cap"},
+            {"hat": "1", "special": "true"},
+            {},
+        ]:
+            token = create_evm_token(
+                token_id=100, metadata=TokenMetadata.from_attributes(token_traits)
+            )
+            assert prepared.score_token(token) == pytest.approx(
+                self.scorer.score_token(collection, token)
+            )
+
+        with pytest.raises(ValueError, match="No token in the collection"):
+            prepared.score_token(
+                create_evm_token(
+                    token_id=100,
+                    metadata=TokenMetadata.from_attributes({"hat": "beanie"}),
+                )
+            )
+
+        # Prepared data is rebuilt after the collection changes
+        collection.add_tokens(
+            [
+                create_evm_token(
+                    token_id=5,
+                    metadata=TokenMetadata.from_attributes(
+                        {"bottom": "1", "hat": "beanie"}
+                    ),
+                )
+            ]
+        )
+        assert prepared.score_tokens(collection.tokens) == pytest.approx(
+            self.scorer.score_collection(collection)
+        )
+
+    def test_prepare_validates_collection(self):
+        collection = Collection(
+            tokens=[
+                create_evm_token(token_id=i, token_standard=TokenStandard.ERC1155)
+                for i in range(10)
+            ],
+        )
+        with pytest.raises(ValueError, match="only supports ERC721"):
+            self.scorer.prepare(collection)
+
+    def test_score_all_metrics(self):
+        collection = generate_mixed_collection()
+        handlers = {
+            "information_content": InformationContentScoringHandler(),
+            "arithmetic": ArithmeticMeanScoringHandler(),
+            "geometric": GeometricMeanScoringHandler(),
+            "harmonic": HarmonicMeanScoringHandler(),
+            "sum": SumScoringHandler(),
+        }
+
+        scores = self.scorer.score_all_metrics(collection)
+        assert list(scores) == list(handlers)
+        for metric, handler in handlers.items():
+            assert scores[metric].tolist() == handler.score_tokens(
+                collection=collection, tokens=collection.tokens
+            )
+
+        tokens = collection.tokens[:10]
+        scores = self.scorer.score_all_metrics(
+            collection, metrics=["sum", "information_content"], tokens=tokens
+        )
+        assert list(scores) == ["sum", "information_content"]
+        assert scores["sum"].tolist() == handlers["sum"].score_tokens(
+            collection=collection, tokens=tokens
+        )
+
+        with pytest.raises(ValueError, match="Unknown scoring metrics"):
+            self.scorer.score_all_metrics(collection, metrics=["median"])
+
+    def test_score_collection_without_tokens(self):
+        collection = generate_mixed_collection(max_total_supply=100)
+        stream_collection = Collection.from_token_stream(
+            collection.tokens, keep_tokens=False
+        )
+
+        with pytest.raises(ValueError, match="were dropped"):
+            self.scorer.score_collection(stream_collection)
+        with pytest.raises(ValueError, match="were dropped"):
+            self.scorer.score_collections([stream_collection])
+        with pytest.raises(ValueError, match="were dropped"):
+            self.scorer.score_all_metrics(stream_collection)
+        # Tokens that are given are scored against the collection attributes
+        assert self.scorer.score_tokens(
+            stream_collection, tokens=collection.tokens
+        ) == self.scorer.score_collection(collection)
+
+    def test_score_collections_in_parallel(self):
+        collections = [
+            generate_collection_with_token_traits(
+                [
+                    {"bottom": "1", "hat": "1", "special": "true"},
+                    {"bottom": "1", "hat": "1"},
+                    {"bottom": "2", "hat": "2", "shoes": "boots"},
+                    {"bottom": "pants", "hat": "cap", "special": "false"},
+                ]
+            ),
+            generate_mixed_collection(max_total_supply=500),
+            # Numeric attribute is not supported
+            generate_collection_with_token_traits([{"bottom": 3}, {"bottom": 2}]),
+            Collection(tokens=[]),
+        ]
+        expected_scores = [
+            self.scorer.score_collection(collection) for collection in collections[:2]
+        ]
+
+        results = self.scorer.score_collections(collections, max_workers=2)
+
+        assert results[:2] == expected_scores
+        assert isinstance(results[2], ValueError)
+        assert results[3] == []
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            results = self.scorer.score_collections(collections, executor=executor)
+        assert results[:2] == expected_scores
+        assert isinstance(results[2], ValueError)
+
+    def test_compact_collection(self):
+        collection = generate_mixed_collection(max_total_supply=500)
+        compact_collection = CompactCollection.from_collection(collection)
+
+        restored_collection = pickle.loads(pickle.dumps(compact_collection))
+        restored_collection = restored_collection.to_collection()
+
+        assert (
+            restored_collection.attributes_frequency_counts
+            == collection.attributes_frequency_counts
+        )
+        assert (
+            restored_collection.attribute_codes.tolist()
+            == collection.attribute_codes.tolist()
+        )
+        assert self.scorer.score_collection(
+            restored_collection
+        ) == self.scorer.score_collection(collection)
+
+    def test_score_tokens_sharded(self):
+        collection = generate_mixed_collection(max_total_supply=1000)
+        expected_scores = self.scorer.score_collection(collection)
+
+        scores = self.scorer.score_tokens(
+            collection, collection.tokens, max_workers=2, chunk_size=300
+        )
+        assert scores == expected_scores
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            scores = self.scorer.score_tokens(
+                collection, collection.tokens, executor=executor, chunk_size=64
+            )
+            assert scores == expected_scores
+
+            # Tokens other than collection.tokens are scored sequentially
+            scores = self.scorer.score_tokens(
+                collection, collection.tokens[:500], executor=executor, chunk_size=64
+            )
+            assert scores == expected_scores[:500]
@@ -5,9 +5,20 @@ import numpy as np
 import pytest
 
 from open_rarity.models.collection import TRAIT_COUNT_ATTRIBUTE_NAME, Collection
+from open_rarity.models.token import Token
+from open_rarity.scoring.handlers.arithmetic_mean_scoring_handler import (
+    ArithmeticMeanScoringHandler,
+)
+from open_rarity.scoring.handlers.geometric_mean_scoring_handler import (
+    GeometricMeanScoringHandler,
+)
+from open_rarity.scoring.handlers.harmonic_mean_scoring_handler import (
+    HarmonicMeanScoringHandler,
+)
 from open_rarity.scoring.handlers.information_content_scoring_handler import (
     InformationContentScoringHandler,
 )
+from open_rarity.scoring.handlers.sum_scoring_handler import SumScoringHandler
 from open_rarity.scoring.utils import get_token_attributes_scores_and_weights
 from tests.helpers import (
     generate_collection_with_token_traits,
@@ -185,6 +196,158 @@ class TestScoringHandlers:
 
         assert scores_with_null == scores_without_null
 
+    def test_information_content_score_tokens_matches_score_token(self):
+        ic_scorer = InformationContentScoringHandler()
+        collection = generate_collection_with_token_traits(
+            [
+                {"bottom": "1", "hat": "1", "special": "true"},
+                {"bottom": "1", "hat": "1"},
+                {"bottom": "2", "hat": "2", "shoes": "boots"},
+                {"bottom": "2", "hat": "2"},
+                {"bottom": "3", "hat": "2", "special": "none"},
+                {"hat": "cap"},
+            ]
+        )
+
+        # More attributes than numpy sums sequentially, with varying null buckets
+        wide_collection = generate_collection_with_token_traits(
+            [
+                {
+                    f"trait{j}": str((i * (j + 1)) % (j + 3))
+                    for j in range(12)
+                    if (i + j) % 5
+                }
+                for i in range(200)
+            ]
+        )
+
+        for test_collection in [
+            collection,
+            wide_collection,
+            self.mixed_collection,
+            self.onerare_collection,
+        ]:
+            scores = ic_scorer.score_tokens(
+                collection=test_collection, tokens=test_collection.tokens
+            )
+            assert scores == [
+                ic_scorer.score_token(collection=test_collection, token=token)
+                for token in test_collection.tokens
+            ]
+
+    def test_information_content_score_tokens_subset(self):
+        ic_scorer = InformationContentScoringHandler()
+        tokens = self.mixed_collection.tokens[10:20]
+
+        scores = ic_scorer.score_tokens(collection=self.mixed_collection, tokens=tokens)
+        assert scores == [
+            ic_scorer.score_token(collection=self.mixed_collection, token=token)
+            for token in tokens
+        ]
+
+    def test_information_content_score_tokens_outside_collection(self):
+        ic_scorer = InformationContentScoringHandler()
+        collection = generate_collection_with_token_traits(
+            [{"hat": "cap"}, {"hat": "beanie"}, {"hat": "cap"}]
+        )
+        # Token is not part of the collection and has no trait count attribute
+        token = Token.from_erc721(
+            contract_address="0x0", token_id=10, metadata_dict={"hat": "cap"}
+        )
+
+        scores = ic_scorer.score_tokens(collection=collection, tokens=[token])
+        assert scores == [ic_scorer.score_token(collection=collection, token=token)]
+
+    @pytest.mark.parametrize(
+        "handler_class",
+        [
+            ArithmeticMeanScoringHandler,
+            GeometricMeanScoringHandler,
+            HarmonicMeanScoringHandler,
+            SumScoringHandler,
+        ],
+    )
+    @pytest.mark.parametrize("normalized", [True, False])
+    def test_score_tokens_matches_score_token(self, handler_class, normalized):
+        handler = handler_class(normalized=normalized)
+        wide_collection = generate_collection_with_token_traits(
+            [
+                {
+                    f"trait{j}": str((i * (j + 1)) % (j + 3))
+                    for j in range(40)
+                    if (i + j) % 5
+                }
+                for i in range(200)
+            ]
+        )
+        for test_collection in [
+            wide_collection,
+            self.mixed_collection,
+            self.onerare_collection,
+        ]:
+            scores = handler.score_tokens(
+                collection=test_collection, tokens=test_collection.tokens
+            )
+            # Scores of many tokens at once only differ by floating point rounding
+            assert np.allclose(
+                scores,
+                [
+                    handler.score_token(collection=test_collection, token=token)
+                    for token in test_collection.tokens
+                ],
+                rtol=1e-12,
+                atol=0,
+            )
+
+        # Token is not part of the collection and has no trait count attribute
+        collection = generate_collection_with_token_traits(
+            [{"hat": "cap"}, {"hat": "beanie"}, {"hat": "cap"}]
+        )
+        token = Token.from_erc721(
+            contract_address="0x0", token_id=10, metadata_dict={"hat": "cap"}
+        )
+        assert np.allclose(
+            handler.score_tokens(collection=collection, tokens=[token]),
+            [handler.score_token(collection=collection, token=token)],
+            rtol=1e-12,
+            atol=0,
+        )
+
+    @pytest.mark.parametrize(
+        "handler_class",
+        [
+            ArithmeticMeanScoringHandler,
+            GeometricMeanScoringHandler,
+            HarmonicMeanScoringHandler,
+            SumScoringHandler,
+        ],
+    )
+    @pytest.mark.parametrize("normalized", [True, False])
+    def test_score_tokens_matches_score_token_random(self, handler_class, normalized):
+        handler = handler_class(normalized=normalized)
+        rng = np.random.default_rng(seed=0)
+        collection = generate_collection_with_token_traits(
+            [
+                {
+                    f"trait{j}": str(rng.integers(j + 2))
+                    for j in range(rng.integers(1, 30))
+                    if rng.random() < 0.8
+                }
+                for _ in range(500)
+            ]
+        )
+
+        scores = handler.score_tokens(collection=collection, tokens=collection.tokens)
+        assert np.allclose(
+            scores,
+            [
+                handler.score_token(collection=collection, token=token)
+                for token in collection.tokens
+            ],
+            rtol=1e-12,
+            atol=0,
+        )
+
     @pytest.mark.skip(reason="Not including performance testing as required testing")
     def test_information_content_rarity_timing(self):
         ic_scorer = InformationContentScoringHandler()
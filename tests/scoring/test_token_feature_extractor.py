@@ -1,5 +1,6 @@
+from open_rarity.models.token_metadata import TokenMetadata
 from open_rarity.scoring.token_feature_extractor import TokenFeatureExtractor
-from tests.helpers import generate_collection_with_token_traits
+from tests.helpers import create_evm_token, generate_collection_with_token_traits
 
 
 class TestFeatureExtractor:
@@ -56,3 +57,37 @@ class TestFeatureExtractor:
             ).unique_attribute_count
             == 2
         )
+
+    def test_batch_feature_extractor(self):
+        collection = generate_collection_with_token_traits(
+            [
+                {"bottom": "1", "hat": "1", "special": "true"},
+                {"bottom": "1", "hat": "1", "special": "false"},
+                {"bottom": "2", "hat": "2", "special": "false"},
+                {"bottom": "2", "hat": "2", "special": "false"},
+                {"bottom": "3", "hat": "2", "special": "false"},
+                {"bottom": "4", "hat": "3"},
+            ]
+        )
+        # Token outside of the collection with an attribute value it does not have
+        other_token = create_evm_token(
+            token_id=10,
+            metadata=TokenMetadata.from_attributes({"bottom": "3", "hat": "4"}),
+        )
+
+        for tokens in [collection.tokens, collection.tokens[3:], [other_token]]:
+            unique_attribute_counts = (
+                TokenFeatureExtractor.extract_unique_attribute_counts(
+                    tokens=tokens, collection=collection
+                )
+            )
+            assert unique_attribute_counts.tolist() == [
+                TokenFeatureExtractor.extract_unique_attribute_count(
+                    token=token, collection=collection
+                ).unique_attribute_count
+                for token in tokens
+            ]
+
+        assert TokenFeatureExtractor.extract_unique_attribute_counts(
+            tokens=collection.tokens, collection=collection
+        ).tolist() == [1, 0, 0, 0, 1, 3]
@@ -0,0 +1,162 @@
+import numpy as np
+import pytest
+
+from open_rarity.incremental_rarity_ranker import IncrementalRarityRanker
+from open_rarity.models.collection import Collection
+from open_rarity.models.token_identifier import EVMContractTokenIdentifier
+from open_rarity.models.token_metadata import TokenMetadata
+from open_rarity.rarity_ranker import RarityRanker
+from tests.helpers import (
+    create_evm_token,
+    create_numeric_evm_token,
+    generate_collection_with_token_traits,
+    generate_mixed_collection,
+)
+
+
+def verify_matches_rarity_ranker(ranker: IncrementalRarityRanker):
+    expected_rarities = RarityRanker.rank_collection(collection=ranker.collection)
+    expected_ranks = {
+        token_rarity.token.token_identifier: token_rarity.rank
+        for token_rarity in expected_rarities
+    }
+    token_rarities = ranker.rank_collection()
+
+    assert len(token_rarities) == len(expected_rarities)
+    assert [token_rarity.rank for token_rarity in token_rarities] == [
+        token_rarity.rank for token_rarity in expected_rarities
+    ]
+    for token_rarity in token_rarities:
+        assert token_rarity.rank == expected_ranks[token_rarity.token.token_identifier]
+
+    expected_scores = {
+        token_rarity.token.token_identifier: token_rarity.score
+        for token_rarity in expected_rarities
+    }
+    assert np.allclose(
+        [token_rarity.score for token_rarity in token_rarities],
+        [
+            expected_scores[token_rarity.token.token_identifier]
+            for token_rarity in token_rarities
+        ],
+        rtol=1e-12,
+    )
+
+
+class TestIncrementalRarityRanker:
+    def test_rank_collection(self) -> None:
+        collection = generate_collection_with_token_traits(
+            [
+                {"bottom": "1", "hat": "1", "special": "true"},
+                {"bottom": "1", "hat": "1"},
+                {"bottom": "2", "hat": "2"},
+                {"bottom": "2", "hat": "2"},
+                {"bottom": "3", "hat": "2"},
+            ]
+        )
+        ranker = IncrementalRarityRanker(collection)
+
+        verify_matches_rarity_ranker(ranker)
+        assert ranker.ranks.tolist() == [1, 3, 4, 4, 2]
+        assert ranker.unique_attribute_counts.tolist() == [2, 0, 0, 0, 1]
+
+    def test_rank_empty_collection(self) -> None:
+        ranker = IncrementalRarityRanker(Collection(tokens=[]))
+        assert ranker.rank_collection() == []
+
+        ranker.update(
+            ranker.collection.add_tokens(
+                [
+                    create_evm_token(
+                        token_id=0, metadata=TokenMetadata.from_attributes({"hat": "1"})
+                    )
+                ]
+            )
+        )
+        verify_matches_rarity_ranker(ranker)
+
+    def test_update_token_metadata(self) -> None:
+        collection = generate_mixed_collection(max_total_supply=2000)
+        ranker = IncrementalRarityRanker(collection)
+
+        # Reveal tokens one at a time
+        for token in collection.tokens[:50:5]:
+            ranker.update(
+                collection.update_token_metadata(
+                    {
+                        token.token_identifier: TokenMetadata.from_attributes(
+                            {"hat": "visor", "shirt": "vest", "special": "true"}
+                        )
+                    }
+                )
+            )
+            verify_matches_rarity_ranker(ranker)
+
+        # New attribute name
+        token = collection.tokens[100]
+        ranker.update(
+            collection.update_token_metadata(
+                {
+                    token.token_identifier: TokenMetadata.from_attributes(
+                        {"hat": "crown", "shirt": "vest", "cape": "red"}
+                    )
+                }
+            )
+        )
+        verify_matches_rarity_ranker(ranker)
+
+    def test_add_and_remove_tokens(self) -> None:
+        tokens = generate_mixed_collection(max_total_supply=2000).tokens
+        collection = Collection(tokens=tokens[:1500])
+        ranker = IncrementalRarityRanker(collection)
+
+        ranker.update(collection.add_tokens(tokens[1500:]))
+        verify_matches_rarity_ranker(ranker)
+
+        ranker.update(
+            collection.remove_tokens(
+                [token.token_identifier for token in collection.tokens[::3]]
+            )
+        )
+        verify_matches_rarity_ranker(ranker)
+
+        ranker.update(
+            collection.add_tokens(
+                [
+                    create_evm_token(
+                        token_id=5000,
+                        metadata=TokenMetadata.from_attributes(
+                            {"hat": "crown", "shirt": "vest"}
+                        ),
+                    )
+                ]
+            )
+        )
+        verify_matches_rarity_ranker(ranker)
+        assert ranker.rank_collection()[0].token.token_identifier == (
+            EVMContractTokenIdentifier(contract_address="0xaaa", token_id=5000)
+        )
+
+        ranker.rebuild()
+        verify_matches_rarity_ranker(ranker)
+
+    def test_update_invalid_collection(self) -> None:
+        collection = generate_collection_with_token_traits([{"hat": "1"}])
+        ranker = IncrementalRarityRanker(collection)
+
+        with pytest.raises(ValueError):
+            ranker.update(collection.add_tokens([create_numeric_evm_token(token_id=1)]))
+
+    def test_rank_collection_without_tokens(self):
+        collection = generate_mixed_collection(max_total_supply=1000)
+        stream_collection = Collection.from_token_stream(
+            collection.tokens, keep_tokens=False
+        )
+
+        ranker = IncrementalRarityRanker(stream_collection)
+        expected_ranker = IncrementalRarityRanker(collection)
+
+        assert ranker.scores.tolist() == expected_ranker.scores.tolist()
+        assert ranker.ranks.tolist() == expected_ranker.ranks.tolist()
+        with pytest.raises(ValueError, match="were dropped"):
+            ranker.rank_collection()
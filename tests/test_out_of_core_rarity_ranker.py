@@ -0,0 +1,138 @@
+import json
+
+import pytest
+
+from open_rarity.models.collection import Collection
+from open_rarity.models.token_metadata import TokenMetadata
+from open_rarity.out_of_core_rarity_ranker import (
+    OutOfCoreRarityRanker,
+    iter_tokens_from_csv,
+    iter_tokens_from_jsonl,
+)
+from open_rarity.rarity_ranker import RarityRanker
+from tests.helpers import create_evm_token, generate_mixed_collection
+
+
+def write_jsonl(filename, tokens):
+    with open(filename, "w") as jsonl_file:
+        for token in tokens:
+            jsonl_file.write(json.dumps(token.to_dict()) + "\n")
+
+
+def read_jsonl(filename) -> list[dict]:
+    with open(filename) as jsonl_file:
+        return [json.loads(line) for line in jsonl_file]
+
+
+class TestOutOfCoreRarityRanker:
+    def test_rank_matches_rarity_ranker(self, tmp_path):
+        tokens = generate_mixed_collection(max_total_supply=1000).tokens + [
+            create_evm_token(
+                token_id=1000,
+                metadata=TokenMetadata.from_attributes(
+                    {"hat": "cap", "shoes": "boots"}
+                ),
+            )
+        ]
+        tokens_filename = tmp_path / "tokens.jsonl"
+        write_jsonl(tokens_filename, tokens)
+
+        ranker = OutOfCoreRarityRanker(
+            lambda: iter_tokens_from_jsonl(tokens_filename),
+            work_dir=str(tmp_path / "work"),
+            chunk_size=128,
+        )
+        assert ranker.rank(str(tmp_path / "ranks.jsonl")) == 1001
+        assert read_jsonl(tmp_path / "work" / "token_identifiers.jsonl") == [
+            token.token_identifier.to_dict() for token in tokens
+        ]
+
+        collection = Collection(tokens=list(iter_tokens_from_jsonl(tokens_filename)))
+        assert ranker.attributes_frequency_counts == (
+            collection.attributes_frequency_counts
+        )
+        expected = {
+            json.dumps(token_rarity.token.token_identifier.to_dict()): token_rarity
+            for token_rarity in RarityRanker.rank_collection(collection)
+        }
+        results = read_jsonl(tmp_path / "ranks.jsonl")
+        assert [result["token_identifier"]["token_id"] for result in results] == [
+            token.token_identifier.token_id for token in tokens
+        ]
+        for result in results:
+            token_rarity = expected[json.dumps(result["token_identifier"])]
+            assert result["score"] == token_rarity.score
+            assert result["rank"] == token_rarity.rank
+            assert (
+                result["unique_attribute_count"]
+                == token_rarity.token_features.unique_attribute_count
+            )
+
+    def test_rank_csv(self, tmp_path):
+        csv_filename = tmp_path / "tokens.csv"
+        csv_filename.write_text(
+            "token_id,hat,shirt\n0,cap,vest\n1,cap,\n2,beanie,vest\n3,cap,vest\n"
+        )
+
+        ranker = OutOfCoreRarityRanker(
+            lambda: iter_tokens_from_csv(csv_filename, contract_address="0xabc"),
+            work_dir=str(tmp_path / "work"),
+        )
+        ranker.rank(str(tmp_path / "ranks.jsonl"))
+
+        assert ranker.attributes_frequency_counts["hat"] == {"cap": 3, "beanie": 1}
+        assert ranker.attributes_frequency_counts["shirt"] == {"vest": 3}
+        ranks = [result["rank"] for result in read_jsonl(tmp_path / "ranks.jsonl")]
+        assert ranks == [3, 1, 2, 3]
+
+    def test_rank_empty(self, tmp_path):
+        ranker = OutOfCoreRarityRanker(lambda: iter([]), work_dir=str(tmp_path))
+        assert ranker.rank(str(tmp_path / "ranks.jsonl")) == 0
+        assert read_jsonl(tmp_path / "ranks.jsonl") == []
+
+    def test_rank_invalid_collection(self, tmp_path):
+        tokens = [
+            create_evm_token(
+                token_id=i, metadata=TokenMetadata.from_attributes({"level": i})
+            )
+            for i in range(3)
+        ]
+        ranker = OutOfCoreRarityRanker(lambda: iter(tokens), work_dir=str(tmp_path))
+        with pytest.raises(ValueError):
+            ranker.rank(str(tmp_path / "ranks.jsonl"))
+
+    def test_rank_changed_stream(self, tmp_path):
+        streams = iter(
+            [
+                [
+                    create_evm_token(
+                        token_id=i,
+                        metadata=TokenMetadata.from_attributes({"hat": "cap"}),
+                    )
+                    for i in range(3)
+                ],
+                [
+                    create_evm_token(
+                        token_id=i,
+                        metadata=TokenMetadata.from_attributes({"hat": "beanie"}),
+                    )
+                    for i in range(3)
+                ],
+            ]
+        )
+        ranker = OutOfCoreRarityRanker(lambda: next(streams), work_dir=str(tmp_path))
+        with pytest.raises(ValueError, match="changed between passes"):
+            ranker.rank(str(tmp_path / "ranks.jsonl"))
+
+    def test_rank_reordered_stream(self, tmp_path):
+        tokens = [
+            create_evm_token(
+                token_id=i,
+                metadata=TokenMetadata.from_attributes({"hat": f"cap {i % 2}"}),
+            )
+            for i in range(4)
+        ]
+        streams = iter([tokens, tokens[::-1]])
+        ranker = OutOfCoreRarityRanker(lambda: next(streams), work_dir=str(tmp_path))
+        with pytest.raises(ValueError, match="changed between passes"):
+            ranker.rank(str(tmp_path / "ranks.jsonl"))
@@ -1,3 +1,8 @@
+import math
+
+import numpy as np
+import pytest
+
 from open_rarity.models.collection import Collection
 from open_rarity.models.token import Token
 from open_rarity.models.token_identifier import (
@@ -9,7 +14,10 @@ from open_rarity.models.token_ranking_features import TokenRankingFeatures
 from open_rarity.models.token_rarity import TokenRarity
 from open_rarity.rarity_ranker import RarityRanker
 from open_rarity.scoring.scorer import Scorer
-from tests.helpers import generate_collection_with_token_traits
+from tests.helpers import (
+    generate_collection_with_token_traits,
+    generate_mixed_collection,
+)
 
 
 def verify_token_rarities(token_rarities: list[TokenRarity], expected_data: list[dict]):
@@ -285,3 +293,122 @@ class TestRarityRanker:
 
         assert result[3].token.token_identifier.token_id == 4
         assert result[3].rank == 4
+
+    def test_top_k_and_rank_of(self) -> None:
+        test_collections = [
+            generate_collection_with_token_traits(
+                [
+                    {"trait1": "value1", "trait2": "value1"},
+                    {"trait1": "value1", "trait2": "value1"},
+                    {"trait1": "value2", "trait2": "value1"},
+                    {"trait1": "value2", "trait2": "value2"},
+                    {"trait1": "value3", "trait2": "value3", "trait3": "value1"},
+                    {"trait1": "value2", "trait2": "value1"},
+                    {"trait1": "value1", "trait2": "value1"},
+                ]
+            ),
+            generate_mixed_collection(max_total_supply=1000),
+        ]
+
+        for test_collection in test_collections:
+            token_rarities = RarityRanker.rank_collection(test_collection)
+
+            for k in [0, 1, 2, 3, 5, 100, len(token_rarities) + 1]:
+                assert RarityRanker.top_k(test_collection, k=k) == token_rarities[:k]
+
+            for token_rarity in token_rarities[::50] + token_rarities[:5]:
+                rank = RarityRanker.rank_of(
+                    test_collection, token_rarity.token.token_identifier
+                )
+                assert rank == token_rarity.rank
+                assert type(rank) is int
+
+    def test_rank_collection_without_tokens(self) -> None:
+        collection = generate_mixed_collection(max_total_supply=100)
+        stream_collection = Collection.from_token_stream(
+            collection.tokens, keep_tokens=False
+        )
+
+        with pytest.raises(ValueError, match="were dropped"):
+            RarityRanker.rank_collection(stream_collection)
+        with pytest.raises(ValueError, match="were dropped"):
+            RarityRanker.rank_collection_result(stream_collection)
+        with pytest.raises(ValueError, match="were dropped"):
+            RarityRanker.top_k(stream_collection, k=5)
+        with pytest.raises(ValueError, match="were dropped"):
+            RarityRanker.rank_of(
+                stream_collection, collection.tokens[0].token_identifier
+            )
+
+    def test_rank_of_unknown_token(self) -> None:
+        test_collection = generate_collection_with_token_traits([{"trait1": "value1"}])
+        with pytest.raises(ValueError):
+            RarityRanker.rank_of(
+                test_collection,
+                EVMContractTokenIdentifier(contract_address="0x0", token_id=1),
+            )
+
+    def test_rank_scores_matches_sorted_ranking(self) -> None:
+        rng = np.random.default_rng(0)
+        scores = np.round(rng.random(2000), 2)
+        # Scores within and outside the math.isclose tolerance of other scores
+        scores[::7] += 1e-12
+        scores[::11] += 1e-6
+        scores[:3] = [np.inf, np.inf, 1e300]
+        unique_attribute_counts = rng.integers(0, 3, 2000)
+
+        rank_order, ranks = RarityRanker.rank_scores(
+            scores=scores, unique_attribute_counts=unique_attribute_counts
+        )
+
+        expected_order = sorted(
+            range(len(scores)),
+            key=lambda idx: (unique_attribute_counts[idx], scores[idx]),
+            reverse=True,
+        )
+        expected_ranks = []
+        for i, idx in enumerate(expected_order):
+            if i > 0 and math.isclose(scores[idx], scores[expected_order[i - 1]]):
+                expected_ranks.append(expected_ranks[-1])
+            else:
+                expected_ranks.append(i + 1)
+
+        assert rank_order.tolist() == expected_order
+        assert ranks.tolist() == expected_ranks
+
+    def test_rank_scores_empty(self) -> None:
+        rank_order, ranks = RarityRanker.rank_scores(
+            scores=np.zeros(0), unique_attribute_counts=np.zeros(0, dtype=np.int64)
+        )
+        assert len(rank_order) == 0
+        assert len(ranks) == 0
+
+    def test_rank_collection_result(self) -> None:
+        test_collection = generate_mixed_collection(max_total_supply=1000)
+        token_rarities = RarityRanker.rank_collection(test_collection)
+        ranking = RarityRanker.rank_collection_result(test_collection)
+
+        assert len(ranking) == len(token_rarities)
+        assert list(ranking) == token_rarities
+        assert ranking[0] == token_rarities[0]
+        assert ranking[-1] == token_rarities[-1]
+        assert list(ranking[10:20]) == token_rarities[10:20]
+        assert list(ranking[::-7]) == token_rarities[::-7]
+
+        records = ranking.to_records()
+        assert records["rank"].tolist() == [t.rank for t in token_rarities]
+        assert records["score"].tolist() == [t.score for t in token_rarities]
+        assert [test_collection.tokens[idx] for idx in records["token_index"]] == [
+            t.token for t in token_rarities
+        ]
+        assert records["unique_attribute_count"].tolist() == [
+            t.token_features.unique_attribute_count for t in token_rarities
+        ]
+
+    def test_rank_collection_result_empty(self) -> None:
+        ranking = RarityRanker.rank_collection_result(
+            collection=Collection(attributes_frequency_counts={}, tokens=[])
+        )
+        assert len(ranking) == 0
+        assert list(ranking) == []
+        assert len(ranking.to_records()) == 0